@@ -5,7 +5,7 @@ a = Analysis(
     ['interface.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('tables', 'tables')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -1,105 +1,659 @@
-import timeit
+import time
 
-from collections import deque
-from typing import Deque, Dict, Optional, Set, Tuple
+from fractions import Fraction
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-from utils.priority_queue import PriorityQueue
-from utils.state import State, reconstruct_path
+import numpy as np
 
+from algorithms.bidirectional_search import mm_search
+from utils.budget import BudgetExceeded, SearchBudget
+from utils.heuristics import admissible_call, get_heuristic
+from utils.priority_queue import make_priority_queue
+from utils.progress import DEFAULT_PROGRESS_INTERVAL, SearchProgress, SearchMonitor, run_to_completion
+from utils.search_stats import PhaseTimer, SearchResult, counted_stats, empty_result
+from utils.solution import Solution, reconstruct_path
+from utils.solution_cache import SolutionCache, cached_solver
+from utils.state import BoardGeometry, State
 
-def astar_search(initial_state: State, heuristic = "heuristic") -> Tuple[Deque[str], float, int]:
+# Peso inicial e redução do peso a cada rodada do modo anytime (ARA*)
+ANYTIME_WEIGHT = 3.0
+ANYTIME_WEIGHT_STEP = 0.5
+
+# Maior denominador usado para representar o peso como fração (prioridades inteiras)
+_MAX_WEIGHT_DENOMINATOR = 100
+
+
+def _is_optimal_call(arguments: Dict[str, Any]) -> bool:
+    """Se a chamada do A* é ótima (heurística admissível, sem peso e fora do modo anytime).
+
+    Só as soluções dessas chamadas vão para o cache.
+    """
+    weight = arguments.get("weight")
+    return not arguments.get("anytime") and (weight is None or weight == 1) and admissible_call(arguments)
+
+
+def _weight_ratio(weight: float) -> Tuple[int, int]:
+    """Representa o peso como fração num/den, para prioridades inteiras den * g + num * h.
+
+    Raises:
+        ValueError: Se o peso for menor que 1
+    """
+    if weight < 1:
+        raise ValueError(f"O peso da heurística deve ser pelo menos 1 (recebido {weight})")
+    ratio = Fraction(weight).limit_denominator(_MAX_WEIGHT_DENOMINATOR)
+    return ratio.numerator, ratio.denominator
+
+
+@cached_solver(optimal=_is_optimal_call)
+def astar_search(initial_state: State, heuristic: str = "manhattan",
+                 queue: str = "heap", bidirectional: bool = False, batched: bool = False,
+                 batch_size: Optional[int] = None, cache: Optional[SolutionCache] = None,
+                 budget: Optional[SearchBudget] = None, weight: Optional[float] = None,
+                 anytime: bool = False, weight_step: float = ANYTIME_WEIGHT_STEP,
+                 solutions: Optional[List[Tuple[int, float, float, int]]] = None,
+                 phase_timing: bool = False) -> SearchResult:
     """Implementa o algoritmo A* para encontrar o caminho mais curto para o estado objetivo.
     
     O algoritmo A* combina a busca de melhor primeiro com uma heurística admissível
-    para encontrar o caminho ótimo até o estado objetivo ('123456780').
+    para encontrar o caminho ótimo até o estado objetivo ('123456780' no tabuleiro 3x3).
+    O modo padrão consome astar_search_stream sem eventos intermediários.
+
+    Com weight = w > 1 (A* ponderado, f = g + w * h), a solução custa no máximo w
+    vezes o ótimo e a busca expande muito menos nós. No modo anytime (ARA*), uma
+    primeira solução é encontrada com o peso inicial e melhorada em rodadas com
+    pesos menores, reaproveitando a busca anterior, até provar a otimalidade ou
+    exceder o orçamento (o prazo de budget.max_time, por exemplo); o resultado é
+    a melhor solução encontrada.
     
     Args:
-        initial_state: Estado inicial do puzzle
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        heuristic: Nome da heurística registrada em utils.heuristics
+        queue: Implementação da fila de prioridade ('heap' ou 'bucket', ver
+            utils.priority_queue), a de baldes desempata pelo maior g
+        bidirectional: Se True, usa a busca bidirecional MM (ver
+            algorithms.bidirectional_search); o parâmetro queue é ignorado
+        batched: Se True, expande os nós em lotes vetorizados com NumPy (ver
+            _batched_astar_search); o parâmetro queue é ignorado
+        batch_size: Número máximo de nós por lote no modo batched (padrão: sem limite)
+        cache: Cache de soluções (ver utils.solution_cache); no modo padrão, a busca
+            termina quando nenhum nó aberto pode superar o caminho por um estado em cache
+        budget: Limites de execução (ver utils.budget), verificados em todos os modos;
+            no modo anytime, exceder um limite encerra a busca com a melhor solução encontrada
+        weight: Peso w >= 1 da heurística, limite provado da razão entre o custo da
+            solução e o ótimo (padrão: 1, ou ANYTIME_WEIGHT no modo anytime)
+        anytime: Se True, usa o modo anytime (ARA*) a partir do peso informado
+        weight_step: Redução do peso a cada rodada do modo anytime
+        solutions: Lista que recebe, para cada solução encontrada (uma por rodada no
+            modo anytime), a tupla (custo, limite provado de subotimalidade, tempo, nós expandidos);
+            com uma heurística não admissível, não há limite provado e ele é None
+        phase_timing: Se True, mede o tempo gasto na heurística, na geração de sucessores
+            e na fila (apenas nos modos padrão e ponderado; ver utils.search_stats)
         
     Returns:
-        Tuple contendo:
-            - Deque[str]: Caminho da solução (sequência de estados)
-            - float: Tempo de execução em segundos
-            - int: Número de estados expandidos
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos e estatísticas (ver utils.search_stats),
+        ou um BudgetExceeded (com caminho vazio) se um limite for excedido (no modo
+        anytime, apenas antes da primeira solução)
+            
+    Raises:
+        ValueError: Se a heurística ou a fila informada não estiver registrada, se
+            o modo batched for usado em um tabuleiro que não cabe em 64 bits (5x5),
+            se o peso for menor que 1 ou se weight/anytime forem combinados com os
+            modos batched ou bidirectional
     """
-    start_time = timeit.default_timer() 
+    if (batched or bidirectional) and (anytime or (weight is not None and weight != 1)):
+        raise ValueError("Os modos batched e bidirectional não suportam weight nem anytime")
+    if batched:
+        return _batched_astar_search(initial_state, get_heuristic(heuristic), batch_size, budget)
+    if bidirectional:
+        return mm_search(initial_state, heuristic, budget=budget)
 
-    # Contador de estados expandidos
-    expanded_nodes = 0
+    # A consulta e o armazenamento no cache já são feitos pelo decorador desta função
+    return run_to_completion(astar_search_stream.__wrapped__(
+        initial_state, heuristic, queue, cache=cache, interval=None, budget=budget,
+        weight=weight, anytime=anytime, weight_step=weight_step, solutions=solutions, phase_timing=phase_timing))
+
+
+@cached_solver(optimal=_is_optimal_call)
+def astar_search_stream(initial_state: State, heuristic: str = "manhattan", queue: str = "heap",
+                        cache: Optional[SolutionCache] = None,
+                        interval: Optional[int] = DEFAULT_PROGRESS_INTERVAL,
+                        budget: Optional[SearchBudget] = None, weight: Optional[float] = None,
+                        anytime: bool = False, weight_step: float = ANYTIME_WEIGHT_STEP,
+                        solutions: Optional[List[Tuple[int, float, float, int]]] = None,
+                        phase_timing: bool = False) -> Iterator[SearchProgress]:
+    """Versão em fluxo do A* (modo padrão, ponderado e anytime de astar_search).
+
+    Args:
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        heuristic: Nome da heurística registrada em utils.heuristics
+        queue: Implementação da fila de prioridade ('heap' ou 'bucket')
+        cache: Cache de soluções (ver astar_search); com peso, apenas o estado inicial é consultado
+        interval: Nós expandidos entre eventos de progresso (None para apenas o evento final)
+        budget: Limites de execução (ver utils.budget)
+        weight: Peso da heurística (ver astar_search)
+        anytime: Se True, usa o modo anytime (ARA*)
+        weight_step: Redução do peso a cada rodada do modo anytime
+        solutions: Lista que recebe as soluções encontradas (ver astar_search)
+        phase_timing: Se True, mede o tempo de cada fase (ver astar_search)
+
+    Yields:
+        SearchProgress: Progresso a cada intervalo (bound é o menor f da fronteira,
+        ponderado se houver peso); no modo anytime, um evento com o caminho e o
+        limite provado (suboptimality) a cada solução melhor; por último, o evento
+        final com o caminho da solução e as estatísticas (ou com exceeded, se um
+        limite do orçamento for excedido sem nenhuma solução)
+
+    Raises:
+        ValueError: Se a heurística ou a fila informada não estiver registrada, ou
+            se o peso for menor que 1
+    """
+    # Resolve a heurística uma única vez (falha antes de iniciar a busca se for desconhecida)
+    heuristic_fn = get_heuristic(heuristic)
+
+    if anytime:
+        yield from _anytime_astar_stream(initial_state, heuristic_fn, queue,
+                                         ANYTIME_WEIGHT if weight is None else weight,
+                                         weight_step, interval, budget, solutions)
+        return
+
+    # Prioridades inteiras den * g + num * h (f = g + w * h escalado); sem peso, f = g + h
+    weight_num, weight_den = _weight_ratio(1 if weight is None else weight)
+    # Sem heurística admissível, não há limite provado para o custo da solução
+    suboptimality = weight_num / weight_den if heuristic_fn.admissible else None
+
+    # O corte pelo cache exige que f seja um limite inferior (sem peso e com heurística admissível)
+    if weight_num != weight_den or not heuristic_fn.admissible:
+        cache = None
     
-    # Conjunto de estados fechados (já explorados completamente)
-    closed_set: Set[State] = set()
+    start_time = time.perf_counter() 
+
+    # Contador de estados expandidos (novos ou com custo melhorado, a contagem histórica)
+    expanded_nodes = 0
+
+    # Contadores detalhados (ver utils.search_stats), copiados para SearchStats apenas no fim
+    expanded = 0
+    generated = 0
+    reopened = 0
+    peak_open = 1
     
-    # Dicionário para rastrear predecessores (para reconstrução do caminho)
-    predecessors: Dict[str, Optional[str]] = {}
+    # Dicionário com o movimento (0-3) que alcançou cada estado, para reconstrução do caminho
+    predecessors: Dict[int, Optional[int]] = {}
     
     # Fila de prioridade personalizada para o algoritmo A*
-    open_set = PriorityQueue()
+    open_set = make_priority_queue(queue)
+
+    # Tempo por fase: a heurística e a fila passam a medir o próprio tempo
+    timer = PhaseTimer() if phase_timing else None
+    if timer is not None:
+        heuristic_fn = timer.wrap_heuristic(heuristic_fn)
+        open_set = timer.wrap_queue(open_set)
     
     # Dicionário para armazenar o custo g (custo real) para cada estado
     g_score: Dict[State, int] = {initial_state: 0}
 
-    # Selecionar heuristica desejada
-    heuristic_attr = {
-        "manhattan": "heuristic",
-        "manhattanPenality": "heuristic2",
-        "euclidean": "heuristic_euclidean"
-    }.get(heuristic, "heuristic")  # Default para Manhattan se não encontrado
-    
     # Adiciona o estado inicial à fila de prioridade com f_score = h_score
-    heuristic_value = getattr(initial_state, heuristic_attr)
-    open_set.push(initial_state, heuristic_value)
+    heuristic_value = initial_state.heuristic_value(heuristic_fn)
+    open_set.push(initial_state, weight_num * heuristic_value, 0)
 
     # Marca o estado inicial no dicionário de predecessores
-    predecessors[initial_state.from_matrix_string()] = None
+    predecessors[initial_state.board] = None
+
+    # Estado objetivo em formato empacotado (depende da dimensão do tabuleiro)
+    geometry = initial_state.geometry
+    goal_state = geometry.goal_board
+    move_direction = geometry.move_direction
 
-    # Estado objetivo em formato de string
-    goal_state = '123456780'
+    # Melhor solução conhecida passando por um estado em cache (custo total e estado)
+    cached_cost = None
+    cached_board = None
+    cached_blank = None
+
+    # Eventos de progresso e verificações do orçamento
+    monitor = SearchMonitor(start_time, interval, budget)
+    next_event = monitor.next_event
     
     while not open_set.empty():
         # Obtém o estado com menor f_score (f = g + h)
-        _, current = open_set.pop()
-        current_str = current.from_matrix_string()
-        
-        # Verifica se já exploramos este estado
-        if current in closed_set:
-            continue
-            
-        # Adiciona ao conjunto de estados fechados
-        closed_set.add(current)
+        lowest_f, current = open_set.pop()
+        current_board = current.board
+
+        # Nenhum caminho ainda aberto pode ser mais curto que o caminho pelo estado em cache
+        if cached_cost is not None and lowest_f >= cached_cost:
+            break
+
+        # Evento de progresso ou interrupção pelo orçamento, a cada intervalo de nós expandidos
+        if expanded_nodes >= next_event:
+            event = monitor.checkpoint(expanded_nodes, len(open_set), lowest_f / weight_den if weight_den > 1
+                                       else lowest_f, len(g_score))
+            next_event = monitor.next_event
+            if event is not None:
+                if event.done:
+                    event.set_stats(counted_stats(expanded, generated, expanded_nodes, reopened, open_set.stale_pops,
+                                                  peak_open, len(g_score), len(open_set), timer))
+                yield event
+                if event.done:
+                    return
 
         # Verifica se atingimos o estado objetivo
-        if current_str == goal_state:
-            exec_time = timeit.default_timer() - start_time
-            return reconstruct_path(goal_state, predecessors), exec_time, expanded_nodes
+        if current_board == goal_state:
+            exec_time = time.perf_counter() - start_time
+            if solutions is not None:
+                solutions.append((g_score[current], suboptimality, exec_time, expanded_nodes))
+            yield SearchProgress(expanded_nodes, len(open_set), g_score[current], exec_time,
+                                 reconstruct_path(goal_state, current.blank, predecessors, geometry), done=True,
+                                 suboptimality=suboptimality,
+                                 stats=counted_stats(expanded, generated, expanded_nodes, reopened,
+                                                     open_set.stale_pops, peak_open, len(g_score),
+                                                     len(open_set), timer))
+            return
+
+        # Um estado em cache tem distância exata até o objetivo
+        if cache is not None:
+            distance = cache.distance(current_board, geometry)
+            if distance is not None and (cached_cost is None or g_score[current] + distance < cached_cost):
+                cached_cost = g_score[current] + distance
+                cached_board = current_board
+                cached_blank = current.blank
 
         # Explora todos os vizinhos do estado atual
-        for neighbor in current.get_neighbors(): 
-            # Pula se o vizinho já foi completamente explorado
-            if neighbor in closed_set:
-                continue
-                
-            # Calcula o novo custo g para este vizinho
-            tentative_g = g_score[current] + 1
-            
+        expanded += 1
+        neighbors = current.get_neighbors(heuristic_fn) if timer is None else timer.successors(current, heuristic_fn)
+        generated += len(neighbors)
+
+        # Calcula o novo custo g para os vizinhos
+        tentative_g = g_score[current] + 1
+        directions = move_direction[current.blank]
+
+        for neighbor in neighbors:
             # Verifica se este é um novo estado ou se encontramos um caminho melhor
-            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+            previous_g = g_score.get(neighbor)
+            if previous_g is None or tentative_g < previous_g:
                 expanded_nodes += 1
+                if previous_g is not None:
+                    reopened += 1
                 
                 # Atualiza o custo g para este vizinho
                 g_score[neighbor] = tentative_g
 
                 # Buscar o custo h para este vizinho
-                heuristic_value = getattr(neighbor, heuristic_attr)
+                heuristic_value = neighbor.heuristic_value(heuristic_fn)
                 
-                # Calcula o f_score (f = g + h)
-                f_score = tentative_g + heuristic_value
+                # Calcula o f_score (f = g + h, escalado se houver peso)
+                f_score = weight_den * tentative_g + weight_num * heuristic_value
                 
-                # Atualiza o predecessor deste vizinho
-                predecessors[neighbor.from_matrix_string()] = current_str
+                # Guarda o movimento que levou a este vizinho
+                predecessors[neighbor.board] = directions[neighbor.blank]
                 
                 # Adiciona ou atualiza o vizinho na fila de prioridade
-                open_set.push(neighbor, f_score)
+                open_set.push(neighbor, f_score, tentative_g)
+
+        if len(open_set) > peak_open:
+            peak_open = len(open_set)
+
+    stats = counted_stats(expanded, generated, expanded_nodes, reopened, open_set.stale_pops, peak_open,
+                          len(g_score), len(open_set), timer)
+
+    # Completa o caminho até o estado em cache com o sufixo guardado
+    if cached_board is not None:
+        path = cache.complete_path(reconstruct_path(cached_board, cached_blank, predecessors, geometry))
+        if path is not None:
+            yield SearchProgress(expanded_nodes, len(open_set), cached_cost, time.perf_counter() - start_time,
+                                 path, done=True, suboptimality=1.0, stats=stats)
+            return
     
     # Se não encontrou solução
-    return deque(), timeit.default_timer() - start_time, expanded_nodes
\ No newline at end of file
+    yield SearchProgress(expanded_nodes, 0, None, time.perf_counter() - start_time, Solution(), done=True,
+                         stats=stats)
+
+
+def _anytime_astar_stream(initial_state: State, heuristic_fn, queue: str, weight: float, weight_step: float,
+                          interval: Optional[int], budget: Optional[SearchBudget],
+                          solutions: Optional[List[Tuple[int, float, float, int]]]) -> Iterator[SearchProgress]:
+    """A* anytime (ARA*, Likhachev et al.): A* ponderado em rodadas de peso decrescente.
+
+    Cada rodada expande, em ordem de g + w * h, apenas os nós que podem melhorar a
+    solução atual, e cada estado é expandido no máximo uma vez por rodada: um
+    estado já fechado cujo g melhora vai para a lista de inconsistentes (INCONS).
+    Entre rodadas, o peso diminui e a fronteira (com os inconsistentes) é
+    reordenada com o novo peso; os custos g e os predecessores são mantidos.
+
+    Após cada rodada, a solução tem custo no máximo min(w, custo / min(g + h)) vezes o
+    ótimo, com o mínimo sobre a fronteira e os inconsistentes (heurística consistente).
+    Com uma heurística não admissível esse limite não vale: as rodadas seguem até
+    o peso 1 e o limite informado é None.
+
+    Args:
+        initial_state: Estado inicial do puzzle
+        heuristic_fn: Função heurística registrada
+        queue: Implementação da fila de prioridade ('heap' ou 'bucket')
+        weight: Peso da primeira rodada
+        weight_step: Redução do peso entre rodadas
+        interval: Nós expandidos entre eventos de progresso (None para nenhum)
+        budget: Limites de execução; ao exceder um, a busca termina com a melhor solução
+        solutions: Lista que recebe (custo, limite provado, tempo, nós expandidos) de cada solução
+
+    Yields:
+        SearchProgress: Progresso, um evento por solução melhor (com path e
+        suboptimality) e o evento final com a melhor solução
+    """
+    if weight_step <= 0:
+        raise ValueError(f"A redução do peso deve ser positiva (recebido {weight_step})")
+    weight_num, weight_den = _weight_ratio(weight)
+    epsilon = Fraction(weight_num, weight_den)
+    step = Fraction(weight_step).limit_denominator(_MAX_WEIGHT_DENOMINATOR)
+
+    start_time = time.perf_counter()
+    geometry = initial_state.geometry
+    goal_state = geometry.goal_board
+    move_direction = geometry.move_direction
+
+    expanded_nodes = 0
+    g_score: Dict[State, int] = {initial_state: 0}
+    predecessors: Dict[int, Optional[int]] = {initial_state.board: None}
+    goal_g = 0 if initial_state.board == goal_state else float("inf")
+
+    # Contadores detalhados (ver utils.search_stats); stale_pops soma as filas de todas as rodadas
+    expanded = 0
+    generated = 0
+    reopened = 0
+    stale_pops = 0
+    peak_open = 1
+    rounds = 1
+
+    def stats():
+        return counted_stats(expanded, generated, expanded_nodes, reopened, stale_pops + open_set.stale_pops,
+                             peak_open, len(g_score), len(open_set), rounds=rounds)
+
+    # Melhor solução encontrada e seu limite provado (infinito sem heurística admissível,
+    # informado como None)
+    admissible = heuristic_fn.admissible
+    best_path: Optional[Solution] = None
+    best_bound = float("inf")
+
+    def proven_bound() -> Optional[float]:
+        return best_bound if admissible else None
+
+    open_set = make_priority_queue(queue)
+    open_set.push(initial_state, weight_num * initial_state.heuristic_value(heuristic_fn), 0)
+    closed_set: Set[State] = set()
+    inconsistent: Set[State] = set()
+
+    monitor = SearchMonitor(start_time, interval, budget)
+    next_event = monitor.next_event
+
+    while True:
+        # Rodada: expande enquanto algum nó aberto puder melhorar a solução atual
+        goal_priority = weight_den * goal_g
+        while not open_set.empty():
+            priority, current = open_set.pop()
+            if priority >= goal_priority:
+                open_set.push(current, priority, g_score[current])
+                break
+            closed_set.add(current)
+
+            if expanded_nodes >= next_event:
+                event = monitor.checkpoint(expanded_nodes, len(open_set), priority / weight_den, len(g_score))
+                next_event = monitor.next_event
+                if event is not None:
+                    if event.done and best_path is not None:
+                        # Prazo ou limite excedido: a melhor solução até aqui é o resultado
+                        event = SearchProgress(expanded_nodes, len(open_set), len(best_path) - 1, event.elapsed,
+                                               best_path, done=True, suboptimality=proven_bound())
+                    if event.done:
+                        event.set_stats(stats())
+                    yield event
+                    if event.done:
+                        return
+
+            expanded += 1
+            neighbors = current.get_neighbors(heuristic_fn)
+            generated += len(neighbors)
+            tentative_g = g_score[current] + 1
+            directions = move_direction[current.blank]
+            for neighbor in neighbors:
+                previous_g = g_score.get(neighbor)
+                if previous_g is None or tentative_g < previous_g:
+                    expanded_nodes += 1
+                    if previous_g is not None:
+                        reopened += 1
+                    g_score[neighbor] = tentative_g
+                    predecessors[neighbor.board] = directions[neighbor.blank]
+                    if neighbor.board == goal_state:
+                        goal_g = tentative_g
+                        goal_priority = weight_den * goal_g
+                    if neighbor in closed_set:
+                        inconsistent.add(neighbor)
+                    else:
+                        open_set.push(neighbor, weight_den * tentative_g
+                                      + weight_num * neighbor.heuristic_value(heuristic_fn), tentative_g)
+            if len(open_set) > peak_open:
+                peak_open = len(open_set)
+
+        if goal_g == float("inf"):
+            # Fronteira esgotada sem solução (estado não solucionável)
+            yield SearchProgress(expanded_nodes, 0, None, time.perf_counter() - start_time, Solution(), done=True,
+                                 stats=stats())
+            return
+
+        # Limite provado: o menor g + h da fronteira e dos inconsistentes não supera o custo ótimo
+        path = reconstruct_path(goal_state, geometry.goal_blank, predecessors, geometry)
+        cost = path.cost
+        lower_bound = min((g_score[state] + state.heuristic_value(heuristic_fn)
+                           for state in chain(open_set, inconsistent)), default=cost)
+        if not admissible:
+            bound = float("inf")
+        elif epsilon == 1 or not 0 < lower_bound < cost:
+            bound = 1.0  # Uma rodada com peso 1 termina com a solução ótima
+        else:
+            bound = min(float(epsilon), cost / lower_bound)
+        exec_time = time.perf_counter() - start_time
+
+        if best_path is None or cost < len(best_path) - 1 or bound < best_bound:
+            best_path, best_bound = path, min(bound, best_bound)
+            if solutions is not None:
+                solutions.append((cost, proven_bound(), exec_time, expanded_nodes))
+            if best_bound > 1:
+                yield SearchProgress(expanded_nodes, len(open_set), cost, exec_time, best_path,
+                                     suboptimality=proven_bound())
+
+        if best_bound <= 1 or epsilon == 1:
+            yield SearchProgress(expanded_nodes, len(open_set), cost, exec_time, best_path, done=True,
+                                 suboptimality=proven_bound(), stats=stats())
+            return
+
+        # Próxima rodada: peso menor, fronteira com os inconsistentes reordenada, fechados esvaziados
+        epsilon = max(Fraction(1), epsilon - step)
+        weight_num, weight_den = epsilon.numerator, epsilon.denominator
+        next_open = make_priority_queue(queue)
+        for state in chain(open_set, inconsistent):
+            g = g_score[state]
+            next_open.push(state, weight_den * g + weight_num * state.heuristic_value(heuristic_fn), g)
+        stale_pops += open_set.stale_pops
+        open_set = next_open
+        inconsistent = set()
+        closed_set = set()
+        rounds += 1
+
+
+def _in_sorted(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    """Indica, para cada valor, se ele pertence ao vetor ordenado (busca binária vetorizada)."""
+    if not sorted_values.size:
+        return np.zeros(values.shape, dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_values, values), sorted_values.size - 1)
+    return sorted_values[positions] == values
+
+
+def _batched_astar_search(initial_state: State, heuristic_fn, batch_size: Optional[int] = None,
+                          budget: Optional[SearchBudget] = None) -> SearchResult:
+    """A* com expansão em lotes vetorizados.
+
+    A fronteira é organizada em baldes por (f, g). A cada passo, todos os nós do
+    balde de menor f e maior g (o mesmo desempate da fila por baldes) são
+    retirados de uma vez como um vetor de tabuleiros empacotados em uint64. Os
+    sucessores das quatro direções são gerados com operações de bits vetorizadas,
+    descartados em bloco se já fechados (busca binária no vetor ordenado de
+    fechados) e avaliados de uma vez pela versão vetorizada da heurística
+    (atributo batch, ver utils.heuristics.register_batch), ou nó a nó se ela não
+    existir.
+
+    Args:
+        initial_state: Estado inicial do puzzle (tabuleiros de até 4x4)
+        heuristic_fn: Função heurística registrada
+        batch_size: Número máximo de nós retirados por lote (padrão: o balde inteiro)
+        budget: Limites de execução (ver utils.budget), verificados a cada lote
+
+    Returns:
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos e estatísticas (as duplicatas retiradas
+        de um lote contam como entradas obsoletas), ou um BudgetExceeded se um
+        limite for excedido
+
+    Raises:
+        ValueError: Se o tabuleiro empacotado não couber em 64 bits
+    """
+    geometry: BoardGeometry = initial_state.geometry
+    if geometry.bits * geometry.cells > 64:
+        raise ValueError(f"O modo em lotes suporta tabuleiros de até 64 bits (recebido {geometry.size}x{geometry.size})")
+
+    start_time = time.perf_counter()
+
+    # Estados não solucionáveis esgotariam metade do espaço de estados
+    if not initial_state.is_solvable():
+        return empty_result(time.perf_counter() - start_time)
+
+    bits = np.uint64(geometry.bits)
+    mask = np.uint64(geometry.tile_mask)
+    cell_shifts = np.arange(geometry.cells, dtype=np.uint64) * bits
+    move_targets = np.array(geometry.move_targets, dtype=np.int64)
+    goal_state = np.uint64(geometry.goal_board)
+    batch_fn = getattr(heuristic_fn, 'batch', None)
+
+    def evaluate(boards: np.ndarray, blanks: np.ndarray) -> np.ndarray:
+        """Avalia a heurística para um vetor de tabuleiros."""
+        if batch_fn is not None:
+            tiles = ((boards[:, None] >> cell_shifts[None, :]) & mask).astype(np.int64)
+            return batch_fn(tiles, geometry)
+        return np.fromiter(
+            (heuristic_fn(State.from_packed(board, blank, geometry))
+             for board, blank in zip(boards.tolist(), blanks.tolist())),
+            dtype=np.int64, count=boards.size,
+        )
+
+    # Fronteira: open_set[f][g] -> lista de blocos (tabuleiros, vazios, movimentos de chegada)
+    open_set: Dict[int, Dict[int, List[Tuple[np.ndarray, np.ndarray, np.ndarray]]]] = {}
+
+    def push(f_score: int, g: int, boards: np.ndarray, blanks: np.ndarray, moves: np.ndarray) -> None:
+        open_set.setdefault(f_score, {}).setdefault(g, []).append((boards, blanks, moves))
+
+    # Vetor ordenado dos tabuleiros fechados e movimentos de chegada registrados no fechamento
+    closed = np.empty(0, dtype=np.uint64)
+    predecessors: Dict[int, Optional[int]] = {}
+    expanded_nodes = 0
+
+    # Contadores detalhados (ver utils.search_stats); open_count inclui as duplicatas ainda na fronteira
+    expanded = 0
+    generated = 0
+    stale_pops = 0
+    open_count = 1
+    peak_open = 1
+
+    initial_boards = np.array([initial_state.board], dtype=np.uint64)
+    initial_blanks = np.array([initial_state.blank], dtype=np.int64)
+    push(initial_state.heuristic_value(heuristic_fn), 0, initial_boards, initial_blanks,
+         np.zeros(1, dtype=np.uint8))
+
+    while open_set:
+        # O custo de um lote domina o da verificação do orçamento: verifica a cada lote
+        if budget is not None:
+            reason = budget.exceeded(start_time, expanded_nodes, closed.size)
+            if reason is not None:
+                stats = counted_stats(expanded, generated, expanded_nodes, 0, stale_pops, peak_open,
+                                      closed.size + open_count, open_count)
+                return BudgetExceeded(reason, time.perf_counter() - start_time, expanded_nodes,
+                                      open_count, closed.size, min(open_set), stats)
+
+        # Retira o balde de menor f e, dentro dele, de maior g
+        f_score = min(open_set)
+        layer = open_set[f_score]
+        g = max(layer)
+        chunks = layer.pop(g)
+        if not layer:
+            del open_set[f_score]
+        boards = np.concatenate([chunk[0] for chunk in chunks])
+        blanks = np.concatenate([chunk[1] for chunk in chunks])
+        moves = np.concatenate([chunk[2] for chunk in chunks])
+
+        if batch_size is not None and boards.size > batch_size:
+            push(f_score, g, boards[batch_size:], blanks[batch_size:], moves[batch_size:])
+            boards, blanks, moves = boards[:batch_size], blanks[:batch_size], moves[:batch_size]
+        popped = boards.size
+        open_count -= popped
+
+        # Descarta duplicatas do lote e tabuleiros já fechados
+        boards, first = np.unique(boards, return_index=True)
+        blanks = blanks[first]
+        moves = moves[first]
+        fresh = ~_in_sorted(boards, closed)
+        boards, blanks, moves = boards[fresh], blanks[fresh], moves[fresh]
+        stale_pops += popped - boards.size
+        if not boards.size:
+            continue
+
+        # Fecha o lote (ambos os vetores estão ordenados e são disjuntos)
+        closed = np.insert(closed, np.searchsorted(closed, boards), boards)
+        predecessors.update(zip(boards.tolist(), moves.tolist()))
+
+        # Verifica se atingimos o estado objetivo
+        if (boards == goal_state).any():
+            exec_time = time.perf_counter() - start_time
+            stats = counted_stats(expanded, generated, expanded_nodes, 0, stale_pops, peak_open,
+                                  closed.size + open_count, open_count)
+            # O estado inicial foi fechado no primeiro lote com o código 0 do seu empilhamento;
+            # marca-o como início do caminho uma única vez, na reconstrução
+            predecessors[initial_state.board] = None
+            path = reconstruct_path(geometry.goal_board, geometry.goal_blank, predecessors, geometry)
+            return SearchResult(path, exec_time, expanded_nodes, stats)
+        expanded += boards.size
+
+        # Gera os sucessores das quatro direções de uma só vez
+        child_boards = []
+        child_blanks = []
+        child_moves = []
+        for direction in range(move_targets.shape[1]):
+            targets = move_targets[blanks, direction]
+            valid = targets >= 0
+            parent_boards = boards[valid]
+            targets = targets[valid]
+            target_shifts = targets.astype(np.uint64) * bits
+            blank_shifts = blanks[valid].astype(np.uint64) * bits
+            tiles = (parent_boards >> target_shifts) & mask
+            child_boards.append(parent_boards ^ (tiles << target_shifts) ^ (tiles << blank_shifts))
+            child_blanks.append(targets)
+            child_moves.append(np.full(targets.size, direction, dtype=np.uint8))
+        children = np.concatenate(child_boards)
+        children_blanks = np.concatenate(child_blanks)
+        children_moves = np.concatenate(child_moves)
+        generated += children.size
+
+        # Descarta em bloco os sucessores já fechados e repetidos
+        fresh = ~_in_sorted(children, closed)
+        children, first = np.unique(children[fresh], return_index=True)
+        children_blanks = children_blanks[fresh][first]
+        children_moves = children_moves[fresh][first]
+        expanded_nodes += children.size
+
+        # Avalia a heurística em bloco e distribui os sucessores pelos baldes de f
+        child_g = g + 1
+        child_f = child_g + evaluate(children, children_blanks)
+        for value in np.unique(child_f).tolist():
+            selected = child_f == value
+            push(value, child_g, children[selected], children_blanks[selected], children_moves[selected])
+        open_count += children.size
+        if open_count > peak_open:
+            peak_open = open_count
+
+    # Se não encontrou solução
+    stats = counted_stats(expanded, generated, expanded_nodes, 0, stale_pops, peak_open, closed.size, 0)
+    return empty_result(time.perf_counter() - start_time, expanded_nodes, stats)
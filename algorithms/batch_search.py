@@ -0,0 +1,200 @@
+"""
+Resolução em lote de muitos tabuleiros distribuída em um pool de processos.
+
+Os tabuleiros são enviados aos processos em blocos, como strings (ex:
+'867254301'), e cada bloco devolve o SearchResult completo de cada tabuleiro
+(caminho, tempo, nós expandidos e estatísticas). As tabelas pré-calculadas (tabela de
+transições, banco de distâncias, bancos de padrões) não são serializadas: as
+que faltam são construídas no processo principal antes de criar o pool, e cada
+processo as mapeia em memória uma única vez ao iniciar, de modo que as páginas
+dos arquivos são compartilhadas entre os processos pelo sistema operacional.
+
+Um orçamento (ver utils.budget) limita cada tabuleiro: o que o excede devolve
+um BudgetExceeded com o motivo. O token de cancelamento do orçamento é repassado
+aos processos por um multiprocessing.Event, de modo que cancelar o lote interrompe
+também as buscas em andamento.
+"""
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from algorithms.astar_search import astar_search
+from algorithms.bidirectional_search import mm_search
+from algorithms.breadth_first_search import breadth_first_search
+from algorithms.greedy_search import greedy_best_first_search
+from algorithms.ida_star import ida_star_search
+from algorithms.oracle_search import oracle_search
+from algorithms.sma_star import sma_star_search
+from utils.budget import CancellationToken, SearchBudget
+from utils.search_stats import SearchResult
+from utils.state import State, board_to_string
+
+# Resultado de um tabuleiro: (índice na entrada, resultado da busca)
+BatchResult = Tuple[int, SearchResult]
+
+# Algoritmos disponíveis, indexados pelo nome, e se recebem a heurística
+ALGORITHMS: Dict[str, Tuple[Callable, bool]] = {
+    "bfs": (breadth_first_search, False),
+    "bfs_ranked": (partial(breadth_first_search, ranked=True), False),
+    "bfs_bidirectional": (partial(breadth_first_search, bidirectional=True), False),
+    "bfs_vectorized": (partial(breadth_first_search, vectorized=True), False),
+    "greedy": (greedy_best_first_search, True),
+    "astar": (astar_search, True),
+    "astar_batched": (partial(astar_search, batched=True), True),
+    "astar_weighted": (partial(astar_search, weight=2.0), True),
+    "ara": (partial(astar_search, anytime=True), True),
+    "mm": (mm_search, True),
+    "ida": (ida_star_search, True),
+    "sma": (partial(sma_star_search, max_nodes=50_000), True),
+    "oracle": (oracle_search, False),
+}
+
+# Intervalo, em segundos, entre as verificações do token de cancelamento no processo principal
+CANCEL_POLL_INTERVAL = 0.1
+
+# Algoritmo, heurística e orçamento do processo trabalhador (definidos em _init_worker)
+_worker_solver: Optional[Callable[[State], SearchResult]] = None
+
+
+def get_solver(algorithm: str, heuristic: str = "manhattan") -> Callable[[State], SearchResult]:
+    """Obtém a função que resolve um estado com o algoritmo e a heurística informados.
+
+    Args:
+        algorithm: Nome do algoritmo em ALGORITHMS
+        heuristic: Nome da heurística registrada (ignorada pelos algoritmos não informados)
+
+    Returns:
+        Callable: Função que recebe um State e devolve um SearchResult
+
+    Raises:
+        ValueError: Se o algoritmo informado não estiver disponível
+    """
+    try:
+        fn, uses_heuristic = ALGORITHMS[algorithm]
+    except KeyError:
+        available = ", ".join(sorted(ALGORITHMS))
+        raise ValueError(f"Algoritmo desconhecido: {algorithm!r} (disponíveis: {available})") from None
+    return partial(fn, heuristic=heuristic) if uses_heuristic else fn
+
+
+def preload_tables(algorithm: str, heuristic: str, size: int) -> None:
+    """Carrega (mapeia em memória) as tabelas usadas pelo algoritmo e pela heurística.
+
+    As cargas são memorizadas por processo (lru_cache nas funções de carga), então
+    as buscas seguintes reutilizam os mesmos mapeamentos.
+    """
+    if algorithm in ("bfs_ranked", "bfs_vectorized"):
+        from utils.transition_table import load_transition_table
+        load_transition_table()
+    if algorithm == "oracle":
+        from utils.distance_table import load_distance_table
+        load_distance_table()
+    if heuristic == "pdb" and ALGORITHMS[algorithm][1]:
+        from utils.pattern_database import get_pattern_database
+        get_pattern_database(size)
+
+
+def _init_worker(algorithm: str, heuristic: str, size: int, budget: Optional[SearchBudget]) -> None:
+    """Inicializa um processo trabalhador: resolve o algoritmo e carrega as tabelas."""
+    global _worker_solver
+    solver = get_solver(algorithm, heuristic)
+    _worker_solver = solver if budget is None else partial(solver, budget=budget)
+    preload_tables(algorithm, heuristic, size)
+
+
+def _worker_budget(budget: SearchBudget, token: Optional[CancellationToken]) -> SearchBudget:
+    """Cópia do orçamento para os processos trabalhadores, com o token informado."""
+    return SearchBudget(budget.max_nodes, budget.max_time, budget.max_memory, token,
+                        budget.check_interval, budget.bytes_per_state)
+
+
+def _solve_chunk(chunk: List[Tuple[int, str]]) -> List[BatchResult]:
+    """Resolve um bloco de tabuleiros no processo trabalhador."""
+    return [(index, _worker_solver(State.from_string(text))) for index, text in chunk]
+
+
+def solve_many(boards: Sequence[Union[State, str]], algorithm: str = "astar", heuristic: str = "manhattan",
+               workers: Optional[int] = None, chunk_size: Optional[int] = None,
+               stats: Optional[Dict[str, float]] = None,
+               budget: Optional[SearchBudget] = None) -> Iterator[BatchResult]:
+    """Resolve muitos tabuleiros em paralelo, devolvendo os resultados à medida que ficam prontos.
+
+    Os resultados chegam na ordem de conclusão dos blocos (não na ordem de
+    entrada); o índice de cada resultado identifica o tabuleiro correspondente.
+
+    Args:
+        boards: Tabuleiros a resolver (State ou string como '867254301'), todos da mesma dimensão
+        algorithm: Nome do algoritmo em ALGORITHMS
+        heuristic: Nome da heurística registrada (para os algoritmos informados)
+        workers: Número de processos (padrão: número de núcleos disponíveis); com 1,
+            resolve no próprio processo
+        chunk_size: Tabuleiros por bloco (padrão: cerca de 4 blocos por processo)
+        stats: Dicionário opcional que recebe, ao final, o número de tabuleiros,
+            o tempo total, o total de nós expandidos e a vazão (boards_per_sec)
+        budget: Limites de cada tabuleiro (ver utils.budget); o prazo conta a partir
+            do início de cada busca, e cancelar o token interrompe todas as buscas
+            restantes, que devolvem um BudgetExceeded com reason == CANCELLED
+
+    Yields:
+        BatchResult: (índice do tabuleiro, SearchResult da busca, com as estatísticas em
+        stats), ou um BudgetExceeded (com o motivo em reason) se um limite for excedido
+
+    Raises:
+        ValueError: Se o algoritmo informado não estiver disponível
+    """
+    solver = get_solver(algorithm, heuristic)
+    texts = [board if isinstance(board, str) else board_to_string(board.board, board.geometry)
+             for board in boards]
+    size = math.isqrt(len(texts[0])) if texts else 3
+    if workers is None:
+        workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(texts) / (workers * 4)))
+
+    start_time = time.perf_counter()
+    total_nodes = 0
+
+    # Constrói as tabelas que faltam uma única vez, antes de iniciar os processos
+    preload_tables(algorithm, heuristic, size)
+
+    if workers <= 1:
+        if budget is not None:
+            solver = partial(solver, budget=budget)
+        for index, text in enumerate(texts):
+            result = solver(State.from_string(text))
+            total_nodes += result.expanded_nodes
+            yield index, result
+    else:
+        indexed = list(enumerate(texts))
+        chunks = [indexed[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        # O token do chamador vive neste processo; os trabalhadores recebem um token
+        # ligado a um evento entre processos, sinalizado quando o do chamador é cancelado
+        token = budget.token if budget is not None else None
+        shared_token = CancellationToken(multiprocessing.Event()) if token is not None else None
+        worker_budget = _worker_budget(budget, shared_token) if budget is not None else None
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(algorithm, heuristic, size, worker_budget)) as executor:
+            pending = {executor.submit(_solve_chunk, chunk) for chunk in chunks}
+            while pending:
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL if token is not None else None,
+                                     return_when=FIRST_COMPLETED)
+                if token is not None and token.cancelled:
+                    shared_token.cancel()
+                for future in done:
+                    for index, result in future.result():
+                        total_nodes += result.expanded_nodes
+                        yield index, result
+
+    if stats is not None:
+        elapsed = time.perf_counter() - start_time
+        stats.update({
+            "boards": len(texts),
+            "workers": workers,
+            "elapsed": elapsed,
+            "total_nodes": total_nodes,
+            "boards_per_sec": len(texts) / elapsed if elapsed > 0 else 0,
+        })
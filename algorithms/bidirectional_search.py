@@ -0,0 +1,370 @@
+"""
+Buscas bidirecionais: expandem alternadamente a partir do estado inicial e do
+objetivo até que as duas fronteiras se encontrem.
+
+Como todo movimento do puzzle é reversível, a busca para trás usa o mesmo
+gerador de vizinhos da busca para frente. Ambas operam diretamente sobre
+tabuleiros empacotados e guardam, para cada tabuleiro alcançado, o movimento
+que levou a ele; a solução é a metade da busca para frente seguida da metade
+da busca para trás invertida.
+"""
+import heapq
+import time
+from typing import Dict, List, Optional
+
+from utils.budget import BudgetExceeded, SearchBudget, first_check
+from utils.heuristics import admissible_call, get_heuristic
+from utils.search_stats import SearchResult, counted_stats, empty_result
+from utils.solution import Solution, reconstruct_path
+from utils.solution_cache import cached_solver
+from utils.state import BoardGeometry, State
+
+
+def _join_paths(meeting: int, meeting_blank: int, forward_parents: Dict[int, Optional[int]],
+                backward_parents: Dict[int, Optional[int]], geometry: BoardGeometry) -> Solution:
+    """Une as duas metades do caminho no estado de encontro.
+
+    Args:
+        meeting: Tabuleiro empacotado em que as buscas se encontraram
+        meeting_blank: Célula do espaço vazio no tabuleiro de encontro
+        forward_parents: Movimentos de chegada da busca a partir do estado inicial
+        backward_parents: Movimentos de chegada da busca a partir do objetivo
+        geometry: Geometria do tabuleiro
+
+    Returns:
+        Solution: Solução do estado inicial até o objetivo
+    """
+    # Do estado inicial até o encontro, e do objetivo até o encontro (invertida)
+    to_meeting = reconstruct_path(meeting, meeting_blank, forward_parents, geometry)
+    from_goal = reconstruct_path(meeting, meeting_blank, backward_parents, geometry)
+    return Solution(to_meeting.initial, to_meeting.moves + from_goal.reversed().moves)
+
+
+def _tile_positions(board: int, geometry: BoardGeometry) -> List[int]:
+    """Célula ocupada por cada peça de um tabuleiro empacotado."""
+    positions = [0] * geometry.cells
+    for cell, tile in enumerate(geometry.unpack(board)):
+        positions[tile] = cell
+    return positions
+
+
+def _manhattan_table_to(target: int, geometry: BoardGeometry) -> List[List[int]]:
+    """Tabela de distâncias Manhattan até um tabuleiro qualquer, indexada por [peça][célula]."""
+    size = geometry.size
+    positions = _tile_positions(target, geometry)
+    return [
+        [
+            0 if tile == 0 else
+            abs(positions[tile] // size - cell // size) + abs(positions[tile] % size - cell % size)
+            for cell in range(geometry.cells)
+        ]
+        for tile in range(geometry.cells)
+    ]
+
+
+def bidirectional_breadth_first_search(initial_state: State,
+                                       budget: Optional[SearchBudget] = None) -> SearchResult:
+    """Busca em largura bidirecional.
+
+    A cada passo expande uma camada completa da fronteira menor. Ao gerar um
+    vizinho já alcançado pela outra busca, registra o encontro; ao fim da camada,
+    o menor encontro é ótimo, pois qualquer caminho mais curto teria um estado
+    nesta camada já visitado (em profundidade exata) pela busca oposta.
+
+    Args:
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        budget: Limites de execução (ver utils.budget)
+
+    Returns:
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos e estatísticas das duas direções
+        somadas (ver utils.search_stats), ou um BudgetExceeded (com caminho vazio)
+        se um limite for excedido
+    """
+    start_time = time.perf_counter()
+
+    # As duas fronteiras nunca se encontrariam em um estado não solucionável
+    if not initial_state.is_solvable():
+        return empty_result(time.perf_counter() - start_time)
+
+    geometry = initial_state.geometry
+    bits = geometry.bits
+    mask = geometry.tile_mask
+    neighbor_cells = geometry.neighbor_cells
+    move_direction = geometry.move_direction
+
+    # Movimento de chegada e profundidade de cada tabuleiro, por direção
+    forward_parents: Dict[int, Optional[int]] = {initial_state.board: None}
+    backward_parents: Dict[int, Optional[int]] = {geometry.goal_board: None}
+    forward_depth: Dict[int, int] = {initial_state.board: 0}
+    backward_depth: Dict[int, int] = {geometry.goal_board: 0}
+
+    # Fronteiras: pares (tabuleiro, célula do vazio) da última camada de cada direção
+    forward_frontier = [(initial_state.board, initial_state.blank)]
+    backward_frontier = [(geometry.goal_board, geometry.goal_blank)]
+
+    expanded_nodes = 0
+
+    # Contadores detalhados (ver utils.search_stats), copiados para SearchStats apenas no fim
+    expanded = 0
+    generated = 0
+    peak_open = 2
+
+    def stats():
+        stored = len(forward_parents) + len(backward_parents)
+        return counted_stats(expanded, generated, expanded_nodes, 0, 0, peak_open, stored,
+                             len(forward_frontier) + len(backward_frontier))
+
+    # Número de nós expandidos da próxima verificação do orçamento
+    next_check = first_check(budget)
+
+    if initial_state.board == geometry.goal_board:
+        return SearchResult(_join_paths(initial_state.board, initial_state.blank, forward_parents, backward_parents,
+                                        geometry), time.perf_counter() - start_time, expanded_nodes, stats())
+
+    while forward_frontier and backward_frontier:
+        # Expande a direção com a menor fronteira
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, parents, depth = forward_frontier, forward_parents, forward_depth
+            other_depth = backward_depth
+        else:
+            frontier, parents, depth = backward_frontier, backward_parents, backward_depth
+            other_depth = forward_depth
+
+        best_cost = None
+        meeting = None
+        meeting_blank = None
+        next_frontier = []
+
+        for board, blank in frontier:
+            if expanded_nodes >= next_check:
+                stored_states = len(forward_parents) + len(backward_parents)
+                reason = budget.exceeded(start_time, expanded_nodes, stored_states)
+                if reason is not None:
+                    return BudgetExceeded(reason, time.perf_counter() - start_time, expanded_nodes,
+                                          len(forward_frontier) + len(backward_frontier), stored_states,
+                                          forward_depth[forward_frontier[0][0]] + backward_depth[backward_frontier[0][0]],
+                                          stats())
+                next_check = budget.next_check(expanded_nodes)
+
+            expanded += 1
+            generated += len(neighbor_cells[blank])
+            child_depth = depth[board] + 1
+            blank_shift = bits * blank
+            directions = move_direction[blank]
+            for cell in neighbor_cells[blank]:
+                shift = bits * cell
+                tile = (board >> shift) & mask
+                child = board ^ (tile << shift) ^ (tile << blank_shift)
+                if child in parents:
+                    continue
+                expanded_nodes += 1
+                parents[child] = directions[cell]
+                depth[child] = child_depth
+                next_frontier.append((child, cell))
+
+                # Encontro com a busca oposta
+                if child in other_depth:
+                    cost = child_depth + other_depth[child]
+                    if best_cost is None or cost < best_cost:
+                        best_cost = cost
+                        meeting = child
+                        meeting_blank = cell
+
+        if frontier is forward_frontier:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+        peak_open = max(peak_open, len(forward_frontier) + len(backward_frontier))
+
+        if meeting is not None:
+            exec_time = time.perf_counter() - start_time
+            return SearchResult(_join_paths(meeting, meeting_blank, forward_parents, backward_parents, geometry),
+                                exec_time, expanded_nodes, stats())
+
+    # Se não encontrou solução
+    return empty_result(time.perf_counter() - start_time, expanded_nodes, stats())
+
+
+@cached_solver(optimal=admissible_call)
+def mm_search(initial_state: State, heuristic: str = "manhattan",
+              budget: Optional[SearchBudget] = None) -> SearchResult:
+    """Busca heurística bidirecional MM ("meet in the middle").
+
+    Cada direção ordena sua fronteira pela prioridade max(f, 2g), de modo que
+    nenhuma das buscas avança além da metade do caminho ótimo. A cada passo é
+    expandido o nó de menor prioridade entre as duas fronteiras; a busca termina
+    quando o melhor caminho encontrado U não excede essa prioridade mínima C,
+    o que garante a otimalidade com heurísticas admissíveis.
+
+    A busca para frente usa a heurística registrada (definida em relação ao
+    objetivo); a busca para trás usa a distância Manhattan até o estado inicial.
+
+    Args:
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        heuristic: Nome da heurística registrada em utils.heuristics (busca para frente)
+        budget: Limites de execução (ver utils.budget)
+
+    Returns:
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos e estatísticas das duas direções
+        somadas (ver utils.search_stats), ou um BudgetExceeded (com caminho vazio)
+        se um limite for excedido
+
+    Raises:
+        ValueError: Se a heurística informada não estiver registrada
+    """
+    # Resolve a heurística uma única vez (falha antes de iniciar a busca se for desconhecida)
+    heuristic_fn = get_heuristic(heuristic)
+
+    start_time = time.perf_counter()
+
+    # As duas fronteiras nunca se encontrariam em um estado não solucionável
+    if not initial_state.is_solvable():
+        return empty_result(time.perf_counter() - start_time)
+
+    geometry = initial_state.geometry
+    bits = geometry.bits
+    mask = geometry.tile_mask
+    neighbor_cells = geometry.neighbor_cells
+    move_direction = geometry.move_direction
+    heuristic_delta = getattr(heuristic_fn, 'delta', None)
+    backward_table = _manhattan_table_to(initial_state.board, geometry)
+
+    def forward_h(parent: int, child: int, parent_h: int, tile: int, from_cell: int, to_cell: int) -> int:
+        """Heurística até o objetivo, incremental quando a heurística permite."""
+        if heuristic_delta is not None:
+            return parent_h + heuristic_delta(parent, child, geometry, tile, from_cell, to_cell)
+        return heuristic_fn(State.from_packed(child, from_cell, geometry))
+
+    def backward_h(parent: int, child: int, parent_h: int, tile: int, from_cell: int, to_cell: int) -> int:
+        """Distância Manhattan até o estado inicial, atualizada pela peça movida."""
+        return parent_h + backward_table[tile][to_cell] - backward_table[tile][from_cell]
+
+    # Estado de cada direção: custo g, heurística, movimentos de chegada e fronteira
+    # (heap de tuplas (prioridade, g, tabuleiro, célula do vazio) com remoção preguiçosa,
+    # e o número de entradas obsoletas descartadas)
+    initial_h = initial_state.heuristic_value(heuristic_fn)
+    forward = {
+        "g": {initial_state.board: 0},
+        "h": {initial_state.board: initial_h},
+        "parents": {initial_state.board: None},
+        "open": [(initial_h, 0, initial_state.board, initial_state.blank)],
+        "closed": set(),
+        "estimate": forward_h,
+        "stale_pops": 0,
+    }
+    goal_h = sum(backward_table[tile][cell] for cell, tile in enumerate(geometry.unpack(geometry.goal_board)))
+    backward = {
+        "g": {geometry.goal_board: 0},
+        "h": {geometry.goal_board: goal_h},
+        "parents": {geometry.goal_board: None},
+        "open": [(goal_h, 0, geometry.goal_board, geometry.goal_blank)],
+        "closed": set(),
+        "estimate": backward_h,
+        "stale_pops": 0,
+    }
+
+    expanded_nodes = 0
+    best_cost = float("inf")
+    meeting = None
+    meeting_blank = None
+
+    # Contadores detalhados (ver utils.search_stats), copiados para SearchStats apenas no fim
+    expanded = 0
+    generated = 0
+    reopened = 0
+    peak_open = 2
+
+    def stats():
+        open_size = len(forward["open"]) + len(backward["open"])
+        return counted_stats(expanded, generated, expanded_nodes, reopened,
+                             forward["stale_pops"] + backward["stale_pops"], peak_open,
+                             len(forward["g"]) + len(backward["g"]), open_size)
+
+    # Número de nós expandidos da próxima verificação do orçamento
+    next_check = first_check(budget)
+    if initial_state.board == geometry.goal_board:
+        best_cost = 0
+        meeting = initial_state.board
+        meeting_blank = initial_state.blank
+
+    def top_priority(side: dict) -> float:
+        """Descarta entradas obsoletas e devolve a menor prioridade da fronteira."""
+        heap = side["open"]
+        while heap and (heap[0][2] in side["closed"] or heap[0][1] != side["g"][heap[0][2]]):
+            heapq.heappop(heap)
+            side["stale_pops"] += 1
+        return heap[0][0] if heap else float("inf")
+
+    while True:
+        forward_top = top_priority(forward)
+        backward_top = top_priority(backward)
+        lower_bound = min(forward_top, backward_top)
+
+        # Critério de parada do MM: nenhum caminho ainda aberto pode ser mais curto que U
+        if best_cost <= lower_bound:
+            break
+
+        if expanded_nodes >= next_check:
+            stored_states = len(forward["g"]) + len(backward["g"])
+            reason = budget.exceeded(start_time, expanded_nodes, stored_states)
+            if reason is not None:
+                return BudgetExceeded(reason, time.perf_counter() - start_time, expanded_nodes,
+                                      len(forward["open"]) + len(backward["open"]), stored_states, lower_bound,
+                                      stats())
+            next_check = budget.next_check(expanded_nodes)
+
+        side, other = (forward, backward) if forward_top <= backward_top else (backward, forward)
+        _, g, board, blank = heapq.heappop(side["open"])
+        side["closed"].add(board)
+        expanded += 1
+        generated += len(neighbor_cells[blank])
+
+        g_score = side["g"]
+        h_score = side["h"]
+        parents = side["parents"]
+        estimate = side["estimate"]
+        other_g = other["g"]
+        parent_h = h_score[board]
+        child_g = g + 1
+        blank_shift = bits * blank
+        directions = move_direction[blank]
+
+        for cell in neighbor_cells[blank]:
+            shift = bits * cell
+            tile = (board >> shift) & mask
+            child = board ^ (tile << shift) ^ (tile << blank_shift)
+
+            # Reabre o vizinho apenas se encontramos um caminho melhor até ele
+            previous_g = g_score.get(child)
+            if previous_g is not None and previous_g <= child_g:
+                continue
+            expanded_nodes += 1
+            if previous_g is not None:
+                reopened += 1
+            side["closed"].discard(child)
+            g_score[child] = child_g
+            parents[child] = directions[cell]
+            if child not in h_score:
+                h_score[child] = estimate(board, child, parent_h, tile, cell, blank)
+            child_h = h_score[child]
+            heapq.heappush(side["open"], (max(child_g + child_h, 2 * child_g), child_g, child, cell))
+
+            # Encontro com a busca oposta
+            if child in other_g and child_g + other_g[child] < best_cost:
+                best_cost = child_g + other_g[child]
+                meeting = child
+                meeting_blank = cell
+
+        open_size = len(forward["open"]) + len(backward["open"])
+        if open_size > peak_open:
+            peak_open = open_size
+
+    if meeting is None:
+        # Se não encontrou solução
+        return empty_result(time.perf_counter() - start_time, expanded_nodes, stats())
+
+    exec_time = time.perf_counter() - start_time
+    return SearchResult(_join_paths(meeting, meeting_blank, forward["parents"], backward["parents"], geometry),
+                        exec_time, expanded_nodes, stats())
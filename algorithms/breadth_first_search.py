@@ -1,36 +1,98 @@
 import time
+from array import array
 from collections import deque
-from typing import Tuple, Dict, List, Deque, Optional, Set
+from typing import Tuple, Dict, Iterator, List, Deque, Optional, Set
 
-from utils.state import State, reconstruct_path
+import numpy as np
 
+from algorithms.bidirectional_search import bidirectional_breadth_first_search
+from utils.budget import BudgetExceeded, SearchBudget, first_check
+from utils.progress import DEFAULT_PROGRESS_INTERVAL, SearchProgress, SearchMonitor, run_to_completion
+from utils.ranking import NUM_STATES, rank_board
+from utils.search_stats import SearchResult, SearchStats, counted_stats, empty_result
+from utils.solution import Solution, reconstruct_path
+from utils.solution_cache import SolutionCache, cached_solver
+from utils.state import GOAL_BOARD, GOAL_BOARD_BLANK, SIZE, State
+from utils.transition_table import load_transition_table, reconstruct_ranked_path
 
-def breadth_first_search(initial_state: State) -> Tuple[Deque[str], float, int]:
+
+# Marca de estado ainda não alcançado no vetor de movimentos (as direções vão de 0 a 3)
+_UNVISITED = 0xFF
+
+
+@cached_solver(optimal=True)
+def breadth_first_search(initial_state: State, ranked: bool = False,
+                         bidirectional: bool = False, vectorized: bool = False,
+                         layer_sizes: Optional[List[int]] = None, cache: Optional[SolutionCache] = None,
+                         budget: Optional[SearchBudget] = None) -> SearchResult:
     """Implementa o algoritmo de busca em largura para encontrar um caminho para o estado objetivo.
     
     A busca em largura explora todos os estados na mesma profundidade antes de avançar,
-    garantindo encontrar o caminho com menor número de movimentos.
+    garantindo encontrar o caminho com menor número de movimentos. O modo padrão
+    consome breadth_first_search_stream sem eventos intermediários.
     
     Args:
-        initial_state: Estado inicial do puzzle
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        ranked: Se True, usa o modo indexado por rank (ver _ranked_breadth_first_search)
+        bidirectional: Se True, busca a partir do estado inicial e do objetivo
+            (ver algorithms.bidirectional_search)
+        vectorized: Se True, expande camadas inteiras com NumPy (ver
+            _vectorized_breadth_first_search)
+        layer_sizes: Lista opcional que recebe, no modo vectorized, o número de
+            estados de cada profundidade até a do objetivo
+        cache: Cache de soluções (ver utils.solution_cache); no modo padrão, a busca
+            termina quando a profundidade atual alcança o custo do caminho por um
+            estado em cache
+        budget: Limites de execução (ver utils.budget), verificados em todos os modos
+            (no modo vectorized, entre camadas)
         
     Returns:
-        Tuple contendo:
-            - Deque[str]: Caminho da solução (sequência de estados)
-            - float: Tempo de execução em segundos
-            - int: Número de estados expandidos
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos e estatísticas (ver utils.search_stats),
+        ou um BudgetExceeded (com caminho vazio) se um limite for excedido
+    """
+    if ranked:
+        return _ranked_breadth_first_search(initial_state, budget)
+    if bidirectional:
+        return bidirectional_breadth_first_search(initial_state, budget)
+    if vectorized:
+        return _vectorized_breadth_first_search(initial_state, layer_sizes, budget)
+
+    # A consulta e o armazenamento no cache já são feitos pelo decorador desta função
+    return run_to_completion(breadth_first_search_stream.__wrapped__(initial_state, cache=cache, interval=None,
+                                                                     budget=budget))
+
+
+@cached_solver(optimal=True)
+def breadth_first_search_stream(initial_state: State, cache: Optional[SolutionCache] = None,
+                                interval: Optional[int] = DEFAULT_PROGRESS_INTERVAL,
+                                budget: Optional[SearchBudget] = None) -> Iterator[SearchProgress]:
+    """Versão em fluxo da busca em largura (modo padrão de breadth_first_search).
+
+    Args:
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        cache: Cache de soluções (ver breadth_first_search)
+        interval: Nós expandidos entre eventos de progresso (None para apenas o evento final)
+        budget: Limites de execução (ver utils.budget)
+
+    Yields:
+        SearchProgress: Progresso a cada intervalo (bound é a profundidade atual)
+        e, por último, o evento final com o caminho da solução e as estatísticas (ou
+        com exceeded, se um limite do orçamento for excedido)
     """
     start_time = time.perf_counter() 
 
-    # Contador de estados expandidos
+    # Contador de estados expandidos (estados novos, a contagem histórica)
     expanded_nodes = 0
+
+    # Contadores detalhados (ver utils.search_stats), copiados para SearchStats apenas no fim
+    expanded = 0
+    generated = 0
+    peak_open = 1
     
-    # Conjunto para verificar rapidamente se um estado já foi visitado
-    visited_set: Set[State] = set()
-    
-    # Dicionário para rastrear predecessores (para reconstrução do caminho)
-    # Usamos a representação em string para compatibilidade com a função reconstruct_path
-    predecessors: Dict[str, Optional[str]] = {}
+    # Dicionário com o movimento (0-3) que alcançou cada estado, para reconstrução do caminho
+    # Usamos o tabuleiro empacotado como chave; o predecessor é obtido desfazendo o movimento
+    predecessors: Dict[int, Optional[int]] = {}
     
     # Fila para a busca em largura
     queue = deque()
@@ -38,37 +100,289 @@ def breadth_first_search(initial_state: State) -> Tuple[Deque[str], float, int]:
     # Adiciona o estado inicial à fila
     queue.append(initial_state)
     
-    # Marca o estado inicial como visitado
-    visited_set.add(initial_state)
-    predecessors[initial_state.from_matrix_string()] = None
+    # Marca o estado inicial como visitado (as chaves de predecessors formam o conjunto de visitados)
+    predecessors[initial_state.board] = None
+
+    # Estado objetivo em formato empacotado (depende da dimensão do tabuleiro)
+    geometry = initial_state.geometry
+    goal_state = geometry.goal_board
+    move_direction = geometry.move_direction
 
-    # Estado objetivo em formato de string
-    goal_state = '123456780'
+    # Com cache: profundidade de cada estado e melhor solução conhecida por um estado em cache
+    depths: Optional[Dict[int, int]] = {initial_state.board: 0} if cache is not None else None
+    cached_cost = None
+    cached_board = None
+    cached_blank = None
+
+    # Eventos de progresso e verificações do orçamento
+    monitor = SearchMonitor(start_time, interval, budget)
+    next_event = monitor.next_event
     
     while queue:
         # Obtém o próximo estado da fila
         current = queue.popleft()
-        current_str = current.from_matrix_string()
+        current_board = current.board
 
         # Verifica se atingimos o estado objetivo
-        if current_str == goal_state:
+        if current_board == goal_state:
             exec_time = time.perf_counter() - start_time
-            return reconstruct_path(goal_state, predecessors), exec_time, expanded_nodes
+            path = reconstruct_path(goal_state, current.blank, predecessors, geometry)
+            yield SearchProgress(expanded_nodes, len(queue), len(path) - 1, exec_time, path, done=True,
+                                 stats=counted_stats(expanded, generated, expanded_nodes, 0, 0, peak_open,
+                                                     len(predecessors), len(queue)))
+            return
+
+        # Evento de progresso ou interrupção pelo orçamento, a cada intervalo de nós expandidos
+        if expanded_nodes >= next_event:
+            current_depth = reconstruct_path(current_board, current.blank, predecessors, geometry).cost
+            event = monitor.checkpoint(expanded_nodes, len(queue), current_depth, len(predecessors))
+            next_event = monitor.next_event
+            if event is not None:
+                if event.done:
+                    event.set_stats(counted_stats(expanded, generated, expanded_nodes, 0, 0, peak_open,
+                                                  len(predecessors), len(queue)))
+                yield event
+                if event.done:
+                    return
+
+        if depths is not None:
+            depth = depths[current_board]
+            # Os estados restantes estão a pelo menos esta profundidade: o caminho em cache é ótimo
+            if cached_cost is not None and depth >= cached_cost:
+                break
+            distance = cache.distance(current_board, geometry)
+            if distance is not None and (cached_cost is None or depth + distance < cached_cost):
+                cached_cost = depth + distance
+                cached_board = current_board
+                cached_blank = current.blank
 
         # Explora todos os vizinhos do estado atual
-        for neighbor in current.get_neighbors():
-            # Verifica se este vizinho já foi visitado usando o conjunto
-            if neighbor not in visited_set:
+        expanded += 1
+        neighbors = current.get_neighbors()
+        generated += len(neighbors)
+        directions = move_direction[current.blank]
+        for neighbor in neighbors:
+            # Verifica se este vizinho já foi visitado usando as chaves de predecessors
+            if neighbor.board not in predecessors:
                 expanded_nodes += 1
                 
-                # Marca o vizinho como visitado
-                visited_set.add(neighbor)
-                
                 # Adiciona o vizinho à fila
                 queue.append(neighbor)
                 
-                # Atualiza o predecessor deste vizinho
-                predecessors[neighbor.from_matrix_string()] = current_str
+                # Guarda o movimento que levou a este vizinho
+                predecessors[neighbor.board] = directions[neighbor.blank]
+                if depths is not None:
+                    depths[neighbor.board] = depth + 1
+
+        if len(queue) > peak_open:
+            peak_open = len(queue)
+
+    stats = counted_stats(expanded, generated, expanded_nodes, 0, 0, peak_open, len(predecessors), len(queue))
+
+    # Completa o caminho até o estado em cache com o sufixo guardado
+    if cached_board is not None:
+        path = cache.complete_path(reconstruct_path(cached_board, cached_blank, predecessors, geometry))
+        if path is not None:
+            yield SearchProgress(expanded_nodes, len(queue), cached_cost, time.perf_counter() - start_time,
+                                 path, done=True, stats=stats)
+            return
     
     # Se não encontrou solução
-    return deque(), time.perf_counter() - start_time, expanded_nodes
+    yield SearchProgress(expanded_nodes, 0, None, time.perf_counter() - start_time, Solution(), done=True,
+                         stats=stats)
+
+
+def _ranked_breadth_first_search(initial_state: State,
+                                 budget: Optional[SearchBudget] = None) -> SearchResult:
+    """Busca em largura sobre índices compactos (hash perfeito) dos estados.
+    
+    O movimento que levou a cada estado é guardado em um buffer pré-alocado de
+    um byte por estado, indexado pelo rank do estado, que também serve de
+    conjunto de visitados (_UNVISITED se o estado ainda não foi alcançado).
+    A fila também é um array de inteiros de 32 bits, e a expansão de um nó é
+    uma única leitura de linha na tabela de transições.
+    
+    Args:
+        initial_state: Estado inicial do puzzle
+        budget: Limites de execução (ver utils.budget)
+        
+    Returns:
+        SearchResult no mesmo formato de breadth_first_search
+        
+    Raises:
+        ValueError: Se o tabuleiro não for 3x3 (o índice compacto cobre apenas esse espaço)
+    """
+    if initial_state.size != SIZE:
+        raise ValueError(f"A busca em largura ranqueada só suporta o tabuleiro {SIZE}x{SIZE}")
+
+    start_time = time.perf_counter()
+
+    # O índice compacto só cobre estados solucionáveis
+    if not initial_state.is_solvable():
+        return empty_result(time.perf_counter() - start_time)
+
+    table = load_transition_table()
+
+    # Contador de estados expandidos
+    expanded_nodes = 0
+
+    # Sucessores gerados e maior fila (os expandidos são os índices já lidos da fila)
+    generated = 0
+    peak_open = 1
+
+    # Buffer indexado pelo rank: direção usada para chegar ao estado (_UNVISITED se não alcançado)
+    unvisited = _UNVISITED
+    parent_moves = bytearray([unvisited]) * NUM_STATES
+
+    # Fila pré-alocada (cada estado entra no máximo uma vez) com índices de leitura e escrita
+    queue = array('i', bytes(4 * NUM_STATES))
+    head, tail = 0, 1
+
+    initial_rank = rank_board(initial_state.board, initial_state.blank)
+    goal_rank = rank_board(GOAL_BOARD, GOAL_BOARD_BLANK)
+    queue[0] = initial_rank
+    parent_moves[initial_rank] = 0
+
+    # Número de nós expandidos da próxima verificação do orçamento
+    next_check = first_check(budget)
+
+    while head < tail:
+        current = queue[head]
+        head += 1
+
+        if expanded_nodes >= next_check:
+            reason = budget.exceeded(start_time, expanded_nodes, tail)
+            if reason is not None:
+                stats = counted_stats(head - 1, generated, expanded_nodes, 0, 0, peak_open, tail, tail - head)
+                return BudgetExceeded(reason, time.perf_counter() - start_time, expanded_nodes, tail - head, tail,
+                                      stats=stats)
+            next_check = budget.next_check(expanded_nodes)
+
+        # Verifica se atingimos o estado objetivo
+        if current == goal_rank:
+            exec_time = time.perf_counter() - start_time
+            stats = counted_stats(head - 1, generated, expanded_nodes, 0, 0, peak_open, tail, tail - head)
+            return SearchResult(reconstruct_ranked_path(goal_rank, initial_rank, parent_moves, table), exec_time,
+                                expanded_nodes, stats)
+
+        # Cada linha da tabela contém os sucessores nas quatro direções (-1 se inválido)
+        for move, neighbor in enumerate(table[current].tolist()):
+            if neighbor >= 0:
+                generated += 1
+                if parent_moves[neighbor] == unvisited:
+                    expanded_nodes += 1
+                    parent_moves[neighbor] = move
+                    queue[tail] = neighbor
+                    tail += 1
+        if tail - head > peak_open:
+            peak_open = tail - head
+
+    # Se não encontrou solução
+    stats = counted_stats(head, generated, expanded_nodes, 0, 0, peak_open, tail, 0)
+    return empty_result(time.perf_counter() - start_time, expanded_nodes, stats)
+
+
+def breadth_first_layers(initial_rank: int, stop_rank: Optional[int] = None,
+                         layer_sizes: Optional[List[int]] = None,
+                         budget: Optional[SearchBudget] = None,
+                         stats: Optional[SearchStats] = None) -> np.ndarray:
+    """Busca em largura síncrona por camadas sobre os índices compactos.
+
+    Cada camada é um vetor de ranks; a próxima é obtida lendo de uma vez as
+    linhas da tabela de transições de toda a camada. As duplicatas da camada são
+    removidas com np.unique e os estados já alcançados são descartados pelo
+    próprio vetor de movimentos (um byte por estado, _UNVISITED se não alcançado),
+    que também guarda a direção usada para chegar a cada estado.
+
+    Args:
+        initial_rank: Índice compacto do estado inicial
+        stop_rank: Índice em que a busca para ao ser alcançado (padrão: explora todo o espaço)
+        layer_sizes: Lista opcional que recebe o número de estados de cada profundidade
+        budget: Limites de execução (ver utils.budget), verificados entre camadas; se
+            um limite for excedido, a busca para e os estados não alcançados ficam _UNVISITED
+        stats: Estatísticas opcionais que recebem os contadores das camadas expandidas
+            (ver utils.search_stats; a maior fronteira é a maior camada)
+
+    Returns:
+        np.ndarray: Vetor uint8 com a direção que levou a cada estado (_UNVISITED se não alcançado)
+    """
+    start_time = time.perf_counter()
+    table = load_transition_table()
+    moves_per_state = table.shape[1]
+    parent_moves = np.full(NUM_STATES, _UNVISITED, dtype=np.uint8)
+    parent_moves[initial_rank] = 0
+    frontier = np.array([initial_rank], dtype=np.int64)
+    if layer_sizes is not None:
+        layer_sizes.append(1)
+    move_codes = np.arange(moves_per_state, dtype=np.uint8)
+    reached = 1
+    expanded = 0
+    generated = 0
+    peak_open = 1
+
+    while frontier.size and (stop_rank is None or parent_moves[stop_rank] == _UNVISITED):
+        if budget is not None and budget.exceeded(start_time, reached - 1, reached) is not None:
+            break
+        successors = table[frontier].ravel()
+        moves = np.broadcast_to(move_codes, (frontier.size, moves_per_state)).ravel()
+        valid = successors >= 0
+        expanded += int(frontier.size)
+        generated += int(np.count_nonzero(valid))
+        successors, first = np.unique(successors[valid], return_index=True)
+        moves = moves[valid][first]
+        new = parent_moves[successors] == _UNVISITED
+        frontier = successors[new]
+        parent_moves[frontier] = moves[new]
+        reached += int(frontier.size)
+        peak_open = max(peak_open, int(frontier.size))
+        if layer_sizes is not None and frontier.size:
+            layer_sizes.append(int(frontier.size))
+
+    if stats is not None:
+        stats.expanded = expanded
+        stats.generated = generated
+        stats.duplicates = generated - (reached - 1)
+        stats.peak_open = peak_open
+        stats.peak_closed = reached - int(frontier.size)
+    return parent_moves
+
+
+def _vectorized_breadth_first_search(initial_state: State, layer_sizes: Optional[List[int]] = None,
+                                     budget: Optional[SearchBudget] = None) -> SearchResult:
+    """Busca em largura com camadas vetorizadas (ver breadth_first_layers).
+
+    Args:
+        initial_state: Estado inicial do puzzle
+        layer_sizes: Lista opcional que recebe o número de estados de cada profundidade
+        budget: Limites de execução (ver utils.budget), verificados entre camadas
+
+    Returns:
+        SearchResult no mesmo formato de breadth_first_search
+
+    Raises:
+        ValueError: Se o tabuleiro não for 3x3 (o índice compacto cobre apenas esse espaço)
+    """
+    if initial_state.size != SIZE:
+        raise ValueError(f"A busca em largura vetorizada só suporta o tabuleiro {SIZE}x{SIZE}")
+
+    start_time = time.perf_counter()
+
+    # O índice compacto só cobre estados solucionáveis
+    if not initial_state.is_solvable():
+        return empty_result(time.perf_counter() - start_time)
+
+    initial_rank = rank_board(initial_state.board, initial_state.blank)
+    goal_rank = rank_board(GOAL_BOARD, GOAL_BOARD_BLANK)
+    stats = SearchStats()
+    parent_moves = breadth_first_layers(initial_rank, goal_rank, layer_sizes, budget, stats)
+
+    # Estados alcançados, sem contar o inicial (mesma contagem dos outros modos)
+    expanded_nodes = int(np.count_nonzero(parent_moves != _UNVISITED)) - 1
+
+    # A busca só para antes do objetivo se um limite do orçamento foi excedido
+    if parent_moves[goal_rank] == _UNVISITED:
+        elapsed = time.perf_counter() - start_time
+        reason = budget.exceeded(start_time, expanded_nodes, expanded_nodes + 1)
+        return BudgetExceeded(reason, elapsed, expanded_nodes, 0, expanded_nodes + 1, stats=stats)
+    path = reconstruct_ranked_path(goal_rank, initial_rank, parent_moves, load_transition_table())
+    return SearchResult(path, time.perf_counter() - start_time, expanded_nodes, stats)
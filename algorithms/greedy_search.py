@@ -1,74 +1,172 @@
 import heapq
 import time
-from collections import deque
-from typing import Tuple, Dict, List, Deque, Optional, Set
+from typing import Tuple, Dict, Iterator, List, Optional, Set
 
-from utils.state import State, reconstruct_path
-from utils.priority_queue import PriorityQueue
+from utils.budget import SearchBudget
+from utils.heuristics import get_heuristic
+from utils.progress import DEFAULT_PROGRESS_INTERVAL, SearchProgress, SearchMonitor, run_to_completion
+from utils.search_stats import PhaseTimer, SearchResult, counted_stats
+from utils.solution import Solution, reconstruct_path
+from utils.solution_cache import SolutionCache, cached_solver
+from utils.state import State
+from utils.priority_queue import make_priority_queue
 
-def greedy_best_first_search(initial_state: State) -> Tuple[Deque[str], float, int]:
+@cached_solver(optimal=False)
+def greedy_best_first_search(initial_state: State, heuristic: str = "manhattan",
+                             queue: str = "heap", cache: Optional[SolutionCache] = None,
+                             budget: Optional[SearchBudget] = None, phase_timing: bool = False) -> SearchResult:
     """Implementa o algoritmo de busca gulosa para encontrar um caminho para o estado objetivo.
     
     A busca gulosa de melhor primeiro usa apenas a heurística para escolher o próximo estado,
-    sem considerar o custo do caminho percorrido até o momento.
+    sem considerar o custo do caminho percorrido até o momento. Consome
+    greedy_best_first_search_stream sem eventos intermediários.
     
     Args:
-        initial_state: Estado inicial do puzzle
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        heuristic: Nome da heurística registrada em utils.heuristics
+        queue: Implementação da fila de prioridade ('heap' ou 'bucket', ver
+            utils.priority_queue)
+        cache: Cache de soluções (ver utils.solution_cache); a busca termina ao
+            alcançar um estado em cache, completando o caminho com o sufixo guardado
+        budget: Limites de execução (ver utils.budget)
+        phase_timing: Se True, mede o tempo gasto na heurística, na geração de sucessores
+            e na fila (ver utils.search_stats)
         
     Returns:
-        Tuple contendo:
-            - Deque[str]: Caminho da solução (sequência de estados)
-            - float: Tempo de execução em segundos
-            - int: Número de estados expandidos
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos e estatísticas (ver utils.search_stats),
+        ou um BudgetExceeded (com caminho vazio) se um limite for excedido
+            
+    Raises:
+        ValueError: Se a heurística ou a fila informada não estiver registrada
     """
+    # A consulta no cache já é feita pelo decorador desta função
+    return run_to_completion(greedy_best_first_search_stream.__wrapped__(initial_state, heuristic, queue,
+                                                                         cache=cache, interval=None, budget=budget,
+                                                                         phase_timing=phase_timing))
+
+
+@cached_solver(optimal=False)
+def greedy_best_first_search_stream(initial_state: State, heuristic: str = "manhattan", queue: str = "heap",
+                                    cache: Optional[SolutionCache] = None,
+                                    interval: Optional[int] = DEFAULT_PROGRESS_INTERVAL,
+                                    budget: Optional[SearchBudget] = None,
+                                    phase_timing: bool = False) -> Iterator[SearchProgress]:
+    """Versão em fluxo da busca gulosa.
+
+    Args:
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        heuristic: Nome da heurística registrada em utils.heuristics
+        queue: Implementação da fila de prioridade ('heap' ou 'bucket')
+        cache: Cache de soluções (ver greedy_best_first_search)
+        interval: Nós expandidos entre eventos de progresso (None para apenas o evento final)
+        budget: Limites de execução (ver utils.budget)
+        phase_timing: Se True, mede o tempo de cada fase (ver greedy_best_first_search)
+
+    Yields:
+        SearchProgress: Progresso a cada intervalo (bound é a heurística do estado atual)
+        e, por último, o evento final com o caminho da solução e as estatísticas (ou
+        com exceeded, se um limite do orçamento for excedido)
+
+    Raises:
+        ValueError: Se a heurística ou a fila informada não estiver registrada
+    """
+    # Resolve a heurística uma única vez (falha antes de iniciar a busca se for desconhecida)
+    heuristic_fn = get_heuristic(heuristic)
+    
     start_time = time.perf_counter() 
 
-    # Contador de estados expandidos
+    # Contador de estados expandidos (estados novos, a contagem histórica)
     expanded_nodes = 0
+
+    # Contadores detalhados (ver utils.search_stats), copiados para SearchStats apenas no fim
+    expanded = 0
+    generated = 0
+    peak_open = 1
     
-    # Conjunto para verificar rapidamente se um estado já foi visitado
-    visited_set: Set[State] = set()
-    
-    # Dicionário para rastrear predecessores (para reconstrução do caminho)
-    predecessors: Dict[str, Optional[str]] = {}
+    # Dicionário com o movimento (0-3) que alcançou cada estado, para reconstrução do caminho
+    predecessors: Dict[int, Optional[int]] = {}
     
     # Fila de prioridade personalizada para a busca gulosa
-    open_set = PriorityQueue()
+    open_set = make_priority_queue(queue)
+
+    # Tempo por fase: a heurística e a fila passam a medir o próprio tempo
+    timer = PhaseTimer() if phase_timing else None
+    if timer is not None:
+        heuristic_fn = timer.wrap_heuristic(heuristic_fn)
+        open_set = timer.wrap_queue(open_set)
     
     # Adiciona o estado inicial à fila de prioridade
-    open_set.push(initial_state, initial_state.heuristic)
+    open_set.push(initial_state, initial_state.heuristic_value(heuristic_fn))
+
+    # Marca o estado inicial como visitado (as chaves de predecessors formam o conjunto de visitados)
+    predecessors[initial_state.board] = None
 
-    # Marca o estado inicial como visitado
-    visited_set.add(initial_state)
-    predecessors[initial_state.from_matrix_string()] = None
+    # Estado objetivo em formato empacotado (depende da dimensão do tabuleiro)
+    geometry = initial_state.geometry
+    goal_state = geometry.goal_board
+    move_direction = geometry.move_direction
 
-    # Estado objetivo em formato de string
-    goal_state = '123456780'
+    # Eventos de progresso e verificações do orçamento
+    monitor = SearchMonitor(start_time, interval, budget)
+    next_event = monitor.next_event
     
     while not open_set.empty():
         # Obtém o estado com menor valor de heurística
-        _, current = open_set.pop()
-        current_str = current.from_matrix_string()
+        current_h, current = open_set.pop()
+        current_board = current.board
 
         # Verifica se atingimos o estado objetivo
-        if current_str == goal_state:
+        if current_board == goal_state:
             exec_time = time.perf_counter() - start_time
-            return reconstruct_path(goal_state, predecessors), exec_time, expanded_nodes
+            yield SearchProgress(expanded_nodes, len(open_set), current_h, exec_time,
+                                 reconstruct_path(goal_state, current.blank, predecessors, geometry), done=True,
+                                 stats=counted_stats(expanded, generated, expanded_nodes, 0, open_set.stale_pops,
+                                                     peak_open, len(predecessors), len(open_set), timer))
+            return
+
+        # Um estado em cache já tem caminho conhecido até o objetivo
+        if cache is not None and cache.distance(current_board, geometry) is not None:
+            path = cache.complete_path(reconstruct_path(current_board, current.blank, predecessors, geometry))
+            if path is not None:
+                yield SearchProgress(expanded_nodes, len(open_set), current_h, time.perf_counter() - start_time,
+                                     path, done=True,
+                                     stats=counted_stats(expanded, generated, expanded_nodes, 0, open_set.stale_pops,
+                                                         peak_open, len(predecessors), len(open_set), timer))
+                return
+
+        # Evento de progresso ou interrupção pelo orçamento, a cada intervalo de nós expandidos
+        if expanded_nodes >= next_event:
+            event = monitor.checkpoint(expanded_nodes, len(open_set), current_h, len(predecessors))
+            next_event = monitor.next_event
+            if event is not None:
+                if event.done:
+                    event.set_stats(counted_stats(expanded, generated, expanded_nodes, 0, open_set.stale_pops,
+                                                  peak_open, len(predecessors), len(open_set), timer))
+                yield event
+                if event.done:
+                    return
 
         # Explora todos os vizinhos do estado atual
-        for neighbor in current.get_neighbors(): 
-            # Verifica se este vizinho já foi visitado usando o conjunto
-            if neighbor not in visited_set:
+        expanded += 1
+        neighbors = current.get_neighbors(heuristic_fn) if timer is None else timer.successors(current, heuristic_fn)
+        generated += len(neighbors)
+        directions = move_direction[current.blank]
+        for neighbor in neighbors:
+            # Verifica se este vizinho já foi visitado usando as chaves de predecessors
+            if neighbor.board not in predecessors:
                 expanded_nodes += 1
                 
-                # Marca o vizinho como visitado
-                visited_set.add(neighbor)
-                
                 # Adiciona o vizinho à fila de prioridade
-                open_set.push(neighbor, neighbor.heuristic)
+                open_set.push(neighbor, neighbor.heuristic_value(heuristic_fn))
                 
-                # Atualiza o predecessor deste vizinho
-                predecessors[neighbor.from_matrix_string()] = current_str
+                # Guarda o movimento que levou a este vizinho
+                predecessors[neighbor.board] = directions[neighbor.blank]
+
+        if len(open_set) > peak_open:
+            peak_open = len(open_set)
     
     # Se não encontrou solução
-    return deque(), time.perf_counter() - start_time, expanded_nodes
\ No newline at end of file
+    yield SearchProgress(expanded_nodes, 0, None, time.perf_counter() - start_time, Solution(), done=True,
+                         stats=counted_stats(expanded, generated, expanded_nodes, 0, open_set.stale_pops,
+                                             peak_open, len(predecessors), 0, timer))
\ No newline at end of file
@@ -0,0 +1,224 @@
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from utils.budget import BudgetExceeded, SearchBudget, first_check
+from utils.heuristics import admissible_call, get_heuristic
+from utils.progress import DEFAULT_PROGRESS_INTERVAL, SearchProgress, SearchMonitor, run_to_completion
+from utils.search_stats import SearchResult, SearchStats
+from utils.solution import Solution, solution_from_boards
+from utils.solution_cache import cached_solver
+from utils.state import State
+
+# Valores de retorno da busca em profundidade quando o objetivo é encontrado e
+# quando um limite do orçamento é excedido (os limiares f nunca são negativos)
+_FOUND = -1
+_EXCEEDED = -2
+
+
+@cached_solver(optimal=admissible_call)
+def ida_star_search(initial_state: State, heuristic: str = "manhattan",
+                    iterations: Optional[List[Tuple[int, int]]] = None,
+                    budget: Optional[SearchBudget] = None) -> SearchResult:
+    """Implementa o algoritmo IDA* (A* com aprofundamento iterativo).
+
+    Executa buscas em profundidade limitadas por um limiar de f = g + h, que é
+    elevado ao menor f que excedeu o limiar na iteração anterior. Um único
+    tabuleiro empacotado é alterado no lugar a cada movimento e restaurado no
+    retrocesso, de modo que a memória usada é proporcional à profundidade.
+    Se a heurística tiver atualização incremental (ver register_delta), o valor
+    do filho é derivado do valor do pai a partir da peça movida. Consome
+    ida_star_search_stream sem eventos intermediários.
+
+    Args:
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        heuristic: Nome da heurística registrada em utils.heuristics
+        iterations: Lista opcional que recebe, para cada iteração, o par
+            (limiar, nós expandidos na iteração)
+        budget: Limites de execução (ver utils.budget); a memória estimada é a do caminho atual
+
+    Returns:
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos e estatísticas (ver utils.search_stats;
+        sem detecção de duplicatas, a maior fronteira é a maior profundidade do
+        caminho atual), ou um BudgetExceeded (com caminho vazio) se um limite for excedido
+
+    Raises:
+        ValueError: Se a heurística informada não estiver registrada
+    """
+    # A consulta e o armazenamento no cache já são feitos pelo decorador desta função
+    return run_to_completion(ida_star_search_stream.__wrapped__(initial_state, heuristic, iterations,
+                                                                interval=None, budget=budget))
+
+
+@cached_solver(optimal=admissible_call)
+def ida_star_search_stream(initial_state: State, heuristic: str = "manhattan",
+                           iterations: Optional[List[Tuple[int, int]]] = None,
+                           interval: Optional[int] = DEFAULT_PROGRESS_INTERVAL,
+                           budget: Optional[SearchBudget] = None) -> Iterator[SearchProgress]:
+    """Versão em fluxo do IDA*.
+
+    A busca em profundidade é recursiva, então o progresso é verificado ao fim
+    de cada iteração: um evento é produzido quando o intervalo de nós foi atingido.
+    O orçamento é verificado durante a recursão, que é abandonada se um limite
+    for excedido.
+
+    Args:
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        heuristic: Nome da heurística registrada em utils.heuristics
+        iterations: Lista opcional que recebe os pares (limiar, nós expandidos na iteração)
+        interval: Nós expandidos entre eventos de progresso (None para apenas o evento final)
+        budget: Limites de execução (ver utils.budget)
+
+    Yields:
+        SearchProgress: Progresso ao fim das iterações (bound é o próximo limiar;
+        a fronteira é vazia, pois só o caminho atual é guardado) e, por último,
+        o evento final com o caminho da solução e as estatísticas (ou com
+        exceeded, se um limite do orçamento for excedido)
+
+    Raises:
+        ValueError: Se a heurística informada não estiver registrada
+    """
+    # Resolve a heurística uma única vez (falha antes de iniciar a busca se for desconhecida)
+    heuristic_fn = get_heuristic(heuristic)
+
+    start_time = time.perf_counter()
+
+    # Estados não solucionáveis fariam o aprofundamento iterativo nunca terminar
+    if not initial_state.is_solvable():
+        yield SearchProgress(0, 0, None, time.perf_counter() - start_time, Solution(), done=True, stats=SearchStats())
+        return
+
+    geometry = initial_state.geometry
+    bits = geometry.bits
+    mask = geometry.tile_mask
+    neighbor_cells = geometry.neighbor_cells
+    goal_state = geometry.goal_board
+
+    # Tabuleiro único alterado no lugar e caminho atual (um tabuleiro por nível)
+    board = initial_state.board
+    blank = initial_state.blank
+    path = [board]
+
+    # Contadores de estados expandidos (total e na iteração corrente)
+    expanded_nodes = 0
+    iteration_nodes = 0
+
+    # Contadores detalhados (ver utils.search_stats): sucessores gerados, maior
+    # profundidade alcançada e número de iterações
+    generated = 0
+    max_depth = 0
+    iteration_count = 0
+
+    def stats() -> SearchStats:
+        return SearchStats(expanded_nodes, generated, peak_open=max_depth + 1, extra={"iterations": iteration_count})
+
+    heuristic_delta = getattr(heuristic_fn, 'delta', None)
+
+    def evaluate(current_board: int, current_blank: int) -> int:
+        """Avalia a heurística por completo para o tabuleiro atual."""
+        return heuristic_fn(State.from_packed(current_board, current_blank, geometry))
+
+    # Verificação do orçamento: nós da iteração em que ocorre e motivo da interrupção
+    next_check = first_check(budget)
+    exceeded_reason = None
+
+    def search(g: int, h: int, bound: int, previous_blank: int) -> int:
+        """Busca em profundidade limitada; retorna _FOUND, _EXCEEDED ou o menor f que excedeu o limiar."""
+        nonlocal board, blank, iteration_nodes, next_check, exceeded_reason, generated, max_depth
+
+        f_score = g + h
+        if f_score > bound:
+            return f_score
+        if board == goal_state:
+            return _FOUND
+
+        iteration_nodes += 1
+        if iteration_nodes >= next_check:
+            total_nodes = expanded_nodes + iteration_nodes
+            exceeded_reason = budget.exceeded(start_time, total_nodes, len(path))
+            if exceeded_reason is not None:
+                return _EXCEEDED
+            next_check = budget.next_check(total_nodes) - expanded_nodes
+        minimum = float("inf")
+        current_blank = blank
+        blank_shift = bits * current_blank
+
+        # O movimento que desfaz o anterior não é gerado
+        generated += len(neighbor_cells[current_blank]) - (previous_blank >= 0)
+        if g > max_depth:
+            max_depth = g
+
+        for cell in neighbor_cells[current_blank]:
+            # Não desfaz imediatamente o movimento anterior
+            if cell == previous_blank:
+                continue
+
+            # Move a peça da célula de destino para o espaço vazio (no lugar)
+            shift = bits * cell
+            tile = (board >> shift) & mask
+            move = (tile << shift) ^ (tile << blank_shift)
+            parent_board = board
+            board ^= move
+            blank = cell
+
+            if heuristic_delta is not None:
+                child_h = h + heuristic_delta(parent_board, board, geometry, tile, cell, current_blank)
+            else:
+                child_h = evaluate(board, cell)
+
+            path.append(board)
+            result = search(g + 1, child_h, bound, current_blank)
+            if result < 0:
+                return result
+            path.pop()
+
+            # Desfaz o movimento no retrocesso
+            board = parent_board
+            blank = current_blank
+
+            if result < minimum:
+                minimum = result
+
+        return minimum
+
+    initial_h = evaluate(board, blank)
+    bound = initial_h
+
+    # Eventos de progresso (o orçamento é verificado na recursão)
+    monitor = SearchMonitor(start_time, interval)
+
+    while True:
+        iteration_nodes = 0
+        if budget is not None:
+            next_check = budget.next_check(expanded_nodes) - expanded_nodes
+        result = search(0, initial_h, bound, -1)
+        expanded_nodes += iteration_nodes
+        iteration_count += 1
+        if iterations is not None:
+            iterations.append((bound, iteration_nodes))
+
+        if result == _FOUND:
+            yield SearchProgress(expanded_nodes, 0, bound, time.perf_counter() - start_time,
+                                 solution_from_boards(path, geometry), done=True, stats=stats())
+            return
+
+        if result == float("inf"):
+            # Se não encontrou solução
+            yield SearchProgress(expanded_nodes, 0, None, time.perf_counter() - start_time, Solution(), done=True,
+                                 stats=stats())
+            return
+
+        if result == _EXCEEDED:
+            elapsed = time.perf_counter() - start_time
+            exceeded = BudgetExceeded(exceeded_reason, elapsed, expanded_nodes, 0, len(path), bound, stats())
+            yield SearchProgress(expanded_nodes, 0, bound, elapsed, Solution(), done=True, exceeded=exceeded,
+                                 stats=exceeded.stats)
+            return
+
+        bound = result
+
+        # Evento de progresso quando o intervalo de nós foi atingido nesta iteração
+        if expanded_nodes >= monitor.next_event:
+            event = monitor.checkpoint(expanded_nodes, 0, bound, len(path))
+            if event is not None:
+                yield event
@@ -0,0 +1,52 @@
+import time
+from typing import Optional
+
+from utils.budget import BudgetExceeded, SearchBudget
+from utils.distance_table import descend
+from utils.ranking import rank_board, unrank_board
+from utils.search_stats import SearchResult, SearchStats, empty_result
+from utils.solution import solution_from_boards
+from utils.state import SIZE, State
+
+
+def oracle_search(initial_state: State, budget: Optional[SearchBudget] = None) -> SearchResult:
+    """Resolve o puzzle consultando o banco de distâncias exatas.
+    
+    Em vez de buscar, o oráculo desce o gradiente da tabela de distâncias: a cada
+    passo escolhe o vizinho que está um movimento mais perto do objetivo. O caminho
+    obtido é sempre ótimo e custa apenas algumas leituras de tabela por movimento.
+    
+    Args:
+        initial_state: Estado inicial do puzzle
+        budget: Limites de execução (ver utils.budget); como a descida custa no máximo
+            31 leituras de tabela, são verificados uma única vez, antes dela
+        
+    Returns:
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos (um por passo da descida) e estatísticas,
+        ou um BudgetExceeded (com caminho vazio) se um limite for excedido
+            
+    Raises:
+        ValueError: Se o tabuleiro não for 3x3 (o banco de distâncias cobre apenas esse espaço)
+    """
+    if initial_state.size != SIZE:
+        raise ValueError(f"O oráculo só suporta o tabuleiro {SIZE}x{SIZE}")
+
+    start_time = time.perf_counter()
+
+    # Estados não solucionáveis não estão no banco de distâncias
+    if not initial_state.is_solvable():
+        return empty_result(time.perf_counter() - start_time)
+
+    if budget is not None:
+        reason = budget.exceeded(start_time, 0, 0)
+        if reason is not None:
+            return BudgetExceeded(reason, time.perf_counter() - start_time, 0)
+
+    ranks = descend(rank_board(initial_state.board, initial_state.blank))
+
+    path = solution_from_boards([unrank_board(rank)[0] for rank in ranks])
+
+    exec_time = time.perf_counter() - start_time
+    steps = len(ranks) - 1
+    return SearchResult(path, exec_time, steps, SearchStats(expanded=steps))
@@ -0,0 +1,337 @@
+"""
+SMA* (A* com memória limitada, Russell 1992).
+
+A busca mantém em memória uma árvore de nós com no máximo max_nodes nós (ou o
+equivalente em bytes). Quando o limite é alcançado, a folha de maior f (a mais
+rasa, em caso de empate) é removida e seu f é guardado no pai ("esquecido"),
+que volta à fronteira para regerar o filho se ele voltar a ser promissor. O f
+de cada nó é propagado para cima como o menor f dos filhos, em memória ou
+esquecidos, de modo que nenhuma informação obtida pela busca se perde.
+
+A solução é ótima sempre que o caminho ótimo cabe no limite; caminhos mais
+profundos que o limite recebem f infinito e, nesse caso, a solução devolvida
+é a melhor que cabe na memória (ver o campo optimal das estatísticas).
+"""
+import heapq
+import itertools
+import sys
+import time
+from typing import Dict, List, Optional
+
+from utils.budget import BudgetExceeded, SearchBudget, first_check
+from utils.heuristics import get_heuristic
+from utils.search_stats import SearchResult, SearchStats, counted_stats, empty_result
+from utils.solution import Solution, moves_to_letters
+from utils.solution_cache import cached_solver
+from utils.state import State
+
+# Estimativa de memória por nó residente (objeto do nó, filhos e f esquecidos, entradas
+# nas filas e no índice de tabuleiros), medida com tracemalloc no 3x3 com remoções
+# (sem remoções, o custo medido é de cerca de 470 bytes)
+BYTES_PER_NODE = 1400
+
+_INF = float("inf")
+
+# Entradas obsoletas toleradas nas filas antes de uma compactação (além de uma por nó)
+_COMPACT_SLACK = 256
+
+
+class _Node:
+    """Nó da árvore de busca residente em memória."""
+
+    __slots__ = ("board", "blank", "g", "h", "f", "parent", "children", "forgotten", "expanded", "alive",
+                 "open_version", "leaf_version")
+
+    def __init__(self, board: int, blank: int, g: int, h: int, f: float, parent: Optional["_Node"]):
+        self.board = board
+        self.blank = blank
+        self.g = g
+        self.h = h
+        self.f = f  # Limite inferior do custo de uma solução por este nó (com os valores propagados)
+        self.parent = parent
+        self.children: List["_Node"] = []
+        self.forgotten: Optional[Dict[int, float]] = None  # Tabuleiro -> f dos filhos removidos
+        self.expanded = False
+        self.alive = True
+        self.open_version = 0  # Entradas antigas nas filas são descartadas pela versão
+        self.leaf_version = 0
+
+
+def node_limit(max_nodes: Optional[int] = None, max_memory: Optional[int] = None) -> int:
+    """Número máximo de nós residentes para um limite em nós e/ou em bytes.
+
+    Args:
+        max_nodes: Máximo de nós residentes (None para nenhum)
+        max_memory: Máximo de memória em bytes, convertido por BYTES_PER_NODE (None para nenhum)
+
+    Returns:
+        int: O menor dos dois limites (sys.maxsize se nenhum for informado)
+
+    Raises:
+        ValueError: Se o limite resultante for menor que 2 nós
+    """
+    limit = sys.maxsize
+    if max_nodes is not None:
+        limit = min(limit, max_nodes)
+    if max_memory is not None:
+        limit = min(limit, max_memory // BYTES_PER_NODE)
+    if limit < 2:
+        raise ValueError(f"O limite de memória do SMA* deve comportar pelo menos 2 nós (recebido {limit})")
+    return limit
+
+
+@cached_solver(optimal=False)
+def sma_star_search(initial_state: State, heuristic: str = "manhattan", max_nodes: Optional[int] = None,
+                    max_memory: Optional[int] = None, budget: Optional[SearchBudget] = None) -> SearchResult:
+    """Busca SMA*: A* com um teto explícito de nós residentes.
+
+    Cada expansão gera todos os sucessores do nó (ou apenas os esquecidos, ao
+    regerar). Um sucessor cujo tabuleiro já está em memória com custo g menor ou
+    igual é descartado, pois a cópia residente (ou o f esquecido dela) já o
+    representa. Antes de inserir os sucessores, as piores folhas são removidas
+    até haver espaço para eles, de modo que o número de nós residentes nunca
+    passa do limite.
+
+    As soluções não vão para o cache de soluções (só são ótimas se couberem no
+    limite), mas o estado inicial é consultado nele.
+
+    Args:
+        initial_state: Estado inicial do puzzle (a dimensão do tabuleiro é a do estado)
+        heuristic: Nome da heurística registrada em utils.heuristics
+        max_nodes: Máximo de nós residentes (padrão: sem limite)
+        max_memory: Máximo de memória em bytes, estimada por BYTES_PER_NODE (padrão: sem limite)
+        budget: Limites de execução (ver utils.budget); a memória estimada é a dos nós residentes
+
+    Returns:
+        SearchResult: Solução (movimentos a partir do estado inicial), tempo de execução em
+        segundos, número de estados expandidos e estatísticas (ver utils.search_stats;
+        a maior fronteira, peak_open, é o pico de nós residentes e as entradas
+        descartadas na compactação das filas contam como obsoletas; extra traz o
+        limite de nós (max_nodes), a memória estimada do pico (peak_bytes), os nós
+        removidos (pruned) e regerados (regenerated) e se a solução é garantidamente
+        ótima (optimal)), ou um BudgetExceeded (com caminho vazio e as mesmas
+        estatísticas até a interrupção) se um limite for excedido
+
+    Raises:
+        ValueError: Se a heurística informada não estiver registrada ou se o limite
+            de memória comportar menos de 2 nós
+    """
+    # Resolve a heurística e o limite uma única vez (falha antes de iniciar a busca)
+    heuristic_fn = get_heuristic(heuristic)
+    limit = node_limit(max_nodes, max_memory)
+
+    start_time = time.perf_counter()
+
+    # A árvore cresceria até o limite sem encontrar o objetivo em um estado não solucionável
+    if not initial_state.is_solvable():
+        return empty_result(time.perf_counter() - start_time)
+
+    geometry = initial_state.geometry
+    bits = geometry.bits
+    mask = geometry.tile_mask
+    neighbor_cells = geometry.neighbor_cells
+    goal_board = geometry.goal_board
+    heuristic_delta = getattr(heuristic_fn, 'delta', None)
+
+    def child_h(parent: int, child: int, parent_h: int, tile: int, from_cell: int, to_cell: int) -> int:
+        """Heurística do sucessor, incremental quando a heurística permite."""
+        if heuristic_delta is not None:
+            return parent_h + heuristic_delta(parent, child, geometry, tile, from_cell, to_cell)
+        return heuristic_fn(State.from_packed(child, from_cell, geometry))
+
+    # Fronteira: (chave, -g, ordem, versão, nó), a chave é o f do nó ou, para um nó
+    # expandido com filhos esquecidos, o menor f esquecido. Folhas: (-f, g, ordem, versão, nó)
+    open_heap: list = []
+    leaf_heap: list = []
+    order = itertools.count()
+
+    def push_open(node: _Node, key: float) -> None:
+        node.open_version += 1
+        heapq.heappush(open_heap, (key, -node.g, next(order), node.open_version, node))
+
+    def push_leaf(node: _Node) -> None:
+        node.leaf_version += 1
+        heapq.heappush(leaf_heap, (-node.f, node.g, next(order), node.leaf_version, node))
+
+    def compact() -> None:
+        """Descarta as entradas obsoletas das filas (cada nó tem no máximo uma válida em cada)."""
+        nonlocal stale_pops
+        entries = len(open_heap) + len(leaf_heap)
+        open_heap[:] = [entry for entry in open_heap if entry[3] == entry[4].open_version and entry[4].alive]
+        leaf_heap[:] = [entry for entry in leaf_heap if entry[3] == entry[4].leaf_version and entry[4].alive]
+        stale_pops += entries - len(open_heap) - len(leaf_heap)
+        heapq.heapify(open_heap)
+        heapq.heapify(leaf_heap)
+
+    def prune(room: int, protected: _Node) -> None:
+        """Remove as piores folhas (exceto protected) até sobrar espaço para room nós."""
+        nonlocal resident_nodes, pruned, stale_pops
+        while resident_nodes + room > limit and leaf_heap:
+            _, _, _, version, worst = heapq.heappop(leaf_heap)
+            if (version != worst.leaf_version or not worst.alive or worst.children
+                    or worst.parent is None or worst is protected):
+                stale_pops += 1
+                continue
+            parent = worst.parent
+            parent.children.remove(worst)
+            if parent.forgotten is None:
+                parent.forgotten = {}
+            parent.forgotten[worst.board] = worst.f
+            worst.alive = False
+            if resident.get(worst.board) is worst:
+                del resident[worst.board]
+            resident_nodes -= 1
+            pruned += 1
+            if parent is not protected:
+                push_open(parent, min(parent.forgotten.values()))
+                if not parent.children:
+                    push_leaf(parent)
+
+    def back_up(node: _Node) -> None:
+        """Eleva o f do nó e dos ancestrais ao menor f dos filhos (em memória ou esquecidos)."""
+        while node is not None and node.expanded:
+            values = [child.f for child in node.children]
+            if node.forgotten:
+                values.extend(node.forgotten.values())
+            f = min(values, default=_INF)
+            if f <= node.f:
+                break
+            node.f = f
+            if not node.children:
+                push_leaf(node)
+            node = node.parent
+
+    initial_h = initial_state.heuristic_value(heuristic_fn)
+    root = _Node(initial_state.board, initial_state.blank, 0, initial_h, initial_h, None)
+    push_open(root, root.f)
+    push_leaf(root)
+
+    # Índice dos tabuleiros residentes (a cópia de menor g de cada um)
+    resident: Dict[int, _Node] = {root.board: root}
+    resident_nodes = 1
+    peak_nodes = 1
+    pruned = 0
+    regenerated = 0
+    truncated = False  # Algum caminho foi cortado por não caber no limite
+    expanded_nodes = 0
+    goal = None
+
+    # Contadores detalhados (ver utils.search_stats), copiados para SearchStats apenas no fim
+    expanded = 0
+    generated = 0
+    reopened = 0
+    stale_pops = 0
+
+    def search_stats() -> SearchStats:
+        extra = dict(max_nodes=limit if limit < sys.maxsize else None, peak_bytes=peak_nodes * BYTES_PER_NODE,
+                     pruned=pruned, regenerated=regenerated, optimal=goal is not None and not truncated)
+        return counted_stats(expanded, generated, expanded_nodes, reopened, stale_pops, peak_nodes, **extra)
+
+    # Número de nós expandidos da próxima verificação do orçamento
+    next_check = first_check(budget)
+
+    while open_heap:
+        key, _, _, version, node = heapq.heappop(open_heap)
+        if version != node.open_version or not node.alive:
+            stale_pops += 1
+            continue
+        node.open_version += 1
+
+        # Todos os caminhos restantes são mais profundos que o limite
+        if key == _INF:
+            break
+
+        if node.board == goal_board:
+            goal = node
+            break
+
+        if expanded_nodes >= next_check:
+            reason = budget.exceeded(start_time, expanded_nodes, resident_nodes)
+            if reason is not None:
+                compact()
+                return BudgetExceeded(reason, time.perf_counter() - start_time, expanded_nodes,
+                                      len(open_heap), resident_nodes, key, search_stats())
+            next_check = budget.next_check(expanded_nodes)
+
+        # Uma cópia melhor do tabuleiro está em memória: este nó não leva a nada novo
+        if resident.get(node.board) is not node and not node.expanded:
+            node.expanded = True
+            back_up(node)
+            continue
+
+        # Na primeira expansão gera todos os sucessores; depois, apenas os esquecidos
+        expanded += 1
+        forgotten = node.forgotten if node.expanded else None
+        node.forgotten = None
+        successors = []
+        board = node.board
+        blank = node.blank
+        child_g = node.g + 1
+        blank_shift = bits * blank
+        for cell in neighbor_cells[blank]:
+            shift = bits * cell
+            tile = (board >> shift) & mask
+            child_board = board ^ (tile << shift) ^ (tile << blank_shift)
+            if node.expanded and (forgotten is None or child_board not in forgotten):
+                continue
+            generated += 1
+
+            other = resident.get(child_board)
+            if other is not None:
+                if other.g <= child_g:
+                    continue
+                reopened += 1
+
+            h = child_h(board, child_board, node.h, tile, cell, blank)
+            if forgotten is not None:
+                f = max(forgotten[child_board], child_g + h)
+                regenerated += 1
+            else:
+                f = max(node.f, child_g + h)
+            # O caminho até o sucessor (e o objetivo além dele) não caberia no limite
+            if child_g >= limit - 1 and child_board != goal_board:
+                f = _INF
+                truncated = True
+
+            successors.append((child_board, cell, h, f))
+
+        # Abre espaço antes de inserir os sucessores, para que o limite nunca seja excedido
+        # (os filhos do próprio nó removidos aqui voltam a ser esquecidos)
+        prune(len(successors), node)
+        for child_board, cell, h, f in successors:
+            child = _Node(child_board, cell, child_g, h, f, node)
+            node.children.append(child)
+            resident[child_board] = child
+            resident_nodes += 1
+            expanded_nodes += 1
+            push_open(child, f)
+            push_leaf(child)
+
+        node.expanded = True
+        node.leaf_version += 1  # Deixa de ser folha (ou volta à fila de folhas por back_up)
+        if node.forgotten:
+            push_open(node, min(node.forgotten.values()))
+        if not node.children:
+            push_leaf(node)
+        back_up(node)
+        if resident_nodes > peak_nodes:
+            peak_nodes = resident_nodes
+
+        # Sem compactação, as entradas obsoletas cresceriam sem limite com as remoções
+        if len(open_heap) + len(leaf_heap) > 3 * resident_nodes + _COMPACT_SLACK:
+            compact()
+
+    exec_time = time.perf_counter() - start_time
+    if goal is None:
+        # Se não encontrou solução (ou nenhuma cabe no limite)
+        return empty_result(exec_time, expanded_nodes, search_stats())
+
+    result_stats = search_stats()
+    # Movimentos de chegada de cada nó, do objetivo até a raiz
+    codes = []
+    while goal.parent is not None:
+        codes.append(geometry.move_direction[goal.parent.blank][goal.blank])
+        goal = goal.parent
+    codes.reverse()
+    path = Solution(State.from_packed(goal.board, goal.blank, geometry), moves_to_letters(codes))
+    return SearchResult(path, exec_time, expanded_nodes, result_stats)
@@ -1,51 +1,746 @@
 """
 Script para benchmarking dos algoritmos de busca do Puzzle de 8 peças.
-Registra o desempenho atual em um arquivo de log para comparação futura.
+Registra o desempenho atual em um arquivo de log (em benchmark/data/) para comparação futura.
+
+Uso:
+    python -m benchmark.benchmark
+    python -m benchmark.benchmark --profile --algorithms astar,ida --boards 867254301 [--lines]
+
+Com --profile, em vez do benchmark completo, as buscas escolhidas são executadas
+sob o cProfile e os perfis são salvos em benchmark/data/ (ver benchmark.profiling).
 """
+import argparse
 from datetime import datetime
+from functools import partial
+import gc
+import importlib.util
 import json
+import math
+import os
+import random
+import statistics
+import tempfile
 import time
+import tracemalloc
 
 import numpy as np
 
-from algorithms.astar_search import astar_search
-from algorithms.breadth_first_search import breadth_first_search
+from algorithms.astar_search import astar_search, astar_search_stream
+from algorithms.batch_search import ALGORITHMS, get_solver, preload_tables, solve_many
+from algorithms.breadth_first_search import breadth_first_layers, breadth_first_search, breadth_first_search_stream
 from algorithms.greedy_search import greedy_best_first_search
-from utils.state import State
+from algorithms.ida_star import ida_star_search
+from algorithms.oracle_search import oracle_search
+from algorithms.sma_star import sma_star_search
+from benchmark.corpus import CORPUS_VERSION, corpus_instances, load_corpus
+from benchmark.profiling import DATA_DIR, profile_search, profile_state_lines
+from utils.budget import BudgetExceeded, SearchBudget
+from utils.heuristics import get_heuristic
+from utils.solution_cache import SolutionCache
+from utils.ranking import NUM_STATES, rank_board, unrank_board
+from utils.search_stats import COUNTER_FIELDS, PHASE_FIELDS
+from utils.state import GOAL_BOARD, GOAL_BOARD_BLANK, State
+from utils.transition_table import TRANSITION_TABLE_FILE, build_transition_table, save_transition_table
+
+
+# Instância 4x4 (solução ótima com 38 movimentos) usada na comparação de heurísticas
+INITIAL_STATE_4X4 = "1A2654CFD90EB837"
+
+
+# Valores críticos da distribuição t de Student (bicaudal, 95%) por graus de liberdade
+_T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+    10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980
+}
 
 
-def run_benchmark(algorithm_name, algorithm_fn, initial_state, num_runs=1):
-    """Executa um algoritmo várias vezes e retorna estatísticas de desempenho.
+def _t_critical(degrees: int) -> float:
+    """Valor crítico t (95%) para os graus de liberdade informados (aproximação conservadora)."""
+    for limit in sorted(_T_CRITICAL_95):
+        if degrees <= limit:
+            return _T_CRITICAL_95[limit]
+    return 1.960
+
+
+def summarize_samples(samples):
+    """Resume uma amostra: mediana, percentil 95, média e intervalo de confiança de 95% da média.
+    
+    Args:
+        samples: Valores medidos (tempos, nós, ...)
+        
+    Returns:
+        dict: Estatísticas da amostra (o intervalo degenera na média se houver um único valor)
+    """
+    values = sorted(samples)
+    count = len(values)
+    mean = statistics.fmean(values)
+    margin = _t_critical(count - 1) * statistics.stdev(values) / math.sqrt(count) if count > 1 else 0.0
+    return {
+        "count": count,
+        "median": statistics.median(values),
+        "p95": values[min(count - 1, math.ceil(0.95 * count) - 1)],
+        "mean": mean,
+        "ci95_low": mean - margin,
+        "ci95_high": mean + margin,
+    }
+
+
+def measure_instance(algorithm_fn, initial_state, warmup=1, repeats=5, budget=None):
+    """Executa um algoritmo repetidamente sobre uma instância.
+    
+    As execuções de aquecimento são descartadas; as medidas são feitas com o
+    coletor de lixo desativado, para que pausas de coleta não entrem nos tempos.
+    Com um orçamento, a primeira execução que o exceder encerra a medição da
+    instância (as demais também o excederiam).
     
     Args:
-        algorithm_name: Nome do algoritmo
         algorithm_fn: Função do algoritmo
         initial_state: Estado inicial
-        num_runs: Número de execuções para calcular a média
+        warmup: Execuções descartadas antes das medidas
+        repeats: Execuções medidas
+        budget: Limites de cada execução (ver utils.budget), para conter execuções longas
+        
+    Returns:
+        tuple: (tempos, nós expandidos e nós gerados de cada execução, comprimento
+        do caminho, motivo da interrupção ou None, estatísticas da última execução
+        em dicionário)
+    """
+    if budget is not None:
+        algorithm_fn = partial(algorithm_fn, budget=budget)
+    
+    for _ in range(warmup):
+        result = algorithm_fn(initial_state)
+        if isinstance(result, BudgetExceeded):
+            return ([result.elapsed], [result.expanded_nodes], [result.stats.generated], 0, result.reason,
+                    result.stats.to_dict())
+    
+    times = []
+    nodes = []
+    generated = []
+    path_length = 0
+    exceeded = None
+    stats = {}
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            result = algorithm_fn(initial_state)
+            path, exec_time, expanded_nodes = result
+            times.append(exec_time)
+            nodes.append(expanded_nodes)
+            generated.append(result.stats.generated)
+            path_length = len(path) - 1 if path else 0
+            stats = result.stats.to_dict()
+            if isinstance(result, BudgetExceeded):
+                exceeded = result.reason
+                break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return times, nodes, generated, path_length, exceeded, stats
+
+
+def _aggregate_counters(per_instance):
+    """Soma os contadores das instâncias (os picos de fronteira e fechados são o máximo)."""
+    counters = {}
+    for name in COUNTER_FIELDS:
+        values = [entry["stats"].get(name, 0) for entry in per_instance]
+        counters[name] = max(values, default=0) if name.startswith("peak_") else sum(values)
+    return counters
+
+
+def run_benchmark(algorithm_name, algorithm_fn, instances, warmup=1, repeats=5, budget=None):
+    """Executa um algoritmo sobre as instâncias do corpus e retorna estatísticas de desempenho.
+    
+    Cada instância é medida com measure_instance; o tempo, os nós expandidos e
+    os nós gerados de uma instância são a mediana de suas repetições. As estatísticas gerais e por profundidade ótima
+    descrevem a distribuição dessas medianas entre as instâncias; o tempo total
+    do corpus em cada repetição dá o intervalo de confiança usado para comparar
+    versões (variação entre execuções, não entre instâncias). As estatísticas
+    detalhadas de cada busca (ver utils.search_stats) são guardadas por instância
+    e somadas em counters.
+    
+    Args:
+        algorithm_name: Nome do algoritmo
+        algorithm_fn: Função do algoritmo
+        instances: Pares (estado, profundidade ótima), como os de benchmark.corpus.corpus_instances
+        warmup: Execuções de aquecimento por instância
+        repeats: Execuções medidas por instância
+        budget: Limites de cada execução (ver utils.budget); as instâncias que os
+            excedem são contadas em exceeded e entram nas estatísticas com os
+            valores parciais
         
     Returns:
         dict: Estatísticas de desempenho
     """
-    total_time = 0
-    total_nodes = 0
-    path_lengths = []
+    per_instance = []
+    total_per_repeat = [0.0] * repeats
+    for state, depth in instances:
+        times, nodes, generated, path_length, exceeded, stats = measure_instance(algorithm_fn, state, warmup,
+                                                                                 repeats, budget)
+        for repeat, exec_time in enumerate(times):
+            total_per_repeat[repeat] += exec_time
+        per_instance.append({
+            "board": state.from_matrix_string(),
+            "depth": depth,
+            "time": statistics.median(times),
+            "time_samples": times,
+            "nodes": statistics.median(nodes),
+            "generated": statistics.median(generated),
+            "path_length": path_length,
+            "exceeded": exceeded,
+            "stats": stats,
+        })
     
-    for _ in range(num_runs):
-        path, exec_time, expanded_nodes = algorithm_fn(initial_state)
-        total_time += exec_time
-        total_nodes += expanded_nodes
-        path_lengths.append(len(path) - 1 if path else 0)
+    by_depth = {}
+    for depth in sorted({entry["depth"] for entry in per_instance}):
+        entries = [entry for entry in per_instance if entry["depth"] == depth]
+        by_depth[depth] = {
+            "time": summarize_samples([entry["time"] for entry in entries]),
+            "nodes": summarize_samples([entry["nodes"] for entry in entries]),
+            "generated": summarize_samples([entry["generated"] for entry in entries]),
+        }
     
+    times = [entry["time"] for entry in per_instance]
+    nodes = [entry["nodes"] for entry in per_instance]
+    path_lengths = [entry["path_length"] for entry in per_instance]
+    total_time = sum(times)
     return {
         "algorithm": algorithm_name,
-        "avg_time": total_time / num_runs,
-        "avg_nodes": total_nodes / num_runs,
+        "warmup": warmup,
+        "repeats": repeats,
+        "time": summarize_samples(times),
+        "nodes": summarize_samples(nodes),
+        "generated": summarize_samples([entry["generated"] for entry in per_instance]),
+        "total_time": summarize_samples(total_per_repeat),
+        "by_depth": by_depth,
+        "counters": _aggregate_counters(per_instance),
+        "instances": per_instance,
+        "avg_time": total_time / len(per_instance),
+        "avg_nodes": sum(nodes) / len(per_instance),
+        "nodes_per_sec": sum(nodes) / total_time if total_time > 0 else 0,
         "path_lengths": path_lengths,
-        "avg_path_length": sum(path_lengths) / len(path_lengths) if path_lengths else 0
+        "avg_path_length": sum(path_lengths) / len(path_lengths),
+        "optimal": sum(entry["path_length"] == entry["depth"] for entry in per_instance),
+        "exceeded": sum(entry["exceeded"] is not None for entry in per_instance)
     }
 
 
-def main():
+def measure_node_footprint(initial_state, sample_size=20000):
+    """Mede a memória média ocupada por nó gerado durante uma expansão em largura.
+    
+    Args:
+        initial_state: Estado inicial
+        sample_size: Número de estados distintos a manter em memória
+        
+    Returns:
+        float: Bytes por nó (objeto State, tabuleiro e entrada no conjunto de visitados)
+    """
+    tracemalloc.start()
+    states = [initial_state]
+    seen = {initial_state}
+    index = 0
+    while len(states) < sample_size and index < len(states):
+        for neighbor in states[index].get_neighbors():
+            if neighbor not in seen:
+                seen.add(neighbor)
+                states.append(neighbor)
+        index += 1
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(states)
+
+
+def measure_peak_memory(algorithm_fn, initial_state):
+    """Mede o pico de memória alocada por uma execução do algoritmo.
+    
+    Executado separadamente de run_benchmark, pois o rastreamento de alocações
+    distorce os tempos.
+    
+    Returns:
+        int: Pico de memória em bytes
+    """
+    tracemalloc.start()
+    algorithm_fn(initial_state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark_transition_table(sample_size=50000):
+    """Mede construção, tamanho e ganho de expansão da tabela de transições.
+    
+    A tabela medida é salva em um diretório temporário: a tabela compartilhada em
+    tables/ pode estar mapeada em memória por outros processos (benchmark
+    paralelo, interface) e não é sobrescrita.
+    
+    Args:
+        sample_size: Número de estados usados na comparação de expansão
+        
+    Returns:
+        dict: Tempo de construção, tamanho do arquivo e tempos por expansão
+    """
+    start = time.perf_counter()
+    table = build_transition_table()
+    build_time = time.perf_counter() - start
+    
+    ranks = random.Random(0).sample(range(NUM_STATES), sample_size)
+    states = [State.from_packed(*unrank_board(rank)) for rank in ranks]
+    
+    # Expansão via State.get_neighbors
+    start = time.perf_counter()
+    for state in states:
+        state.get_neighbors()
+    neighbors_time = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = save_transition_table(table, os.path.join(directory, TRANSITION_TABLE_FILE))
+        file_size = os.path.getsize(path)
+        mapped = np.load(path, mmap_mode="r")
+        table = mapped.view(np.ndarray)
+        
+        # Expansão via leitura de uma linha da tabela mapeada em memória
+        start = time.perf_counter()
+        for rank in ranks:
+            table[rank].tolist()
+        table_time = time.perf_counter() - start
+        
+        # Libera o mapeamento antes de remover o diretório
+        del table, mapped
+    
+    return {
+        "build_time": build_time,
+        "file_size": file_size,
+        "get_neighbors_us": neighbors_time / sample_size * 1e6,
+        "table_row_us": table_time / sample_size * 1e6,
+        "speedup": neighbors_time / table_time if table_time > 0 else 0
+    }
+
+
+def benchmark_incremental_heuristics(initial_state, heuristics=("manhattan", "manhattanPenality"),
+                                     walk_length=20000, seed=0):
+    """Compara o custo por expansão da avaliação completa e da atualização incremental.
+    
+    Percorre um passeio aleatório a partir do estado inicial; em cada passo os
+    vizinhos são gerados com e sem o valor herdado do pai, e os dois valores são
+    conferidos (o incremental deve ser idêntico ao completo).
+    
+    Args:
+        initial_state: Estado inicial do passeio
+        heuristics: Nomes das heurísticas registradas com atualização incremental
+        walk_length: Número de expansões medidas
+        seed: Semente do passeio aleatório
+        
+    Returns:
+        dict: Tempos por expansão (em microssegundos) de cada heurística
+        
+    Raises:
+        AssertionError: Se algum valor incremental divergir da avaliação completa
+    """
+    comparison = {}
+    for name in heuristics:
+        heuristic_fn = get_heuristic(name)
+        rng = random.Random(seed)
+        walk = [initial_state]
+        for _ in range(walk_length - 1):
+            walk.append(rng.choice(walk[-1].get_neighbors()))
+        
+        # Avaliação completa de cada vizinho
+        start = time.perf_counter()
+        full = [[neighbor.heuristic_value(heuristic_fn) for neighbor in state.get_neighbors()]
+                for state in walk]
+        full_time = time.perf_counter() - start
+        
+        # Valor derivado do pai (o pai já tem a heurística calculada)
+        for state in walk:
+            state.heuristic_value(heuristic_fn)
+        start = time.perf_counter()
+        incremental = [[neighbor.heuristic_value(heuristic_fn) for neighbor in state.get_neighbors(heuristic_fn)]
+                       for state in walk]
+        incremental_time = time.perf_counter() - start
+        
+        assert incremental == full, f"Atualização incremental divergente para {name}"
+        comparison[name] = {
+            "full_us": full_time / walk_length * 1e6,
+            "incremental_us": incremental_time / walk_length * 1e6,
+            "speedup": full_time / incremental_time if incremental_time > 0 else 0
+        }
+    return comparison
+
+
+def benchmark_full_space_layers(repeats=5):
+    """Mede a busca em largura vetorizada sobre todo o espaço de estados a partir do objetivo.
+    
+    Args:
+        repeats: Número de execuções medidas (a primeira carga da tabela é descartada)
+        
+    Returns:
+        dict: Estatísticas de tempo e número de estados por profundidade
+    """
+    goal_rank = rank_board(GOAL_BOARD, GOAL_BOARD_BLANK)
+    layer_sizes = []
+    breadth_first_layers(goal_rank, layer_sizes=layer_sizes)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        breadth_first_layers(goal_rank)
+        times.append(time.perf_counter() - start)
+    return {
+        "time": summarize_samples(times),
+        "states": sum(layer_sizes),
+        "layer_sizes": layer_sizes
+    }
+
+
+def compare_heuristics(initial_state, heuristics=("manhattanPenality", "pdb")):
+    """Compara nós expandidos e tempo do A* com diferentes heurísticas.
+    
+    Args:
+        initial_state: Estado inicial
+        heuristics: Nomes das heurísticas registradas a comparar
+        
+    Returns:
+        list: Estatísticas de cada heurística
+    """
+    comparison = []
+    for heuristic in heuristics:
+        path, exec_time, expanded_nodes = astar_search(initial_state, heuristic)
+        comparison.append({
+            "heuristic": heuristic,
+            "time": exec_time,
+            "nodes": expanded_nodes,
+            "path_length": len(path) - 1 if path else 0
+        })
+    return comparison
+
+
+def compare_priority_queues(initial_state, queues=("heap", "bucket")):
+    """Compara nós expandidos e tempo do A* e da busca gulosa com cada fila de prioridade.
+    
+    Args:
+        initial_state: Estado inicial
+        queues: Nomes das implementações registradas em utils.priority_queue
+        
+    Returns:
+        list: Estatísticas de cada combinação de algoritmo e fila
+    """
+    comparison = []
+    for name, fn in (("A*", astar_search), ("Busca Gulosa", greedy_best_first_search)):
+        for queue in queues:
+            path, exec_time, expanded_nodes = fn(initial_state, queue=queue)
+            comparison.append({
+                "algorithm": name,
+                "queue": queue,
+                "time": exec_time,
+                "nodes": expanded_nodes,
+                "path_length": len(path) - 1 if path else 0
+            })
+    return comparison
+
+
+def compare_expansion_modes(instances, heuristics=("manhattan", "pdb")):
+    """Compara a vazão (nós por segundo) do A* nó a nó e do A* em lotes vetorizados.
+    
+    O A* nó a nó usa a fila por baldes, que tem o mesmo desempate (menor f, maior g)
+    dos lotes, de modo que os dois modos expandem praticamente os mesmos nós.
+    
+    Args:
+        instances: Pares (estado, profundidade ótima)
+        heuristics: Nomes das heurísticas registradas
+        
+    Returns:
+        list: Totais de tempo, nós e nós por segundo de cada modo e heurística
+    """
+    modes = (("nó a nó", {"queue": "bucket"}), ("em lotes", {"batched": True}))
+    comparison = []
+    for heuristic in heuristics:
+        for mode, options in modes:
+            total_time = 0.0
+            total_nodes = 0
+            for state, _ in instances:
+                _, exec_time, expanded_nodes = astar_search(state, heuristic, **options)
+                total_time += exec_time
+                total_nodes += expanded_nodes
+            comparison.append({
+                "heuristic": heuristic,
+                "mode": mode,
+                "time": total_time,
+                "nodes": total_nodes,
+                "nodes_per_sec": total_nodes / total_time if total_time > 0 else 0
+            })
+    return comparison
+
+
+def benchmark_batch(num_boards=400, algorithm="astar", heuristic="pdb", seed=0):
+    """Mede a vazão de solve_many com números crescentes de processos.
+    
+    Args:
+        num_boards: Número de tabuleiros solucionáveis aleatórios (3x3)
+        algorithm: Nome do algoritmo em algorithms.batch_search.ALGORITHMS
+        heuristic: Nome da heurística registrada
+        seed: Semente do sorteio dos tabuleiros
+        
+    Returns:
+        list: Estatísticas de cada número de processos (1, 2, 4, ... até o número de núcleos),
+        com o total de nós gerados somado das estatísticas de cada busca
+    """
+    rng = random.Random(seed)
+    boards = [State.from_packed(*unrank_board(rng.randrange(NUM_STATES))) for _ in range(num_boards)]
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    worker_counts = sorted({1, cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+    
+    scaling = []
+    for workers in worker_counts:
+        stats = {}
+        generated = 0
+        for _, result in solve_many(boards, algorithm, heuristic, workers=workers, stats=stats):
+            generated += result.stats.generated
+        stats["total_generated"] = generated
+        stats["speedup"] = stats["boards_per_sec"] / scaling[0]["boards_per_sec"] if scaling else 1.0
+        scaling.append(stats)
+    return scaling
+
+
+def benchmark_streaming(initial_state, repeats=5):
+    """Compara as buscas bloqueantes com as versões em fluxo (com eventos de progresso).
+    
+    Args:
+        initial_state: Estado inicial do puzzle
+        repeats: Número de execuções medidas de cada forma
+        
+    Returns:
+        list: Mediana de tempo de cada forma, eventos produzidos e sobrecarga relativa
+    """
+    comparison = []
+    for name, blocking_fn, stream_fn in (("Busca em Largura", breadth_first_search, breadth_first_search_stream),
+                                         ("A*", astar_search, astar_search_stream)):
+        blocking_times = [blocking_fn(initial_state)[1] for _ in range(repeats)]
+        stream_times = []
+        for _ in range(repeats):
+            events = list(stream_fn(initial_state))
+            stream_times.append(events[-1].elapsed)
+        blocking = statistics.median(blocking_times)
+        stream = statistics.median(stream_times)
+        comparison.append({
+            "algorithm": name,
+            "blocking_time": blocking,
+            "stream_time": stream,
+            "events": len(events),
+            "overhead": stream / blocking - 1 if blocking > 0 else 0.0
+        })
+    return comparison
+
+
+def benchmark_solution_cache(instances, heuristic="manhattan"):
+    """Mede o A* com o cache de soluções (em memória) sobre as instâncias do corpus.
+    
+    São feitas três passagens: com o cache vazio (que guarda as soluções), sobre
+    as mesmas instâncias (acertos diretos) e sobre vizinhos de cada instância
+    (a busca termina ao alcançar um estado já em cache).
+    
+    Args:
+        instances: Pares (estado, profundidade ótima)
+        heuristic: Nome da heurística registrada
+        
+    Returns:
+        list: Tempo, nós, soluções ótimas e estatísticas do cache de cada passagem
+    """
+    cache = SolutionCache(":memory:")
+    neighbors = [(state.get_neighbors()[0], None) for state, _ in instances if state.get_neighbors()]
+    passes = []
+    for label, pass_instances in (("cold", instances), ("warm", instances), ("neighbors", neighbors)):
+        cache.reset_stats()
+        total_time = 0.0
+        total_nodes = 0
+        optimal = 0
+        for state, depth in pass_instances:
+            path, exec_time, expanded_nodes = astar_search(state, heuristic, cache=cache)
+            total_time += exec_time
+            total_nodes += expanded_nodes
+            optimal += depth is None or len(path) - 1 == depth
+        passes.append({"pass": label, "instances": len(pass_instances), "time": total_time,
+                       "nodes": total_nodes, "optimal": optimal, **cache.stats()})
+    cache.close()
+    return passes
+
+
+def benchmark_weighted_astar(instances, initial_state, weights=(1.0, 1.25, 1.5, 2.0, 3.0, 5.0),
+                             heuristic="manhattan"):
+    """Mede o A* ponderado (limite de subotimalidade w) e a sequência de soluções do ARA*.
+    
+    Args:
+        instances: Pares (estado, profundidade ótima)
+        initial_state: Estado em que a sequência de soluções do modo anytime é registrada
+        weights: Pesos da heurística a comparar
+        heuristic: Nome da heurística registrada
+        
+    Returns:
+        dict: Para cada peso, totais de tempo e nós e a razão média e máxima entre o
+        custo e o ótimo (que não pode passar de w); para o modo anytime, as mesmas
+        estatísticas e as soluções (custo, limite provado, tempo, nós) em initial_state
+    """
+    modes = [(f"w={weight:g}", {"weight": weight}) for weight in weights]
+    modes.append(("anytime", {"anytime": True}))
+    comparison = []
+    for label, options in modes:
+        total_time = 0.0
+        total_nodes = 0
+        ratios = []
+        for state, depth in instances:
+            path, exec_time, expanded_nodes = astar_search(state, heuristic, **options)
+            total_time += exec_time
+            total_nodes += expanded_nodes
+            if depth:
+                ratios.append((len(path) - 1) / depth)
+        comparison.append({
+            "mode": label,
+            "time": total_time,
+            "nodes": total_nodes,
+            "mean_ratio": statistics.mean(ratios) if ratios else 1.0,
+            "max_ratio": max(ratios, default=1.0)
+        })
+    
+    solutions = []
+    astar_search(initial_state, heuristic, anytime=True, solutions=solutions)
+    return {"weights": comparison,
+            "anytime_solutions": [{"cost": cost, "bound": bound, "time": exec_time, "nodes": nodes}
+                                  for cost, bound, exec_time, nodes in solutions]}
+
+
+def benchmark_memory_bounded(instances, limits=(None, 20000, 5000, 1000, 200), heuristic="manhattan"):
+    """Mede o SMA* com tetos decrescentes de nós residentes.
+    
+    Args:
+        instances: Pares (estado, profundidade ótima)
+        limits: Máximos de nós residentes (None para nenhum)
+        heuristic: Nome da heurística registrada
+        
+    Returns:
+        list: Para cada teto, totais de tempo, nós expandidos, removidos e regerados,
+        o maior pico de nós residentes e o número de soluções ótimas
+    """
+    comparison = []
+    for limit in limits:
+        totals = {"time": 0.0, "nodes": 0, "pruned": 0, "regenerated": 0}
+        peak_nodes = 0
+        optimal = 0
+        for state, depth in instances:
+            result = sma_star_search(state, heuristic, max_nodes=limit)
+            path, exec_time, expanded_nodes = result
+            totals["time"] += exec_time
+            totals["nodes"] += expanded_nodes
+            totals["pruned"] += result.stats.extra["pruned"]
+            totals["regenerated"] += result.stats.extra["regenerated"]
+            peak_nodes = max(peak_nodes, result.stats.peak_open)
+            optimal += len(path) - 1 == depth
+        comparison.append({"max_nodes": limit, **totals, "peak_nodes": peak_nodes, "optimal": optimal,
+                           "instances": len(instances)})
+    return comparison
+
+
+def benchmark_phase_timing(instances, heuristic="manhattan"):
+    """Divide o tempo das buscas informadas entre heurística, sucessores e fila.
+
+    Cada busca é executada uma vez por instância com phase_timing=True; as
+    medições por operação deixam a busca mais lenta, então o tempo total aqui
+    não é comparável ao de run_benchmark, apenas as proporções entre as fases.
+
+    Args:
+        instances: Pares (estado, profundidade ótima) do corpus
+        heuristic: Heurística usada pelas buscas
+
+    Returns:
+        list: Por busca, o tempo total, o tempo de cada fase e a fração de cada fase no total
+    """
+    searches = [
+        ("A*", partial(astar_search, queue="heap")),
+        ("A* (baldes)", partial(astar_search, queue="bucket")),
+        ("Busca Gulosa", greedy_best_first_search),
+    ]
+    results = []
+    for name, fn in searches:
+        totals = dict.fromkeys(PHASE_FIELDS, 0.0)
+        total_time = 0.0
+        for state, _ in instances:
+            result = fn(state, heuristic, phase_timing=True)
+            total_time += result.exec_time
+            for phase in PHASE_FIELDS:
+                totals[phase] += getattr(result.stats, phase)
+        entry = {"algorithm": name, "time": total_time, **totals}
+        entry.update((f"{phase}_share", totals[phase] / total_time if total_time > 0 else 0.0)
+                     for phase in PHASE_FIELDS)
+        results.append(entry)
+    return results
+
+
+def run_profiles(algorithms, heuristic, boards, lines=False):
+    """Gera os perfis das buscas escolhidas sobre as instâncias (modo --profile).
+
+    Args:
+        algorithms: Nomes dos algoritmos em algorithms.batch_search.ALGORITHMS
+        heuristic: Heurística dos algoritmos informados
+        boards: Tabuleiros a resolver (strings como '867254301'), todos da mesma dimensão
+        lines: Se True, mede também o tempo linha a linha dos métodos de State (line_profiler)
+
+    Returns:
+        list: Por algoritmo, os arquivos gerados e os totais do perfil
+    """
+    states = [State.from_string(board) for board in boards]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results = []
+    for algorithm in algorithms:
+        solver = get_solver(algorithm, heuristic)
+        uses_heuristic = ALGORITHMS[algorithm][1]
+        # As tabelas são carregadas antes, para que a carga não entre no perfil
+        preload_tables(algorithm, heuristic, states[0].size)
+        name = f"{algorithm}_{heuristic}" if uses_heuristic else algorithm
+        prefix = f"profile_{timestamp}_{name}"
+        entry = profile_search(solver, states, prefix, title=f"{name} ({len(states)} instâncias)")
+        entry["algorithm"] = algorithm
+        entry["heuristic"] = heuristic if uses_heuristic else None
+        if lines:
+            entry["files"]["lines"] = profile_state_lines(solver, states, os.path.join(DATA_DIR, prefix + ".lines.txt"))
+        results.append(entry)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de busca do puzzle.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Gera perfis (cProfile) das buscas escolhidas em vez do benchmark completo")
+    parser.add_argument("--algorithms", default="astar,ida",
+                        help=f"Algoritmos do perfil, separados por vírgula (disponíveis: {', '.join(ALGORITHMS)})")
+    parser.add_argument("--heuristic", default="manhattan", help="Heurística dos algoritmos informados")
+    parser.add_argument("--boards", default="867254301",
+                        help="Tabuleiros do perfil separados por vírgula, ou 'corpus' para uma instância "
+                             "3x3 do corpus por profundidade")
+    parser.add_argument("--lines", action="store_true",
+                        help="Mede também o tempo linha a linha dos métodos de State (requer line_profiler)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile:
+        algorithms = [name.strip() for name in args.algorithms.split(",") if name.strip()]
+        unknown = [name for name in algorithms if name not in ALGORITHMS]
+        if unknown:
+            raise SystemExit(f"Algoritmos desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(ALGORITHMS)})")
+        if args.boards == "corpus":
+            boards = [state.from_matrix_string() for state, _ in corpus_instances(load_corpus(), per_depth=1)]
+        else:
+            boards = [board.strip() for board in args.boards.split(",") if board.strip()]
+        if args.lines and importlib.util.find_spec("line_profiler") is None:
+            raise SystemExit("O perfil por linha (--lines) requer o line_profiler (pip install line_profiler)")
+        profiles = run_profiles(algorithms, args.heuristic, boards, args.lines)
+        for entry in profiles:
+            print(f"{entry['algorithm']}: {entry['total_time']:.3f}s, {entry['calls']} chamadas, "
+                  f"{entry['stacks']} pilhas")
+            for kind, path in entry["files"].items():
+                print(f"  {kind}: {path}")
+        return
+
     # Estado inicial do puzzle
     matriz = np.array([
         [8, 6, 7],
@@ -55,34 +750,186 @@ def main():
     
     initial_state = State(matriz)
     
+    # Instâncias do corpus versionado: uma por profundidade ótima (3x3) e o conjunto 4x4
+    corpus = load_corpus()
+    instances = corpus_instances(corpus, per_depth=1)
+    instances_4x4 = corpus_instances(corpus, size=4)
+    warmup, repeats = 1, 3
+    
+    # Limite por execução, para que uma busca descontrolada não trave o benchmark
+    max_time = 60.0
+    run_budget = SearchBudget(max_time=max_time)
+    
     # Configuração do benchmark
     algorithms = [
         ("Busca em Largura", breadth_first_search),
+        ("Busca em Largura (ranqueada)", partial(breadth_first_search, ranked=True)),
+        ("Busca em Largura (bidirecional)", partial(breadth_first_search, bidirectional=True)),
+        ("Busca em Largura (vetorizada)", partial(breadth_first_search, vectorized=True)),
         ("Busca Gulosa", greedy_best_first_search),
-        ("A*", astar_search)
+        ("A*", astar_search),
+        ("A* bidirecional (MM)", partial(astar_search, bidirectional=True)),
+        ("A* ponderado (w=2)", partial(astar_search, weight=2.0)),
+        ("ARA* (anytime)", partial(astar_search, anytime=True)),
+        ("IDA*", ida_star_search),
+        ("SMA* (5000 nós)", partial(sma_star_search, max_nodes=5000)),
+        ("Oráculo", oracle_search)
     ]
     
-    # Executa o benchmark
+    # Mede o custo de memória por nó da representação de estado
+    bytes_per_node = measure_node_footprint(initial_state)
+    print(f"Memória por nó: {bytes_per_node:.1f} bytes")
+    
+    # Mede a tabela de transições pré-calculada
+    transition_table = benchmark_transition_table()
+    print(f"Tabela de transições: construída em {transition_table['build_time']:.2f}s, "
+          f"{transition_table['file_size'] / 1024:.0f} KiB, "
+          f"expansão {transition_table['speedup']:.1f}x mais rápida "
+          f"({transition_table['table_row_us']:.2f}us vs {transition_table['get_neighbors_us']:.2f}us)")
+    
+    # Custo da heurística por expansão: avaliação completa x atualização incremental
+    incremental_heuristics = {}
+    for label, state in (("3x3", initial_state), ("4x4", State.from_string(INITIAL_STATE_4X4))):
+        incremental_heuristics[label] = benchmark_incremental_heuristics(state)
+        for name, entry in incremental_heuristics[label].items():
+            print(f"Heurística {name} {label}: {entry['full_us']:.2f}us completa, "
+                  f"{entry['incremental_us']:.2f}us incremental ({entry['speedup']:.1f}x)")
+    
+    # Busca em largura vetorizada sobre todo o espaço de estados (tamanho de cada camada)
+    full_space = benchmark_full_space_layers()
+    print(f"Busca em largura completa (vetorizada): {full_space['states']} estados, "
+          f"{len(full_space['layer_sizes']) - 1} camadas, mediana {full_space['time']['median']:.4f}s")
+    
+    # Executa o benchmark sobre o corpus (3x3) e, para as buscas informadas, sobre o conjunto 4x4
+    algorithms_4x4 = [
+        ("A* (pdb, baldes)", partial(astar_search, heuristic="pdb", queue="bucket")),
+        ("A* bidirecional (MM, pdb)", partial(astar_search, heuristic="pdb", bidirectional=True)),
+        ("SMA* (pdb, 50000 nós)", partial(sma_star_search, heuristic="pdb", max_nodes=50000))
+    ]
     results = []
-    for name, fn in algorithms:
-        print(f"Executando benchmark para {name}...")
-        result = run_benchmark(name, fn, initial_state)
-        results.append(result)
-        print(f"  Tempo médio: {result['avg_time']:.4f}s")
-        print(f"  Nós expandidos: {result['avg_nodes']:.0f}")
-        print(f"  Comprimento do caminho: {result['avg_path_length']:.0f}")
+    for label, suite, corpus_set in (("3x3", algorithms, instances), ("4x4", algorithms_4x4, instances_4x4)):
+        for name, fn in suite:
+            print(f"Executando benchmark para {name} ({label}, {len(corpus_set)} instâncias)...")
+            result = run_benchmark(name, fn, corpus_set, warmup, repeats, run_budget)
+            result["size"] = label
+            result["peak_memory_bytes"] = measure_peak_memory(fn, initial_state if label == "3x3" else corpus_set[-1][0])
+            results.append(result)
+            print(f"  Tempo por instância: mediana {result['time']['median']:.4f}s, p95 {result['time']['p95']:.4f}s")
+            print(f"  Tempo total do corpus: {result['total_time']['mean']:.4f}s, "
+                  f"IC95 [{result['total_time']['ci95_low']:.4f}, {result['total_time']['ci95_high']:.4f}]s")
+            print(f"  Nós expandidos: mediana {result['nodes']['median']:.0f}, p95 {result['nodes']['p95']:.0f}")
+            print(f"  Nós gerados: mediana {result['generated']['median']:.0f}, "
+                  f"p95 {result['generated']['p95']:.0f}")
+            counters = result["counters"]
+            print(f"  Contadores: {counters['expanded']} expandidos, {counters['generated']} gerados, "
+                  f"{counters['duplicates']} duplicatas, {counters['reopened']} reabertos, "
+                  f"{counters['stale_pops']} entradas obsoletas, fronteira máx. {counters['peak_open']}")
+            print(f"  Nós por segundo: {result['nodes_per_sec']:.0f}")
+            print(f"  Pico de memória: {result['peak_memory_bytes'] / 1024:.0f} KiB")
+            print(f"  Soluções ótimas: {result['optimal']}/{len(corpus_set)}")
+            if result["exceeded"]:
+                print(f"  Instâncias interrompidas pelo limite de {max_time:.0f}s: {result['exceeded']}")
+    
+    # Compara os bancos de padrões aditivos com Manhattan + conflitos lineares (3x3 e 4x4)
+    heuristics = {}
+    for label, state in (("3x3", initial_state), ("4x4", State.from_string(INITIAL_STATE_4X4))):
+        heuristics[label] = compare_heuristics(state)
+        for entry in heuristics[label]:
+            print(f"A* {label} ({entry['heuristic']}): {entry['nodes']} nós, {entry['time']:.4f}s, "
+                  f"{entry['path_length']} movimentos")
+    
+    # Fila binária (heap) x fila por baldes com desempate pelo maior g
+    priority_queues = {}
+    for label, state in (("3x3", initial_state), ("4x4", State.from_string(INITIAL_STATE_4X4))):
+        priority_queues[label] = compare_priority_queues(state)
+        for entry in priority_queues[label]:
+            print(f"{entry['algorithm']} {label} (fila {entry['queue']}): {entry['nodes']} nós, "
+                  f"{entry['time']:.4f}s, {entry['path_length']} movimentos")
+    
+    # A* nó a nó x A* em lotes vetorizados (NumPy), sobre o conjunto 4x4 do corpus
+    expansion_modes = compare_expansion_modes(instances_4x4)
+    for entry in expansion_modes:
+        print(f"A* 4x4 {entry['mode']} ({entry['heuristic']}): {entry['nodes']} nós em {entry['time']:.2f}s, "
+              f"{entry['nodes_per_sec']:.0f} nós/s")
+    
+    # Resolução em lote: vazão por número de processos
+    batch = benchmark_batch()
+    for entry in batch:
+        print(f"Lote com {entry['workers']} processo(s): {entry['boards_per_sec']:.1f} tabuleiros/s "
+              f"({entry['speedup']:.2f}x)")
+    
+    # Busca bloqueante x busca em fluxo com eventos de progresso
+    streaming = benchmark_streaming(initial_state)
+    for entry in streaming:
+        print(f"{entry['algorithm']} em fluxo: {entry['events']} eventos, {entry['stream_time']:.4f}s "
+              f"vs {entry['blocking_time']:.4f}s bloqueante ({entry['overhead']:+.1%})")
+    
+    # Cache de soluções: passagem fria, repetida e sobre vizinhos das instâncias
+    solution_cache = benchmark_solution_cache(instances)
+    for entry in solution_cache:
+        print(f"A* com cache ({entry['pass']}): {entry['time']:.4f}s, {entry['nodes']} nós, "
+              f"{entry['hits']}/{entry['hits'] + entry['misses']} acertos, "
+              f"{entry['probe_hits']} estados em cache alcançados")
+    
+    # A* ponderado: nós expandidos x custo por peso, e soluções sucessivas do ARA*
+    weighted_astar = benchmark_weighted_astar(instances, initial_state)
+    for entry in weighted_astar["weights"]:
+        print(f"A* {entry['mode']}: {entry['nodes']} nós, {entry['time']:.4f}s, "
+              f"custo/ótimo médio {entry['mean_ratio']:.3f} (máximo {entry['max_ratio']:.3f})")
+    print("ARA*: " + ", ".join(f"{entry['cost']} mov. (<= {entry['bound']:.2f}x ótimo, {entry['nodes']} nós)"
+                               for entry in weighted_astar["anytime_solutions"]))
+    
+    # SMA*: nós expandidos e soluções ótimas com tetos decrescentes de nós residentes
+    memory_bounded = benchmark_memory_bounded(instances)
+    for entry in memory_bounded:
+        print(f"SMA* (teto {entry['max_nodes'] or 'ilimitado'}): {entry['nodes']} nós, {entry['time']:.4f}s, "
+              f"pico {entry['peak_nodes']} nós residentes, {entry['pruned']} removidos, "
+              f"{entry['optimal']}/{entry['instances']} ótimas")
+    
+    # Tempo de cada fase (heurística, sucessores, fila) nas buscas de melhor primeiro
+    phase_timing = benchmark_phase_timing(instances)
+    for entry in phase_timing:
+        print(f"{entry['algorithm']} por fase: heurística {entry['heuristic_time_share']:.1%}, "
+              f"sucessores {entry['successor_time_share']:.1%}, fila {entry['queue_time_share']:.1%} "
+              f"de {entry['time']:.4f}s")
+    
+    # Iterações do IDA* (limiar e nós expandidos por limiar) em 3x3 e 4x4
+    ida_iterations = {}
+    for label, state in (("3x3", initial_state), ("4x4", State.from_string(INITIAL_STATE_4X4))):
+        ida_iterations[label] = []
+        ida_star_search(state, iterations=ida_iterations[label])
+        print(f"IDA* {label}: " + ", ".join(f"f<={bound}: {nodes}" for bound, nodes in ida_iterations[label]))
     
     # Salva os resultados em um arquivo de log
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = f"benchmark_log_{timestamp}.json"
+    log_file = os.path.join(DATA_DIR, f"benchmark_log_{timestamp}.json")
     
     with open(log_file, "w") as f:
         json.dump({
             "timestamp": timestamp,
             "results": results,
+            "heuristics": heuristics,
+            "priority_queues": priority_queues,
+            "expansion_modes": expansion_modes,
+            "full_space_layers": full_space,
+            "batch": batch,
+            "streaming": streaming,
+            "solution_cache": solution_cache,
+            "weighted_astar": weighted_astar,
+            "memory_bounded": memory_bounded,
+            "phase_timing": phase_timing,
+            "ida_iterations": ida_iterations,
             "metadata": {
                 "initial_state": initial_state.from_matrix_string(),
-                "version": "original"
+                "initial_state_4x4": INITIAL_STATE_4X4,
+                "corpus_version": CORPUS_VERSION,
+                "warmup": warmup,
+                "repeats": repeats,
+                "max_time": max_time,
+                "bytes_per_node": bytes_per_node,
+                "transition_table": transition_table,
+                "incremental_heuristics": incremental_heuristics,
+                "version": "packed-state"
             }
         }, f, indent=2)
     
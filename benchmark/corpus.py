@@ -0,0 +1,136 @@
+"""
+Corpus versionado de instâncias para o benchmark.
+
+O corpus agrupa tabuleiros 3x3 solucionáveis pela profundidade ótima (0 a 31,
+sorteados por utils.instance_generator) e inclui um conjunto de instâncias 4x4 com a
+profundidade ótima calculada pelo A* com bancos de padrões. O arquivo gerado
+(benchmark/data/corpus_v<versão>.json) é mantido no repositório, de modo que
+execuções de versões diferentes do código usem exatamente as mesmas instâncias.
+
+Uso para regenerar o corpus (apenas ao mudar a versão):
+    python -m benchmark.corpus
+"""
+import json
+import os
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from algorithms.astar_search import astar_search
+from utils.instance_generator import depth_counts, ranks_at_depth
+from utils.ranking import unrank_board
+from utils.state import State, board_to_string, get_geometry
+
+# Versão do corpus (incrementar ao alterar o conteúdo ou os parâmetros de geração)
+# v2: tabuleiros 3x3 sorteados pelo gerador de instâncias (utils.instance_generator)
+CORPUS_VERSION = 2
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", f"corpus_v{CORPUS_VERSION}.json")
+
+
+def _random_walk_4x4(length: int, rng: random.Random) -> State:
+    """Tabuleiro 4x4 obtido por um passeio aleatório a partir do objetivo, sem desfazer movimentos."""
+    geometry = get_geometry(4)
+    state = State.from_packed(geometry.goal_board, geometry.goal_blank, geometry)
+    previous_blank = -1
+    for _ in range(length):
+        neighbors = [neighbor for neighbor in state.get_neighbors() if neighbor.blank != previous_blank]
+        previous_blank = state.blank
+        state = rng.choice(neighbors)
+    return state
+
+
+def generate_corpus(per_depth: int = 5, instances_4x4: int = 10, max_depth_4x4: int = 40,
+                    seed: int = 0) -> Dict:
+    """Gera o corpus de instâncias.
+
+    Args:
+        per_depth: Tabuleiros 3x3 por profundidade ótima (limitado aos estados existentes)
+        instances_4x4: Número de instâncias 4x4
+        max_depth_4x4: Profundidade ótima máxima das instâncias 4x4
+        seed: Semente do sorteio
+
+    Returns:
+        Dict: Corpus com a versão, os parâmetros e as instâncias
+    """
+    rng = random.Random(seed)
+
+    # 3x3: sorteio uniforme, sem repetição, entre os estados de cada profundidade ótima
+    generator = np.random.default_rng(seed)
+    boards_3x3: Dict[str, List[str]] = {}
+    for depth, available in enumerate(depth_counts()):
+        chosen = np.sort(ranks_at_depth(depth, min(per_depth, available), generator, replace=False))
+        boards_3x3[str(depth)] = [board_to_string(unrank_board(rank)[0]) for rank in chosen.tolist()]
+
+    # 4x4: passeios aleatórios resolvidos de forma ótima
+    geometry = get_geometry(4)
+    boards_4x4: List[Dict] = []
+    seen = set()
+    while len(boards_4x4) < instances_4x4:
+        state = _random_walk_4x4(rng.randint(max_depth_4x4 // 2, 2 * max_depth_4x4), rng)
+        if state.board in seen:
+            continue
+        path, _, _ = astar_search(state, "pdb", queue="bucket")
+        depth = len(path) - 1
+        if depth > max_depth_4x4:
+            continue
+        seen.add(state.board)
+        boards_4x4.append({"board": board_to_string(state.board, geometry), "depth": depth})
+    boards_4x4.sort(key=lambda entry: entry["depth"])
+
+    return {
+        "version": CORPUS_VERSION,
+        "seed": seed,
+        "per_depth": per_depth,
+        "3x3": boards_3x3,
+        "4x4": boards_4x4,
+    }
+
+
+def save_corpus(corpus: Dict, path: str = CORPUS_FILE) -> str:
+    """Salva o corpus em JSON e retorna o caminho do arquivo."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(corpus, f, indent=2)
+    return path
+
+
+def load_corpus(path: str = CORPUS_FILE) -> Dict:
+    """Carrega o corpus salvo.
+
+    Raises:
+        FileNotFoundError: Se o corpus ainda não tiver sido gerado
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+def corpus_instances(corpus: Dict, size: int = 3, per_depth: Optional[int] = None,
+                     depths: Optional[Sequence[int]] = None) -> List[Tuple[State, int]]:
+    """Seleciona instâncias do corpus como pares (estado, profundidade ótima).
+
+    Args:
+        corpus: Corpus carregado com load_corpus
+        size: Dimensão do tabuleiro (3 ou 4)
+        per_depth: Máximo de tabuleiros 3x3 por profundidade (padrão: todos)
+        depths: Profundidades 3x3 a incluir (padrão: todas)
+
+    Returns:
+        List[Tuple[State, int]]: Instâncias em ordem crescente de profundidade
+    """
+    if size == 4:
+        return [(State.from_string(entry["board"]), entry["depth"]) for entry in corpus["4x4"]]
+
+    instances = []
+    for depth, boards in sorted(corpus["3x3"].items(), key=lambda item: int(item[0])):
+        if depths is not None and int(depth) not in depths:
+            continue
+        for board in boards[:per_depth]:
+            instances.append((State.from_string(board), int(depth)))
+    return instances
+
+
+if __name__ == "__main__":
+    saved = save_corpus(generate_corpus())
+    print(f"Corpus v{CORPUS_VERSION} salvo em {saved}")
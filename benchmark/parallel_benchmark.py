@@ -0,0 +1,230 @@
+"""
+Benchmark paralelo sobre um conjunto de instâncias do Puzzle de 8 peças.
+
+Cada combinação (instância, algoritmo, heurística) é um trabalho independente,
+distribuído entre processos fixados cada um em um núcleo (para evitar que dois
+trabalhos disputem o mesmo núcleo e distorçam os tempos). Os resultados são
+reunidos em um único relatório JSON com o detalhe de cada trabalho e o resumo
+por algoritmo.
+
+Uso:
+    python -m benchmark.parallel_benchmark --algorithms astar,ida --max-depth 20 --workers 4 --max-time 30
+"""
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from algorithms.batch_search import ALGORITHMS, get_solver, preload_tables
+from benchmark.profiling import DATA_DIR
+from utils.budget import BudgetExceeded, SearchBudget
+from utils.distance_table import build_distances
+from utils.ranking import unrank_board
+from utils.state import State, board_to_string
+
+# Trabalho: (índice da instância, tabuleiro, profundidade ótima, algoritmo, heurística)
+Job = Tuple[int, str, int, str, Optional[str]]
+
+
+def available_cores() -> List[int]:
+    """Núcleos em que o processo atual pode executar."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def sample_instances(count: int, max_depth: Optional[int] = None, seed: int = 0) -> List[Tuple[str, int]]:
+    """Sorteia tabuleiros 3x3 solucionáveis distintos, com sua profundidade ótima.
+
+    As profundidades vêm da busca em largura completa do banco de distâncias, o
+    que permite sortear uniformemente entre os estados com profundidade até max_depth.
+
+    Args:
+        count: Número de instâncias (limitado ao número de estados elegíveis)
+        max_depth: Profundidade ótima máxima (None para qualquer profundidade)
+        seed: Semente do sorteio
+
+    Returns:
+        List[Tuple[str, int]]: Pares (tabuleiro, profundidade ótima)
+    """
+    distances = build_distances()
+    eligible = np.arange(distances.size) if max_depth is None else np.flatnonzero(distances <= max_depth)
+    ranks = random.Random(seed).sample(eligible.tolist(), min(count, eligible.size))
+    return [(board_to_string(unrank_board(rank)[0]), int(distances[rank])) for rank in ranks]
+
+
+def build_jobs(instances: List[Tuple[str, int]], algorithms: List[str], heuristics: List[str]) -> List[Job]:
+    """Combina instâncias, algoritmos e heurísticas (apenas para algoritmos informados)."""
+    jobs = []
+    for index, (board, depth) in enumerate(instances):
+        for algorithm in algorithms:
+            for heuristic in (heuristics if ALGORITHMS[algorithm][1] else [None]):
+                jobs.append((index, board, depth, algorithm, heuristic))
+    return jobs
+
+
+def _pin_worker(cores) -> None:
+    """Fixa o processo trabalhador em um núcleo ainda livre."""
+    core = cores.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {core})
+
+
+def run_job(job: Job, budget: Optional[SearchBudget] = None) -> Dict:
+    """Executa um trabalho e devolve suas estatísticas.
+
+    Args:
+        job: Trabalho a executar
+        budget: Limites da execução (ver utils.budget); um trabalho interrompido é
+            registrado com o motivo em exceeded e as estatísticas parciais
+    """
+    index, board, depth, algorithm, heuristic = job
+    state = State.from_string(board)
+    preload_tables(algorithm, heuristic or "", state.size)
+    solver = get_solver(algorithm, heuristic or "manhattan")
+    result = solver(state) if budget is None else solver(state, budget=budget)
+    path, exec_time, expanded_nodes = result
+    path_length = len(path) - 1 if path else 0
+    return {
+        "instance": index,
+        "board": board,
+        "depth": depth,
+        "algorithm": algorithm,
+        "heuristic": heuristic,
+        "time": exec_time,
+        "nodes": expanded_nodes,
+        "path_length": path_length,
+        "optimal": path_length == depth,
+        "exceeded": result.reason if isinstance(result, BudgetExceeded) else None,
+        "stats": result.stats.to_dict(),
+    }
+
+
+def run_suite(jobs: List[Job], workers: int, budget: Optional[SearchBudget] = None) -> List[Dict]:
+    """Distribui os trabalhos entre os processos (um por núcleo) e reúne os resultados.
+
+    Args:
+        jobs: Trabalhos a executar
+        workers: Número de processos (limitado ao número de núcleos disponíveis)
+        budget: Limites de cada trabalho (ver run_job)
+
+    Returns:
+        List[Dict]: Estatísticas de cada trabalho, na ordem dos trabalhos
+    """
+    cores = available_cores()
+    workers = max(1, min(workers, len(cores)))
+    core_queue = multiprocessing.Queue()
+    for core in cores[:workers]:
+        core_queue.put(core)
+
+    # Constrói as tabelas que faltam antes de iniciar os processos, que apenas as mapeiam
+    for algorithm, heuristic, size in {(job[3], job[4], math.isqrt(len(job[1]))) for job in jobs}:
+        preload_tables(algorithm, heuristic or "", size)
+
+    results: List[Optional[Dict]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_pin_worker, initargs=(core_queue,)) as executor:
+        futures = {executor.submit(run_job, job, budget): position for position, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            print(f"\r{done}/{len(jobs)} trabalhos concluídos", end="", flush=True)
+    print()
+    return results
+
+
+def summarize(results: List[Dict]) -> List[Dict]:
+    """Resume os resultados por (algoritmo, heurística)."""
+    groups = defaultdict(list)
+    for result in results:
+        groups[(result["algorithm"], result["heuristic"])].append(result)
+
+    summary = []
+    for (algorithm, heuristic), entries in groups.items():
+        times = [entry["time"] for entry in entries]
+        summary.append({
+            "algorithm": algorithm,
+            "heuristic": heuristic,
+            "instances": len(entries),
+            "optimal": sum(entry["optimal"] for entry in entries),
+            "exceeded": sum(entry["exceeded"] is not None for entry in entries),
+            "mean_time": statistics.mean(times),
+            "median_time": statistics.median(times),
+            "mean_nodes": statistics.mean(entry["nodes"] for entry in entries),
+        })
+    return summary
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark paralelo sobre várias instâncias do puzzle.")
+    parser.add_argument("--algorithms", default="astar,ida,mm,bfs_bidirectional,oracle",
+                        help=f"Algoritmos separados por vírgula (disponíveis: {', '.join(ALGORITHMS)})")
+    parser.add_argument("--heuristics", default="manhattan",
+                        help="Heurísticas separadas por vírgula (para os algoritmos informados)")
+    parser.add_argument("--instances", type=int, default=50, help="Número de instâncias sorteadas")
+    parser.add_argument("--max-depth", type=int, default=None, help="Profundidade ótima máxima das instâncias")
+    parser.add_argument("--workers", type=int, default=len(available_cores()),
+                        help="Número de processos (no máximo um por núcleo)")
+    parser.add_argument("--seed", type=int, default=0, help="Semente do sorteio das instâncias")
+    parser.add_argument("--max-time", type=float, default=None,
+                        help="Tempo máximo por trabalho, em segundos (interrompe execuções descontroladas)")
+    parser.add_argument("--max-nodes", type=int, default=None, help="Máximo de nós expandidos por trabalho")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    algorithms = [name.strip() for name in args.algorithms.split(",") if name.strip()]
+    unknown = [name for name in algorithms if name not in ALGORITHMS]
+    if unknown:
+        raise SystemExit(f"Algoritmos desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(ALGORITHMS)})")
+    heuristics = [name.strip() for name in args.heuristics.split(",") if name.strip()]
+
+    instances = sample_instances(args.instances, args.max_depth, args.seed)
+    jobs = build_jobs(instances, algorithms, heuristics)
+    workers = max(1, min(args.workers, len(available_cores())))
+    print(f"Executando {len(jobs)} trabalhos ({len(instances)} instâncias) em {workers} processo(s)...")
+    budget = None
+    if args.max_time is not None or args.max_nodes is not None:
+        budget = SearchBudget(max_nodes=args.max_nodes, max_time=args.max_time)
+    results = run_suite(jobs, workers, budget)
+    summary = summarize(results)
+
+    for entry in summary:
+        label = entry["algorithm"] + (f" ({entry['heuristic']})" if entry["heuristic"] else "")
+        print(f"{label}: {entry['mean_time']:.4f}s médio, {entry['mean_nodes']:.0f} nós, "
+              f"{entry['optimal']}/{entry['instances']} ótimos"
+              + (f", {entry['exceeded']} interrompidos" if entry["exceeded"] else ""))
+
+    # Salva o relatório em um arquivo de log
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file = os.path.join(DATA_DIR, f"benchmark_suite_{timestamp}.json")
+    with open(log_file, "w") as f:
+        json.dump({
+            "timestamp": timestamp,
+            "summary": summary,
+            "results": results,
+            "metadata": {
+                "algorithms": algorithms,
+                "heuristics": heuristics,
+                "instances": len(instances),
+                "max_depth": args.max_depth,
+                "workers": workers,
+                "seed": args.seed,
+                "max_time": args.max_time,
+                "max_nodes": args.max_nodes,
+            }
+        }, f, indent=2)
+
+    print(f"\nResultados salvos em {log_file}")
+
+
+if __name__ == "__main__":
+    main()
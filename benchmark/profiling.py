@@ -0,0 +1,186 @@
+"""
+Perfis de execução das buscas (modo --profile de benchmark/benchmark.py).
+
+Cada busca escolhida é executada sobre as instâncias sob o cProfile, e o perfil
+é salvo em benchmark/data/, junto dos logs JSON do benchmark, em três formatos:
+
+- <prefixo>.pstats: estatísticas binárias do cProfile (pstats.Stats, snakeviz, ...)
+- <prefixo>.txt: relatório ordenado por tempo acumulado e por tempo próprio
+- <prefixo>.folded: pilhas colapsadas ("f1;f2;f3 microssegundos") para ferramentas
+  de flamegraph (flamegraph.pl, speedscope, inferno)
+
+O cProfile registra apenas pares chamador -> chamado, então as pilhas colapsadas
+são reconstruídas a partir das raízes, dividindo o tempo de cada função entre
+seus filhos na proporção do tempo de cada chamada. Opcionalmente, o tempo linha
+a linha dos métodos de State é medido com o line_profiler (dependência opcional,
+instalada à parte com pip install line_profiler).
+"""
+import cProfile
+import io
+import os
+import pstats
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.state import State
+
+# Diretório dos perfis, dos logs JSON e do corpus do benchmark
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Linhas de cada ordenação no relatório em texto
+REPORT_LINES = 40
+
+# Fração mínima do tempo total para uma pilha entrar no arquivo de pilhas colapsadas
+MIN_STACK_FRACTION = 1e-4
+
+# Profundidade máxima das pilhas reconstruídas
+MAX_STACK_DEPTH = 96
+
+# Métodos de State medidos linha a linha (o caminho quente das buscas)
+STATE_METHODS = ("get_neighbors", "heuristic_value", "_init_packed", "from_packed", "__hash__", "__eq__")
+
+
+def _frame_label(func: Tuple[str, int, str]) -> str:
+    """Nome de uma função do perfil no formato 'arquivo.py:função' (sem ';', separador das pilhas)."""
+    filename, _, name = func
+    label = name if filename == "~" else f"{os.path.basename(filename)}:{name}"
+    return label.replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats, min_fraction: float = MIN_STACK_FRACTION) -> Dict[str, int]:
+    """Reconstrói as pilhas de chamadas de um perfil do cProfile.
+
+    Partindo das funções sem chamador, o tempo de cada função é dividido entre
+    o tempo próprio (atribuído à pilha atual) e os filhos, na proporção do tempo
+    acumulado de cada chamada. Chamadas recursivas são ignoradas na descida, pois
+    o tempo delas já está no tempo acumulado da chamada mais externa.
+
+    Args:
+        stats: Estatísticas do cProfile
+        min_fraction: Fração mínima do tempo total para seguir uma chamada
+
+    Returns:
+        Dict[str, int]: Tempo próprio, em microssegundos, de cada pilha ('raiz;...;função')
+    """
+    entries = stats.stats
+    children: Dict[tuple, Dict[tuple, float]] = defaultdict(dict)
+    roots = []
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            if caller != func and caller in entries:
+                children[caller][func] = edge[3]  # Tempo acumulado nesta chamada
+
+    total = sum(entries[func][3] for func in roots) or stats.total_tt
+    threshold = total * min_fraction
+    stacks: Dict[str, float] = defaultdict(float)
+    path: List[str] = []
+    active = set()
+
+    def walk(func: tuple, time_here: float) -> None:
+        _, _, own_time, cumulative, _ = entries[func]
+        path.append(_frame_label(func))
+        active.add(func)
+        scale = time_here / cumulative if cumulative > 0 else 0.0
+        if own_time * scale > 0:
+            stacks[";".join(path)] += own_time * scale
+        if len(path) < MAX_STACK_DEPTH:
+            for child, edge_time in children[func].items():
+                child_time = edge_time * scale
+                if child not in active and child_time >= threshold:
+                    walk(child, child_time)
+        active.discard(func)
+        path.pop()
+
+    for root in roots:
+        walk(root, entries[root][3])
+    return {stack: round(seconds * 1e6) for stack, seconds in stacks.items() if round(seconds * 1e6) > 0}
+
+
+def write_report(profiler: cProfile.Profile, path: str, title: str) -> None:
+    """Salva o relatório em texto: funções ordenadas por tempo acumulado e por tempo próprio."""
+    stream = io.StringIO()
+    report = pstats.Stats(profiler, stream=stream)
+    report.strip_dirs()
+    for order in ("cumulative", "tottime"):
+        stream.write(f"{title} - ordenado por {order}\n")
+        report.sort_stats(order).print_stats(REPORT_LINES)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(stream.getvalue())
+
+
+def write_collapsed(stats: pstats.Stats, path: str) -> int:
+    """Salva as pilhas colapsadas de um perfil; retorna o número de pilhas."""
+    stacks = collapsed_stacks(stats)
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, micros in sorted(stacks.items()):
+            f.write(f"{stack} {micros}\n")
+    return len(stacks)
+
+
+def profile_search(solver: Callable[[State], tuple], instances: Sequence[State], prefix: str,
+                   output_dir: str = DATA_DIR, title: Optional[str] = None) -> Dict[str, object]:
+    """Executa uma busca sobre as instâncias sob o cProfile e salva o perfil.
+
+    Args:
+        solver: Função que recebe um State e devolve um SearchResult
+        instances: Estados a resolver (cada um uma vez)
+        prefix: Prefixo dos arquivos gerados (sem diretório nem extensão)
+        output_dir: Diretório dos arquivos (padrão: benchmark/data/)
+        title: Título do relatório em texto (padrão: o prefixo)
+
+    Returns:
+        Dict[str, object]: Caminhos dos arquivos gerados, tempo total medido pelo
+        perfil, número de chamadas de função e de pilhas colapsadas
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    profiler = cProfile.Profile()
+    for state in instances:
+        profiler.runcall(solver, state)
+    stats = pstats.Stats(profiler)
+
+    base = os.path.join(output_dir, prefix)
+    files = {"pstats": base + ".pstats", "report": base + ".txt", "folded": base + ".folded"}
+    stats.dump_stats(files["pstats"])
+    write_report(profiler, files["report"], title or prefix)
+    stack_count = write_collapsed(stats, files["folded"])
+    return {
+        "files": files,
+        "total_time": stats.total_tt,
+        "calls": stats.total_calls,
+        "stacks": stack_count,
+    }
+
+
+def profile_state_lines(solver: Callable[[State], tuple], instances: Sequence[State], path: str,
+                        methods: Sequence[str] = STATE_METHODS) -> str:
+    """Mede o tempo linha a linha dos métodos de State durante uma busca (line_profiler).
+
+    Args:
+        solver: Função que recebe um State e devolve um SearchResult
+        instances: Estados a resolver (cada um uma vez)
+        path: Arquivo do relatório em texto
+        methods: Nomes dos métodos de State medidos
+
+    Returns:
+        str: Caminho do relatório
+
+    Raises:
+        ImportError: Se o line_profiler não estiver instalado
+    """
+    try:
+        from line_profiler import LineProfiler
+    except ImportError:
+        raise ImportError("O perfil por linha requer o line_profiler (pip install line_profiler)") from None
+
+    profiler = LineProfiler()
+    for name in methods:
+        method = State.__dict__[name]
+        # Métodos de classe são medidos pela função subjacente
+        profiler.add_function(getattr(method, "__func__", method))
+    for state in instances:
+        profiler.runcall(solver, state)
+    with open(path, "w", encoding="utf-8") as f:
+        profiler.print_stats(stream=f)
+    return path
@@ -25,6 +25,11 @@ def build_executable():
         print("Pillow não encontrado. Instalando...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pillow"])
     
+    # Gerar as tabelas pré-calculadas (transições, distâncias e bancos de padrões) que acompanham o executável
+    print("Gerando tabelas pré-calculadas...")
+    subprocess.check_call([sys.executable, "-m", "utils.distance_table"])
+    subprocess.check_call([sys.executable, "-m", "utils.pattern_database", "3"])
+    
     # Limpar diretórios de build anteriores
     if os.path.exists("build"):
         print("Removendo diretório 'build' anterior...")
@@ -44,7 +49,7 @@ a = Analysis(
     ['interface.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('tables', 'tables')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
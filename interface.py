@@ -4,6 +4,7 @@ Permite ao usuário selecionar o estado inicial, escolher o algoritmo,
 visualizar o processo de solução e analisar métricas de desempenho detalhadas.
 """
 
+from functools import partial
 import threading
 import time
 import tkinter as tk
@@ -15,15 +16,49 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 import numpy as np
 
-from algorithms.astar_search import astar_search
-from algorithms.breadth_first_search import breadth_first_search
-from algorithms.greedy_search import greedy_best_first_search
+from algorithms.astar_search import astar_search, astar_search_stream
+from algorithms.breadth_first_search import breadth_first_search, breadth_first_search_stream
+from algorithms.greedy_search import greedy_best_first_search, greedy_best_first_search_stream
+from algorithms.ida_star import ida_star_search, ida_star_search_stream
+from algorithms.oracle_search import oracle_search
+from algorithms.sma_star import sma_star_search
+from interface.controls import RANDOM_DEPTH
 from interface.styles import ANIMATION_SPEED, BOARD_PADDING, FONTS, THEME, TILE_SIZE
 from interface.textures import create_board_texture, create_tile_textures
 from interface.ui_setup import setup_style, setup_ui
+from utils.budget import (CANCELLED, MEMORY_LIMIT, NODE_LIMIT, TIME_LIMIT, BudgetExceeded, CancellationToken,
+                          SearchBudget)
+from utils.instance_generator import random_state
+from utils.solution_cache import SolutionCache
 from utils.state import State
 matplotlib.use('Agg')  # Usar backend não interativo
 
+# Versões em fluxo das buscas, usadas para exibir o progresso durante a execução
+STREAMING_SEARCHES = {
+    breadth_first_search: breadth_first_search_stream,
+    greedy_best_first_search: greedy_best_first_search_stream,
+    astar_search: astar_search_stream,
+    ida_star_search: ida_star_search_stream,
+}
+
+# Nós expandidos entre duas atualizações do progresso na interface
+PROGRESS_INTERVAL = 5000
+
+# Peso do A* ponderado e prazo (em segundos) do ARA* na interface
+WEIGHTED_ASTAR_WEIGHT = 2.0
+ANYTIME_DEADLINE = 5.0
+
+# Teto de nós residentes do SMA* na interface
+SMA_MAX_NODES = 5000
+
+# Motivo exibido de cada interrupção de busca (ver utils.budget)
+INTERRUPTION_REASONS = {
+    CANCELLED: "cancelada",
+    TIME_LIMIT: "tempo",
+    NODE_LIMIT: "nós",
+    MEMORY_LIMIT: "memória",
+}
+
 
 
 class PuzzleScientificInterface(tk.Tk):
@@ -65,10 +100,16 @@ class PuzzleScientificInterface(tk.Tk):
             "A*": []
         }
         
+        # Cache persistente de soluções ótimas (compartilhado entre execuções)
+        self.solution_cache = SolutionCache()
+
         # Imagens e recursos visuais
         self.tile_images = create_tile_textures()
         self.board_texture = create_board_texture() # <<< Criar textura aqui
 
+        # Gerador dos tabuleiros embaralhados (ver utils.instance_generator)
+        self.rng = np.random.default_rng()
+
         # Variáveis para controle da solução
         self.solution_path = None
         self.solution_thread = None
@@ -76,6 +117,8 @@ class PuzzleScientificInterface(tk.Tk):
         self.current_animation_frame = 0
         self.is_solving = False
         self.is_comparing = False
+        self.cancel_token = None  # Token de cancelamento da busca em andamento
+        self.last_suboptimality = None  # Limite de subotimalidade da última solução, se conhecido
 
         # --- Adicionar atributos que serão criados por setup_ui --- 
         self.notebook = None
@@ -85,8 +128,10 @@ class PuzzleScientificInterface(tk.Tk):
         # self.algorithm_var = tk.StringVar(value="A*") # <<< Inicialização direta
         self.algorithm_var = tk.StringVar(value="A* - Euclidean")  # Ou adicione à lista de opções existente
         self.randomize_button = None
+        self.shuffle_depth_var = tk.StringVar(value=RANDOM_DEPTH)  # Profundidade ótima do embaralhamento
         self.solve_button = None
         self.reset_button = None
+        self.cancel_button = None
         self.results_frame = None
         self.results_text = None
         # --- Fim dos atributos adicionados ---
@@ -137,37 +182,19 @@ class PuzzleScientificInterface(tk.Tk):
                     )
     
     def randomize_board(self):
-        """Embaralha o tabuleiro para um estado aleatório solucionável."""
+        """Embaralha o tabuleiro para um estado aleatório solucionável.
+
+        Sem profundidade escolhida, o sorteio é uniforme entre os estados
+        solucionáveis; com uma profundidade, o estado está exatamente a esse
+        número de movimentos do objetivo.
+        """
         if self.is_solving:
             return
             
-        # Gerar um estado aleatório
-        numbers = list(range(9))  # 0-8
-        np.random.shuffle(numbers)
-        
-        # Verificar se é solucionável
-        inversions = 0
-        for i in range(9):
-            for j in range(i + 1, 9):
-                if numbers[i] != 0 and numbers[j] != 0 and numbers[i] > numbers[j]:
-                    inversions += 1
-        
-        # Se o número de inversões for ímpar, o puzzle não é solucionável
-        # Nesse caso, trocamos duas peças para torná-lo solucionável
-        if inversions % 2 == 1:
-            # Encontrar duas peças não-zero para trocar
-            idx1, idx2 = 0, 1
-            while numbers[idx1] == 0 or numbers[idx2] == 0:
-                idx1 = np.random.randint(0, 9)
-                idx2 = np.random.randint(0, 9)
-                if idx1 == idx2:
-                    idx2 = (idx2 + 1) % 9
-            
-            # Trocar as peças
-            numbers[idx1], numbers[idx2] = numbers[idx2], numbers[idx1]
-        
-        # Converter para matriz 3x3
-        self.current_state = np.array(numbers).reshape(3, 3)
+        # Sortear um estado solucionável (na profundidade ótima escolhida, se houver)
+        depth = self.shuffle_depth_var.get()
+        state = random_state(depth=None if depth == RANDOM_DEPTH else int(depth), seed=self.rng)
+        self.current_state = state.current_state
         
         # Atualizar o tabuleiro
         self.draw_board()
@@ -204,8 +231,9 @@ class PuzzleScientificInterface(tk.Tk):
         # Criar um objeto State com o estado atual
         initial_state = State(self.current_state.copy())
         
-        # Iniciar thread para resolver o puzzle
+        # Iniciar thread para resolver o puzzle (cancelável pelo token)
         self.is_solving = True
+        self.cancel_token = CancellationToken()
         self.solution_thread = threading.Thread(
             target=self.run_algorithm,
             args=(algorithm, initial_state)
@@ -217,11 +245,20 @@ class PuzzleScientificInterface(tk.Tk):
         self.solve_button.config(state=tk.DISABLED)
         self.randomize_button.config(state=tk.DISABLED)
         self.reset_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+
+    def cancel_search(self):
+        """Pede o cancelamento da busca em andamento (verificado periodicamente pela busca)."""
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+            self.cancel_button.config(state=tk.DISABLED)
     
     def run_algorithm(self, algorithm, initial_state):
         """Executa o algoritmo selecionado e processa os resultados."""
         try:
-            # Selecionar o algoritmo
+            # Selecionar o algoritmo (options: parâmetros adicionais da busca)
+            options = {}
+            max_time = None
             if algorithm == "BFS":
                 algorithm_fn = breadth_first_search
                 algorithm_name = "Busca em Largura"
@@ -237,35 +274,80 @@ class PuzzleScientificInterface(tk.Tk):
             elif algorithm == "A* - Euclidean":
                 algorithm_fn = astar_search
                 algorithm_name = "A* - Euclidean"
+            elif algorithm == "A* - PDB":
+                algorithm_fn = astar_search
+                algorithm_name = "A* - Pattern Database"
+            elif algorithm == "A* - Weighted":
+                algorithm_fn = astar_search
+                algorithm_name = f"A* Ponderado (w = {WEIGHTED_ASTAR_WEIGHT:g}) - Manhattan"
+                options = {"weight": WEIGHTED_ASTAR_WEIGHT}
+            elif algorithm == "ARA*":
+                algorithm_fn = astar_search
+                algorithm_name = "ARA* (anytime) - Manhattan"
+                options = {"anytime": True}
+                max_time = ANYTIME_DEADLINE
+            elif algorithm == "IDA*":
+                algorithm_fn = ida_star_search
+                algorithm_name = "IDA* - Manhattan"
+            elif algorithm == "SMA*":
+                algorithm_fn = sma_star_search
+                algorithm_name = f"SMA* - Manhattan (até {SMA_MAX_NODES} nós)"
+                options = {"max_nodes": SMA_MAX_NODES}
+            elif algorithm == "BFS - Bidirectional":
+                algorithm_fn = partial(breadth_first_search, bidirectional=True)
+                algorithm_name = "Busca em Largura Bidirecional"
+            elif algorithm == "MM":
+                algorithm_fn = partial(astar_search, bidirectional=True)
+                algorithm_name = "MM - Manhattan (bidirecional)"
+            elif algorithm == "Oracle":
+                algorithm_fn = oracle_search
+                algorithm_name = "Oráculo (Tabela de Distâncias)"
             else:  # fallback
                 algorithm_fn = astar_search
                 algorithm_name = "A* - Manhattan"
             
-            # Executar o algoritmo
+            # O oráculo já é exato e instantâneo: não consulta nem preenche o cache de soluções
+            if algorithm_fn is not oracle_search:
+                options["cache"] = self.solution_cache
+
+            # Executar o algoritmo (interrompido se o usuário cancelar)
+            budget = SearchBudget(token=self.cancel_token, max_time=max_time)
             if algorithm == "A* - Manhattan":
-                start_time = time.time()
-                path, exec_time, expanded_nodes = algorithm_fn(initial_state, "manhattan")
-                total_time = time.time() - start_time
+                start_time = time.perf_counter()
+                result = self.run_search(algorithm_fn, initial_state, "manhattan", cache=self.solution_cache, budget=budget)
+                total_time = time.perf_counter() - start_time
             elif algorithm == "A* - ManhattanPenality":
-                start_time = time.time()
-                path, exec_time, expanded_nodes = algorithm_fn(initial_state, "manhattanPenality")
-                total_time = time.time() - start_time
+                start_time = time.perf_counter()
+                result = self.run_search(algorithm_fn, initial_state, "manhattanPenality", cache=self.solution_cache, budget=budget)
+                total_time = time.perf_counter() - start_time
             elif algorithm == "A* - Euclidean":
-                start_time = time.time()
-                path, exec_time, expanded_nodes = algorithm_fn(initial_state, "euclidean")
-                total_time = time.time() - start_time
+                start_time = time.perf_counter()
+                result = self.run_search(algorithm_fn, initial_state, "euclidean", cache=self.solution_cache, budget=budget)
+                total_time = time.perf_counter() - start_time
+            elif algorithm == "A* - PDB":
+                start_time = time.perf_counter()
+                result = self.run_search(algorithm_fn, initial_state, "pdb", cache=self.solution_cache, budget=budget)
+                total_time = time.perf_counter() - start_time
             else:
-                start_time = time.time()
-                path, exec_time, expanded_nodes = algorithm_fn(initial_state)
-                total_time = time.time() - start_time
+                start_time = time.perf_counter()
+                result = self.run_search(algorithm_fn, initial_state, budget=budget, **options)
+                total_time = time.perf_counter() - start_time
+            
+            # Busca interrompida (cancelada ou por um limite): exibe o motivo e as estatísticas parciais
+            if isinstance(result, BudgetExceeded):
+                self.after(0, self.show_interrupted, algorithm_name, result)
+                self.is_solving = False
+                return
+            path, exec_time, expanded_nodes = result
             
             # Verificar se encontrou solução
             if not path:
                 self.show_error("Não foi possível encontrar uma solução para este estado inicial.")
                 return
             
-            # Atualizar resultados
-            self.update_results(algorithm_name, path, exec_time, expanded_nodes, total_time)
+            # Atualizar resultados (agendado após as atualizações de progresso pendentes)
+            self.after(0, self.update_results, algorithm_name, path, exec_time, expanded_nodes, total_time,
+                       result.stats)
             
             # Animar a solução
             self.animate_solution(path)
@@ -276,7 +358,77 @@ class PuzzleScientificInterface(tk.Tk):
             # Reabilitar botões
             self.after(0, self.enable_buttons)
     
-    def update_results(self, algorithm_name, path, exec_time, expanded_nodes, total_time):
+    def run_search(self, algorithm_fn, initial_state, *args, **kwargs):
+        """Executa a busca, pela versão em fluxo quando existir, exibindo o progresso.
+
+        Returns:
+            SearchResult: (caminho, tempo de execução, nós expandidos) e as estatísticas,
+            como as funções bloqueantes
+        """
+        self.last_suboptimality = None
+        stream_fn = STREAMING_SEARCHES.get(algorithm_fn)
+        if stream_fn is None:
+            return algorithm_fn(initial_state, *args, **kwargs)
+
+        event = None
+        for event in stream_fn(initial_state, *args, interval=PROGRESS_INTERVAL, **kwargs):
+            if not event.done:
+                # O tkinter não é seguro entre threads: a atualização é agendada na thread principal
+                self.after(0, self.show_progress, event)
+        self.last_suboptimality = event.suboptimality
+        return event.result()
+
+    def show_progress(self, event):
+        """Exibe o progresso de uma busca em andamento."""
+        progress = (
+            f"Resolvendo...\n"
+            f"Nós expandidos: {event.expanded_nodes}\n"
+            f"Fronteira: {event.frontier_size} estados\n"
+            f"Limite atual (f ou profundidade): {event.bound}\n"
+            f"Tempo decorrido: {event.elapsed:.2f}s\n"
+            f"Vazão: {event.nodes_per_sec:.0f} nós/s\n"
+        )
+        if event.path:
+            # Solução intermediária de uma busca anytime (sem limite provado com heurística não admissível)
+            progress += f"Melhor solução: {len(event.path) - 1} movimentos"
+            if event.suboptimality is not None:
+                progress += f" (no máximo {event.suboptimality:.2f}x o ótimo)"
+            progress += "\n"
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, progress)
+        self.results_text.config(state=tk.DISABLED)
+
+    def show_interrupted(self, algorithm_name, result):
+        """Exibe o motivo e as estatísticas parciais de uma busca interrompida."""
+        summary = (
+            f"Algoritmo: {algorithm_name}\n"
+            f"Busca interrompida após {result.elapsed:.2f}s\n"
+            f"Motivo: {INTERRUPTION_REASONS.get(result.reason, result.reason)}\n"
+            f"Nós expandidos: {result.expanded_nodes}\n"
+            f"Fronteira: {result.frontier_size} estados\n"
+            f"Limite alcançado (f ou profundidade): {result.bound}\n"
+        )
+        summary += self.format_stats(result.stats)
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, summary)
+        self.results_text.config(state=tk.DISABLED)
+
+    def format_stats(self, stats):
+        """Formata as estatísticas detalhadas de uma busca (ver utils.search_stats)."""
+        text = (
+            f"Expansões: {stats.expanded} | Gerados: {stats.generated}\n"
+            f"Duplicatas: {stats.duplicates} | Reabertos: {stats.reopened} | "
+            f"Entradas obsoletas: {stats.stale_pops}\n"
+            f"Pico da fronteira: {stats.peak_open} | Fechados: {stats.peak_closed}\n"
+        )
+        if stats.phase_timing:
+            text += (f"Tempo por fase: heurística {stats.heuristic_time:.4f}s, "
+                     f"sucessores {stats.successor_time:.4f}s, fila {stats.queue_time:.4f}s\n")
+        return text
+
+    def update_results(self, algorithm_name, path, exec_time, expanded_nodes, total_time, stats):
         """Atualiza o texto de resultados com as informações da solução."""
         # Formatar texto de resultados
         results = (
@@ -286,6 +438,15 @@ class PuzzleScientificInterface(tk.Tk):
             f"Tempo total: {total_time:.4f}s\n"
             f"Nós expandidos: {expanded_nodes}\n"
         )
+        results += self.format_stats(stats)
+        if self.last_suboptimality is not None:
+            results += f"Limite provado: no máximo {self.last_suboptimality:.2f}x o ótimo\n"
+        cache_stats = self.solution_cache.stats()
+        lookups = cache_stats["hits"] + cache_stats["misses"]
+        results += (
+            f"Cache de soluções: {cache_stats['hits']} acertos / {lookups} consultas "
+            f"({cache_stats['hit_rate']:.0%})\n"
+        )
         
         # Atualizar o widget de texto
         self.results_text.config(state=tk.NORMAL)
@@ -295,18 +456,8 @@ class PuzzleScientificInterface(tk.Tk):
     
     def animate_solution(self, path):
         """Anima a solução mostrando cada passo no tabuleiro."""
-        # Converter o caminho de strings para matrizes
-        matrices = []
-        
-        # O caminho está em ordem reversa (do objetivo ao inicial)
-        # Vamos inverter para mostrar do inicial ao objetivo
-        path_list = list(path)
-        path_list.reverse()
-        
-        for state_str in path_list:
-            # Converter string para matriz 3x3
-            matrix = np.array([int(c) for c in state_str]).reshape(3, 3)
-            matrices.append(matrix)
+        # Os tabuleiros são gerados a partir dos movimentos, já do inicial ao objetivo
+        matrices = path.matrices()
         
         # Animar cada passo
         self.animate_step(matrices, 0)
@@ -331,6 +482,7 @@ class PuzzleScientificInterface(tk.Tk):
         self.solve_button.config(state=tk.NORMAL)
         self.randomize_button.config(state=tk.NORMAL)
         self.reset_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
     
     def clear_results(self):
         """Limpa o texto de resultados."""
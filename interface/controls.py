@@ -3,8 +3,13 @@
 import tkinter as tk
 from tkinter import ttk
 
+from utils.instance_generator import MAX_DEPTH
+
 from .styles import THEME, FONTS # Importar estilos necessários
 
+# Opção do embaralhamento sem profundidade fixa (sorteio uniforme)
+RANDOM_DEPTH = "Aleatória"
+
 def create_controls_frame(parent, app):
     """Cria e configura o frame de controles dentro do frame pai.
     
@@ -30,10 +35,18 @@ def create_controls_frame(parent, app):
         
     algorithms = [
         ("Busca em Largura (BFS)", "BFS"),
+        ("Busca em Largura Bidirecional", "BFS - Bidirectional"),
         ("Busca Gulosa (Greedy)", "Greedy"),
         ("A* (Manhattan)", "A* - Manhattan"),
         ("A* (Manhattan + Penalidades)", "A* - ManhattanPenality"),
-        ("A* (Distância Euclidiana)", "A* - Euclidean")
+        ("A* (Distância Euclidiana)", "A* - Euclidean"),
+        ("A* (Banco de Padrões)", "A* - PDB"),
+        ("A* Ponderado (w = 2, Manhattan)", "A* - Weighted"),
+        ("ARA* Anytime (Manhattan)", "ARA*"),
+        ("IDA* (Manhattan)", "IDA*"),
+        ("SMA* (Manhattan, memória limitada)", "SMA*"),
+        ("MM Bidirecional (Manhattan)", "MM"),
+        ("Oráculo (Tabela de Distâncias)", "Oracle")
     ]
     
     for text, value in algorithms:
@@ -79,6 +92,24 @@ def create_controls_frame(parent, app):
     )
     app.reset_button.grid(row=0, column=2, padx=5, pady=5, sticky="ew")
 
+    # Cancela a busca em andamento (habilitado apenas durante a solução)
+    app.cancel_button = ttk.Button(
+        buttons_frame,
+        text="Cancelar",
+        command=app.cancel_search,
+        style="TButton",
+        state=tk.DISABLED
+    )
+    app.cancel_button.grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+
+    # Profundidade ótima dos tabuleiros embaralhados (dificuldade)
+    depth_label = ttk.Label(buttons_frame, text="Profundidade ao embaralhar:", style="TLabel")
+    depth_label.grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+    depths = [RANDOM_DEPTH] + [str(depth) for depth in range(1, MAX_DEPTH + 1)]
+    depth_box = ttk.Combobox(buttons_frame, textvariable=app.shuffle_depth_var, values=depths,
+                             state="readonly", width=10)
+    depth_box.grid(row=2, column=2, padx=5, pady=5, sticky="ew")
+
     # --- Frame de Resultados --- 
     # (Mantido aqui por enquanto, pode ser movido depois)
     app.results_frame = ttk.LabelFrame(
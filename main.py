@@ -5,17 +5,19 @@ from utils.state import State
 from algorithms.breadth_first_search import breadth_first_search
 from algorithms.greedy_search import greedy_best_first_search
 from algorithms.astar_search import astar_search
+from algorithms.oracle_search import oracle_search
 
 
 def print_formatted(state_str: str) -> None:
-    """Imprime o estado do puzzle em formato de matriz 3x3.
+    """Imprime o estado do puzzle em formato de matriz NxN.
     
     Args:
         state_str: Representação do estado como string (ex: '123456780')
     """
-    for i in range(9):
+    size = int(round(len(state_str) ** 0.5))
+    for i in range(len(state_str)):
         print(f"{state_str[i]} ", end="")
-        if (i+1) % 3 == 0: 
+        if (i+1) % size == 0: 
             print()
         
 
@@ -66,7 +68,19 @@ def main() -> None:
     run_and_print_results("Busca em Largura", breadth_first_search, initial_state)
     run_and_print_results("Busca Gulosa", greedy_best_first_search, initial_state)
     run_and_print_results("A* - Manhattan", astar_search, initial_state)
-    run_and_print_results("A* - ManhattanPenality", astar_search, initial_state, "heuristic2")
+    run_and_print_results("A* - ManhattanPenality", astar_search, initial_state, "manhattanPenality")
+    run_and_print_results("Oráculo (Tabela de Distâncias)", oracle_search, initial_state)
+    
+    # Puzzle de 15 peças (4x4): apenas buscas informadas são viáveis
+    initial_state_4x4 = State(np.array([
+        [1, 10, 2, 6],
+        [5, 4, 12, 15],
+        [13, 9, 0, 14],
+        [11, 8, 3, 7]
+    ]))
+    print("\nEstado inicial (4x4):")
+    initial_state_4x4.print_state()
+    run_and_print_results("A* - ManhattanPenality (4x4)", astar_search, initial_state_4x4, "manhattanPenality")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+"""
+Atualizações incrementais das heurísticas (register_delta) comparadas ao cálculo completo.
+
+Em passeios aleatórios no 3x3 e no 4x4, a cada movimento o valor do pai mais a
+variação deve ser igual à heurística recalculada no filho, tanto chamando o
+delta diretamente quanto pelos vizinhos de State.get_neighbors.
+"""
+import random
+
+import pytest
+
+from utils.heuristics import HEURISTICS
+from utils.instance_generator import random_tiles
+from utils.state import State
+
+# Movimentos de cada passeio aleatório e passeios por combinação
+WALK_LENGTH = 200
+WALKS = 5
+
+DELTA_HEURISTICS = sorted(name for name, fn in HEURISTICS.items() if hasattr(fn, "delta"))
+
+
+def random_walk(size: int, seed: int):
+    """Percorre um passeio aleatório a partir de um tabuleiro solucionável sorteado.
+
+    Yields:
+        Tuple[State, State, int, int, int]: (pai, filho, peça movida, célula de origem
+        da peça, célula de destino da peça)
+    """
+    rng = random.Random(seed)
+    state = State(random_tiles(1, size, seed)[0].reshape(size, size))
+    geometry = state.geometry
+    for _ in range(WALK_LENGTH):
+        cell = rng.choice(geometry.neighbor_cells[state.blank])
+        tile = geometry.unpack(state.board)[cell]
+        child = next(neighbour for neighbour in state.get_neighbors() if neighbour.blank == cell)
+        yield state, child, tile, cell, state.blank
+        state = child
+
+
+def test_delta_heuristics_registered():
+    assert {"manhattan", "manhattanPenality"} <= set(DELTA_HEURISTICS)
+
+
+@pytest.mark.parametrize("size", [3, 4])
+@pytest.mark.parametrize("name", DELTA_HEURISTICS)
+def test_delta_matches_full_computation(name, size):
+    heuristic = HEURISTICS[name]
+    for seed in range(WALKS):
+        for parent, child, tile, from_cell, to_cell in random_walk(size, seed):
+            change = heuristic.delta(parent.board, child.board, parent.geometry, tile, from_cell, to_cell)
+            assert heuristic(parent) + change == heuristic(child), (
+                f"{name}: {parent.from_matrix_string()} -> {child.from_matrix_string()}")
+
+
+@pytest.mark.parametrize("size", [3, 4])
+@pytest.mark.parametrize("name", DELTA_HEURISTICS)
+def test_incremental_neighbors_match_full_computation(name, size):
+    heuristic = HEURISTICS[name]
+    for seed in range(WALKS):
+        for parent, _, _, _, _ in random_walk(size, seed):
+            parent.heuristic_value(heuristic)
+            for neighbour in parent.get_neighbors(heuristic):
+                # O valor derivado do pai já está guardado no vizinho
+                assert neighbour.heuristic_value(heuristic) == heuristic(neighbour), (
+                    f"{name}: {parent.from_matrix_string()} -> {neighbour.from_matrix_string()}")
@@ -0,0 +1,153 @@
+"""
+Limites de execução das buscas: cancelamento cooperativo, prazo, nós e memória.
+
+Um SearchBudget é verificado pelas buscas a cada check_interval nós expandidos,
+de modo que o custo no laço principal é uma comparação de inteiros por nó. Ao
+exceder um limite, a busca devolve um BudgetExceeded no lugar do resultado: ele
+se comporta como a tupla (caminho vazio, tempo, nós expandidos) das buscas e
+traz o motivo da interrupção e as estatísticas parciais.
+"""
+import sys
+import threading
+import time
+from typing import Optional
+
+from utils.search_stats import SearchResult, SearchStats
+from utils.solution import Solution
+
+# Nós expandidos entre duas verificações do orçamento
+DEFAULT_CHECK_INTERVAL = 1024
+
+# Estimativa de memória por estado guardado (tabuleiro, entradas nos dicionários e na fila),
+# medida com tracemalloc no A* e na busca em largura 3x3
+BYTES_PER_STATE = 300
+
+# Limite de nós que nunca é alcançado (sem verificações)
+_NEVER = sys.maxsize
+
+# Motivos de interrupção
+CANCELLED = "cancelled"
+TIME_LIMIT = "time"
+NODE_LIMIT = "nodes"
+MEMORY_LIMIT = "memory"
+
+
+class CancellationToken:
+    """Sinal de cancelamento compartilhado entre threads (ex: interface e busca)."""
+
+    def __init__(self, event=None):
+        """Cria o token.
+
+        Args:
+            event: Evento que guarda o sinal (padrão: threading.Event); um
+                multiprocessing.Event permite cancelar buscas em outros processos
+        """
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self) -> None:
+        """Pede o cancelamento das buscas que usam este token."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Se o cancelamento foi pedido."""
+        return self._event.is_set()
+
+
+class SearchBudget:
+    """Limites de uma busca: token de cancelamento, prazo, nós expandidos e memória."""
+
+    def __init__(self, max_nodes: Optional[int] = None, max_time: Optional[float] = None,
+                 max_memory: Optional[int] = None, token: Optional[CancellationToken] = None,
+                 check_interval: int = DEFAULT_CHECK_INTERVAL, bytes_per_state: int = BYTES_PER_STATE):
+        """Cria o orçamento (limites None não são verificados).
+
+        Args:
+            max_nodes: Máximo de nós expandidos
+            max_time: Prazo em segundos, contado a partir do início da busca
+            max_memory: Máximo de memória em bytes, estimada pelo número de estados
+                guardados vezes bytes_per_state
+            token: Token de cancelamento cooperativo
+            check_interval: Nós expandidos entre duas verificações
+            bytes_per_state: Estimativa de memória por estado guardado
+        """
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.max_memory = max_memory
+        self.token = token
+        self.check_interval = check_interval
+        self.bytes_per_state = bytes_per_state
+
+    def next_check(self, expanded_nodes: int) -> int:
+        """Número de nós expandidos da próxima verificação (sem ultrapassar o limite de nós)."""
+        next_check = expanded_nodes + self.check_interval
+        if self.max_nodes is not None and expanded_nodes < self.max_nodes < next_check:
+            return self.max_nodes
+        return next_check
+
+    def exceeded(self, start_time: float, expanded_nodes: int, stored_states: int) -> Optional[str]:
+        """Verifica os limites.
+
+        Args:
+            start_time: Instante de início da busca (time.perf_counter)
+            expanded_nodes: Nós expandidos até o momento
+            stored_states: Estados guardados pela busca (para a estimativa de memória)
+
+        Returns:
+            Optional[str]: Motivo da interrupção (CANCELLED, TIME_LIMIT, NODE_LIMIT ou
+            MEMORY_LIMIT) ou None se nenhum limite foi excedido
+        """
+        if self.token is not None and self.token.cancelled:
+            return CANCELLED
+        if self.max_nodes is not None and expanded_nodes >= self.max_nodes:
+            return NODE_LIMIT
+        if self.max_memory is not None and stored_states * self.bytes_per_state > self.max_memory:
+            return MEMORY_LIMIT
+        if self.max_time is not None and time.perf_counter() - start_time > self.max_time:
+            return TIME_LIMIT
+        return None
+
+
+def first_check(budget: Optional[SearchBudget]) -> int:
+    """Número de nós expandidos da primeira verificação do orçamento (nunca, sem orçamento)."""
+    return budget.next_check(0) if budget is not None else _NEVER
+
+
+class BudgetExceeded(SearchResult):
+    """Resultado de uma busca interrompida por um limite do orçamento.
+
+    É um SearchResult com caminho vazio, com o motivo e as estatísticas
+    parciais como atributos.
+    """
+
+    def __new__(cls, reason: str, elapsed: float, expanded_nodes: int,
+                frontier_size: int = 0, stored_states: int = 0, bound: Optional[int] = None,
+                stats: Optional[SearchStats] = None):
+        """Cria o resultado.
+
+        Args:
+            reason: Motivo da interrupção (CANCELLED, TIME_LIMIT, NODE_LIMIT ou MEMORY_LIMIT)
+            elapsed: Tempo decorrido até a interrupção, em segundos
+            expanded_nodes: Nós expandidos até a interrupção
+            frontier_size: Estados na fronteira no momento da interrupção
+            stored_states: Estados guardados no momento da interrupção
+            bound: Limite atual da busca (f mínimo, profundidade, heurística ou limiar)
+            stats: Estatísticas detalhadas até a interrupção, se a busca as informar
+        """
+        result = super().__new__(cls, Solution(), elapsed, expanded_nodes, stats)
+        result.reason = reason
+        result.elapsed = elapsed
+        result.frontier_size = frontier_size
+        result.stored_states = stored_states
+        result.bound = bound
+        return result
+
+    def __getnewargs__(self):
+        # Permite enviar o resultado entre processos (pickle)
+        return (self.reason, self.elapsed, self.expanded_nodes, self.frontier_size, self.stored_states, self.bound,
+                self.stats)
+
+    def __repr__(self) -> str:
+        return (f"BudgetExceeded(reason={self.reason!r}, elapsed={self.elapsed:.4f}, "
+                f"expanded_nodes={self.expanded_nodes}, frontier_size={self.frontier_size}, "
+                f"stored_states={self.stored_states}, bound={self.bound})")
@@ -0,0 +1,140 @@
+"""
+Banco de distâncias exatas para o puzzle de 8 peças.
+
+Uma única busca em largura reversa a partir do objetivo, sobre a tabela de
+transições, fornece a distância ótima de todos os 181.440 estados solucionáveis.
+Cada distância é guardada em um nibble (dois estados por byte, cerca de 90 KB).
+
+Como as distâncias chegam a 31, o nibble armazena a distância módulo 16. Isso
+basta para descer o gradiente: vizinhos diferem sempre em exatamente um movimento,
+e (d - 1) mod 16 nunca coincide com (d + 1) mod 16. A distância absoluta é o
+comprimento do caminho obtido.
+
+Uso para gerar as tabelas antes do empacotamento:
+    python -m utils.distance_table
+"""
+import os
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+from utils.ranking import NUM_STATES, rank_board
+from utils.state import GOAL_BOARD, GOAL_BOARD_BLANK
+from utils.tables import atomic_write, table_path
+from utils.transition_table import load_transition_table
+
+DISTANCE_TABLE_FILE = "distances.bin"
+
+# Valor usado durante a construção para estados ainda não alcançados
+_UNSEEN = 0xFF
+
+
+def build_distances() -> np.ndarray:
+    """Calcula a distância ótima até o objetivo de cada estado (um byte por estado).
+
+    A busca é feita camada a camada: cada fronteira é um vetor de índices e a
+    próxima camada é obtida lendo as linhas correspondentes da tabela de transições.
+
+    Returns:
+        np.ndarray: Vetor uint8 [NUM_STATES] com as distâncias exatas
+    """
+    table = load_transition_table()
+    distances = np.full(NUM_STATES, _UNSEEN, dtype=np.uint8)
+    frontier = np.array([rank_board(GOAL_BOARD, GOAL_BOARD_BLANK)], dtype=np.int64)
+    distances[frontier] = 0
+    depth = 0
+
+    while frontier.size:
+        depth += 1
+        successors = table[frontier].ravel()
+        successors = successors[successors >= 0]
+        successors = np.unique(successors[distances[successors] == _UNSEEN])
+        distances[successors] = depth
+        frontier = successors
+
+    return distances
+
+
+def pack_nibbles(distances: np.ndarray) -> np.ndarray:
+    """Compacta as distâncias em nibbles (estado par no nibble baixo).
+
+    Args:
+        distances: Vetor de distâncias exatas
+
+    Returns:
+        np.ndarray: Vetor uint8 com NUM_STATES / 2 bytes
+    """
+    nibbles = (distances & 0x0F).astype(np.uint8)
+    return nibbles[0::2] | (nibbles[1::2] << 4)
+
+
+def save_distance_table(packed: np.ndarray, path: Optional[str] = None) -> str:
+    """Salva o banco de distâncias compactado em disco.
+
+    Args:
+        packed: Vetor gerado por pack_nibbles
+        path: Caminho de destino (padrão: tables/distances.bin)
+
+    Returns:
+        str: Caminho do arquivo salvo
+    """
+    path = path or table_path(DISTANCE_TABLE_FILE)
+    return atomic_write(path, packed.tofile)
+
+
+@lru_cache(maxsize=None)
+def load_distance_table() -> np.ndarray:
+    """Carrega o banco de distâncias mapeado em memória, construindo-o se necessário.
+
+    Returns:
+        np.ndarray: Vetor uint8 [NUM_STATES / 2] com as distâncias módulo 16
+    """
+    path = table_path(DISTANCE_TABLE_FILE)
+    if not os.path.exists(path):
+        save_distance_table(pack_nibbles(build_distances()), path)
+    return np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+
+
+def distance_mod16(packed: np.ndarray, rank: int) -> int:
+    """Lê a distância (módulo 16) de um estado no banco compactado.
+
+    Args:
+        packed: Banco de distâncias carregado por load_distance_table
+        rank: Índice compacto do estado
+
+    Returns:
+        int: Distância até o objetivo módulo 16
+    """
+    byte = int(packed[rank >> 1])
+    return (byte >> 4) if rank & 1 else (byte & 0x0F)
+
+
+def descend(rank: int) -> List[int]:
+    """Segue o gradiente de distâncias de um estado até o objetivo.
+
+    Args:
+        rank: Índice compacto do estado inicial (solucionável)
+
+    Returns:
+        List[int]: Índices dos estados do caminho ótimo, do inicial ao objetivo
+    """
+    table = load_transition_table()
+    packed = load_distance_table()
+    goal_rank = rank_board(GOAL_BOARD, GOAL_BOARD_BLANK)
+    path = [rank]
+
+    while rank != goal_rank:
+        target = (distance_mod16(packed, rank) - 1) & 0x0F
+        for neighbor in table[rank].tolist():
+            if neighbor >= 0 and distance_mod16(packed, neighbor) == target:
+                rank = neighbor
+                break
+        path.append(rank)
+
+    return path
+
+
+if __name__ == "__main__":
+    print(f"Tabela de transições: {load_transition_table().shape}")
+    print(f"Banco de distâncias: {load_distance_table().nbytes} bytes")
@@ -0,0 +1,333 @@
+"""
+Registro de heurísticas para as buscas informadas.
+
+Cada heurística é uma função que recebe um State e devolve um inteiro. As buscas
+resolvem a heurística pelo nome uma única vez (get_heuristic) e a avaliam sob
+demanda com State.heuristic_value, que guarda o resultado no próprio nó.
+Novas heurísticas são adicionadas com o decorador register_heuristic, sem
+alterar a classe State. Uma heurística registrada como não admissível (que pode
+superestimar a distância) não garante soluções ótimas, e as soluções das buscas
+que a usam não são guardadas no cache de soluções ótimas.
+
+Uma heurística pode ainda declarar uma atualização incremental com register_delta:
+dada a peça movida, a função devolve a variação do valor entre pai e filho, e
+State.get_neighbors a usa para derivar o valor dos vizinhos a partir do pai.
+Com register_batch, declara uma versão vetorizada que avalia de uma vez uma
+matriz de tabuleiros (usada pelo modo em lotes do A*).
+"""
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+from utils.pattern_database import get_pattern_database
+from utils.state import BoardGeometry, State, get_geometry
+
+Heuristic = Callable[[State], int]
+
+# Variação da heurística causada por um movimento:
+# (tabuleiro pai, tabuleiro filho, geometria, peça movida, célula de origem, célula de destino)
+HeuristicDelta = Callable[[int, int, BoardGeometry, int, int, int], int]
+
+# Avaliação vetorizada: (matriz (m, células) de peças, geometria) -> vetor com m valores
+HeuristicBatch = Callable[[np.ndarray, BoardGeometry], np.ndarray]
+
+# Heurísticas registradas, indexadas pelo nome usado na interface e nas buscas
+HEURISTICS: Dict[str, Heuristic] = {}
+
+# Heurística padrão das buscas informadas
+DEFAULT_HEURISTIC = "manhattan"
+
+
+def register_heuristic(name: str, admissible: bool = True) -> Callable[[Heuristic], Heuristic]:
+    """Decorador que registra uma função heurística com o nome informado.
+
+    Args:
+        name: Nome pelo qual a heurística será selecionada (ex: 'manhattan')
+        admissible: Se a heurística nunca superestima a distância até o objetivo
+            (disponível como atributo admissible da função)
+
+    Returns:
+        Callable: Decorador que registra e devolve a própria função
+    """
+    def decorator(fn: Heuristic) -> Heuristic:
+        fn.admissible = admissible
+        HEURISTICS[name] = fn
+        return fn
+    return decorator
+
+
+def register_delta(heuristic: Heuristic) -> Callable[[HeuristicDelta], HeuristicDelta]:
+    """Decorador que associa uma atualização incremental a uma heurística registrada.
+
+    A função decorada fica disponível como atributo delta da heurística e deve
+    devolver exatamente heuristic(filho) - heuristic(pai).
+
+    Args:
+        heuristic: Função heurística à qual a atualização se aplica
+
+    Returns:
+        Callable: Decorador que associa e devolve a própria função
+    """
+    def decorator(fn: HeuristicDelta) -> HeuristicDelta:
+        heuristic.delta = fn
+        return fn
+    return decorator
+
+
+def register_batch(heuristic: Heuristic) -> Callable[[HeuristicBatch], HeuristicBatch]:
+    """Decorador que associa uma avaliação vetorizada a uma heurística registrada.
+
+    A função decorada fica disponível como atributo batch da heurística e deve
+    devolver, para cada linha da matriz de peças, o mesmo valor da heurística.
+
+    Args:
+        heuristic: Função heurística à qual a avaliação se aplica
+
+    Returns:
+        Callable: Decorador que associa e devolve a própria função
+    """
+    def decorator(fn: HeuristicBatch) -> HeuristicBatch:
+        heuristic.batch = fn
+        return fn
+    return decorator
+
+
+def get_heuristic(name: str) -> Heuristic:
+    """Obtém a função heurística registrada com o nome informado.
+
+    Args:
+        name: Nome da heurística
+
+    Returns:
+        Heuristic: Função heurística correspondente
+
+    Raises:
+        ValueError: Se nenhuma heurística estiver registrada com esse nome
+    """
+    try:
+        return HEURISTICS[name]
+    except KeyError:
+        available = ", ".join(sorted(HEURISTICS))
+        raise ValueError(f"Heurística desconhecida: {name!r} (disponíveis: {available})") from None
+
+
+def is_admissible(name: str) -> bool:
+    """Se a heurística registrada com o nome informado é admissível.
+
+    Raises:
+        ValueError: Se nenhuma heurística estiver registrada com esse nome
+    """
+    return get_heuristic(name).admissible
+
+
+def admissible_call(arguments: Dict[str, Any]) -> bool:
+    """Predicado de cached_solver: a chamada usa uma heurística admissível.
+
+    Args:
+        arguments: Argumentos informados na chamada (o parâmetro heuristic omitido
+            é a heurística padrão)
+
+    Returns:
+        bool: Se a solução da busca ótima com essa heurística é ótima
+    """
+    return is_admissible(arguments.get("heuristic", DEFAULT_HEURISTIC))
+
+
+@lru_cache(maxsize=None)
+def manhattan_table(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Tabela de distâncias Manhattan pré-calculada, indexada por [peça][célula]."""
+    geometry = get_geometry(size)
+    goal_positions = geometry.goal_positions
+    return tuple(
+        tuple(
+            0 if value == 0 else
+            abs(goal_positions[value][0] - cell // size) + abs(goal_positions[value][1] - cell % size)
+            for cell in range(geometry.cells)
+        )
+        for value in range(geometry.cells)
+    )
+
+
+@lru_cache(maxsize=None)
+def euclidean_table(size: int) -> Tuple[Tuple[float, ...], ...]:
+    """Tabela de distâncias Euclidianas pré-calculada, indexada por [peça][célula]."""
+    geometry = get_geometry(size)
+    goal_positions = geometry.goal_positions
+    return tuple(
+        tuple(
+            0.0 if value == 0 else
+            math.sqrt((goal_positions[value][0] - cell // size) ** 2 + (goal_positions[value][1] - cell % size) ** 2)
+            for cell in range(geometry.cells)
+        )
+        for value in range(geometry.cells)
+    )
+
+
+@register_heuristic("manhattan")
+def manhattan(state: State) -> int:
+    """Calcula a heurística de distância Manhattan para o estado.
+
+    Returns:
+        int: Soma das distâncias Manhattan de cada peça até sua posição final
+    """
+    table = manhattan_table(state.geometry.size)
+    return sum(table[value][cell] for cell, value in enumerate(state.tiles()))
+
+
+@register_heuristic("manhattanPenality", admissible=False)
+def manhattan_penality(state: State) -> int:
+    """
+    Calcula a heurística de Manhattan com penalidade por conflitos lineares.
+
+    Não é admissível: cada par invertido soma 2, e três peças em conflito mútuo
+    na mesma linha custam menos que as 6 penalidades somadas (o tabuleiro
+    '087654321' tem valor 32, mas solução ótima de 28 movimentos).
+
+    Returns:
+        int: Valor heurístico (distância de Manhattan + penalidades)
+    """
+    size = state.geometry.size
+    goal_positions = state.geometry.goal_positions
+    tiles = state.tiles()
+    linear_conflict_penalty = 0
+
+    # Verifica conflitos lineares em linhas
+    for row in range(size):
+        current_row = tiles[row * size:(row + 1) * size]
+        for i in range(size):
+            for j in range(i + 1, size):
+                val_i = current_row[i]
+                val_j = current_row[j]
+                if val_i != 0 and val_j != 0:
+                    # Ambas as peças devem estar nesta mesma linha na meta
+                    goal_row_i, goal_col_i = goal_positions[val_i]
+                    goal_row_j, goal_col_j = goal_positions[val_j]
+                    if goal_row_i == row and goal_row_j == row:
+                        # Se estão invertidas em relação à posição final, há conflito
+                        if goal_col_i > goal_col_j:
+                            linear_conflict_penalty += 2
+
+    # Verifica conflitos lineares em colunas
+    for col in range(size):
+        current_col = tiles[col::size]
+        for i in range(size):
+            for j in range(i + 1, size):
+                val_i = current_col[i]
+                val_j = current_col[j]
+                if val_i != 0 and val_j != 0:
+                    goal_row_i, goal_col_i = goal_positions[val_i]
+                    goal_row_j, goal_col_j = goal_positions[val_j]
+                    if goal_col_i == col and goal_col_j == col:
+                        if goal_row_i > goal_row_j:
+                            linear_conflict_penalty += 2
+
+    return manhattan(state) + linear_conflict_penalty
+
+
+def _row_conflicts(board: int, geometry: BoardGeometry, row: int) -> int:
+    """Penalidade de conflitos lineares (2 por par invertido) em uma linha do tabuleiro."""
+    size = geometry.size
+    bits = geometry.bits
+    mask = geometry.tile_mask
+    goal_positions = geometry.goal_positions
+    goal_cols = []
+    for cell in range(row * size, (row + 1) * size):
+        value = (board >> (bits * cell)) & mask
+        if value != 0 and goal_positions[value][0] == row:
+            goal_cols.append(goal_positions[value][1])
+    return 2 * sum(
+        1
+        for i in range(len(goal_cols))
+        for j in range(i + 1, len(goal_cols))
+        if goal_cols[i] > goal_cols[j]
+    )
+
+
+def _column_conflicts(board: int, geometry: BoardGeometry, col: int) -> int:
+    """Penalidade de conflitos lineares (2 por par invertido) em uma coluna do tabuleiro."""
+    size = geometry.size
+    bits = geometry.bits
+    mask = geometry.tile_mask
+    goal_positions = geometry.goal_positions
+    goal_rows = []
+    for cell in range(col, geometry.cells, size):
+        value = (board >> (bits * cell)) & mask
+        if value != 0 and goal_positions[value][1] == col:
+            goal_rows.append(goal_positions[value][0])
+    return 2 * sum(
+        1
+        for i in range(len(goal_rows))
+        for j in range(i + 1, len(goal_rows))
+        if goal_rows[i] > goal_rows[j]
+    )
+
+
+@register_delta(manhattan)
+def manhattan_delta(parent_board: int, child_board: int, geometry: BoardGeometry,
+                    tile: int, from_cell: int, to_cell: int) -> int:
+    """Variação da distância Manhattan: apenas a peça movida muda de posição (±1)."""
+    table = manhattan_table(geometry.size)
+    return table[tile][to_cell] - table[tile][from_cell]
+
+
+@register_delta(manhattan_penality)
+def manhattan_penality_delta(parent_board: int, child_board: int, geometry: BoardGeometry,
+                             tile: int, from_cell: int, to_cell: int) -> int:
+    """Variação de Manhattan + conflitos lineares.
+
+    Um movimento horizontal mantém a ordem das peças na linha e altera apenas as
+    duas colunas envolvidas; um movimento vertical altera apenas as duas linhas.
+    """
+    size = geometry.size
+    change = manhattan_delta(parent_board, child_board, geometry, tile, from_cell, to_cell)
+    from_row, from_col = divmod(from_cell, size)
+    to_row, to_col = divmod(to_cell, size)
+
+    if from_row == to_row:
+        for col in (from_col, to_col):
+            change += _column_conflicts(child_board, geometry, col) - _column_conflicts(parent_board, geometry, col)
+    else:
+        for row in (from_row, to_row):
+            change += _row_conflicts(child_board, geometry, row) - _row_conflicts(parent_board, geometry, row)
+
+    return change
+
+
+@register_batch(manhattan)
+def manhattan_batch(tiles: np.ndarray, geometry: BoardGeometry) -> np.ndarray:
+    """Distância Manhattan de cada tabuleiro de uma matriz (m, células) de peças."""
+    table = np.asarray(manhattan_table(geometry.size), dtype=np.int64)
+    return table[tiles, np.arange(geometry.cells)].sum(axis=1)
+
+
+@register_heuristic("euclidean")
+def euclidean(state: State) -> int:
+    """Calcula a heurística de distância Euclidiana para o estado.
+
+    Returns:
+        int: Soma das distâncias Euclidianas de cada peça até sua posição final
+    """
+    table = euclidean_table(state.geometry.size)
+    euclidean_dist_sum = sum(table[value][cell] for cell, value in enumerate(state.tiles()))
+    return int(euclidean_dist_sum)  # Convertemos para inteiro
+
+
+@register_heuristic("pdb")
+def additive_pattern_database(state: State) -> int:
+    """Calcula a heurística de bancos de padrões aditivos e disjuntos.
+
+    Os bancos da dimensão do tabuleiro são carregados (ou construídos) no primeiro
+    uso; há partições padrão para 3x3 e 4x4.
+
+    Returns:
+        int: Soma das distâncias abstratas de cada grupo de peças
+    """
+    return get_pattern_database(state.geometry.size).value(state.tiles())
+
+
+@register_batch(additive_pattern_database)
+def additive_pattern_database_batch(tiles: np.ndarray, geometry: BoardGeometry) -> np.ndarray:
+    """Bancos de padrões aditivos de cada tabuleiro de uma matriz (m, células) de peças."""
+    return get_pattern_database(geometry.size).values(tiles)
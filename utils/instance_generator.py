@@ -0,0 +1,172 @@
+"""
+Gerador de instâncias aleatórias do puzzle, vetorizado e reprodutível.
+
+Dois modos de sorteio:
+
+- Uniforme entre os estados solucionáveis (random_tiles, random_ranks). No 3x3,
+  sorteia índices compactos (utils.ranking) e os converte com unrank_boards: cada
+  índice é um estado solucionável distinto, então não há rejeição. Nas outras
+  dimensões, sorteia permutações uniformes e, nas não solucionáveis, troca as
+  peças das duas primeiras células ocupadas. A troca inverte a paridade sem
+  mover o vazio e é uma bijeção entre permutações não solucionáveis e
+  solucionáveis, o que mantém o sorteio uniforme.
+- A uma distância ótima exata do objetivo (tiles_at_depth, ranks_at_depth),
+  apenas no 3x3: os índices ordenados pela distância exata (banco de distâncias)
+  formam um bloco contíguo por profundidade, e o sorteio é uniforme dentro do bloco.
+
+Todas as funções recebem uma semente (int) ou um np.random.Generator, de modo
+que a mesma semente gera sempre as mesmas instâncias.
+"""
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.distance_table import build_distances
+from utils.ranking import NUM_STATES, unrank_boards
+from utils.state import DEFAULT_SIZE, SIZE, State, get_geometry
+
+# Semente do sorteio: inteiro, gerador do NumPy ou None (entropia do sistema)
+Seed = Union[None, int, np.random.Generator]
+
+# Maior distância ótima entre um estado 3x3 solucionável e o objetivo
+MAX_DEPTH = 31
+
+
+def _generator(seed: Seed) -> np.random.Generator:
+    """Gerador do NumPy para a semente (um gerador informado é usado como está)."""
+    return np.random.default_rng(seed)
+
+
+@lru_cache(maxsize=None)
+def depth_index() -> Tuple[np.ndarray, np.ndarray]:
+    """Índice dos estados 3x3 por distância ótima, calculado uma vez por processo.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Índices compactos ordenados pela distância
+        (int32) e o início do bloco de cada profundidade (o bloco da profundidade d
+        vai de offsets[d] a offsets[d + 1])
+    """
+    distances = build_distances()
+    order = np.argsort(distances, kind="stable").astype(np.int32)
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(distances))))
+    return order, offsets
+
+
+def depth_counts() -> List[int]:
+    """Número de estados 3x3 em cada distância ótima (0 a MAX_DEPTH)."""
+    return np.diff(depth_index()[1]).tolist()
+
+
+def random_ranks(count: int, seed: Seed = None) -> np.ndarray:
+    """Sorteia índices compactos de estados 3x3 solucionáveis, uniformemente.
+
+    Args:
+        count: Número de índices
+        seed: Semente ou gerador do sorteio
+
+    Returns:
+        np.ndarray: Vetor int64 de índices no intervalo [0, NUM_STATES)
+    """
+    return _generator(seed).integers(0, NUM_STATES, count, dtype=np.int64)
+
+
+def ranks_at_depth(depth: int, count: int, seed: Seed = None, replace: bool = True) -> np.ndarray:
+    """Sorteia índices compactos de estados 3x3 a uma distância ótima exata do objetivo.
+
+    Args:
+        depth: Distância ótima (número de movimentos) até o objetivo
+        count: Número de índices
+        seed: Semente ou gerador do sorteio
+        replace: Se False, os índices são distintos
+
+    Returns:
+        np.ndarray: Vetor int64 de índices, uniformes entre os estados da profundidade
+
+    Raises:
+        ValueError: Se a profundidade não existir ou, sem reposição, se houver
+            menos estados que o pedido
+    """
+    if not 0 <= depth <= MAX_DEPTH:
+        raise ValueError(f"Profundidade fora do intervalo 0-{MAX_DEPTH}: {depth}")
+    order, offsets = depth_index()
+    start = int(offsets[depth])
+    available = int(offsets[depth + 1]) - start
+    if not replace and count > available:
+        raise ValueError(f"A profundidade {depth} tem apenas {available} estados (pedidos {count} distintos)")
+
+    generator = _generator(seed)
+    if replace:
+        positions = generator.integers(0, available, count)
+    else:
+        positions = generator.choice(available, count, replace=False)
+    return order[start + positions].astype(np.int64)
+
+
+def random_tiles(count: int, size: int = DEFAULT_SIZE, seed: Seed = None) -> np.ndarray:
+    """Sorteia tabuleiros solucionáveis, uniformemente, de qualquer dimensão.
+
+    Args:
+        count: Número de tabuleiros
+        size: Dimensão N do tabuleiro NxN
+        seed: Semente ou gerador do sorteio
+
+    Returns:
+        np.ndarray: Matriz (count, N²) int8 com as peças de cada tabuleiro em ordem de leitura
+    """
+    if size == SIZE:
+        return unrank_boards(random_ranks(count, seed))
+
+    cells = get_geometry(size).cells
+    tiles = _generator(seed).permuted(np.tile(np.arange(cells, dtype=np.int8), (count, 1)), axis=1)
+
+    # Paridade das inversões entre as peças (o vazio, 0, não conta)
+    inversions = np.zeros(count, dtype=np.int64)
+    for cell in range(cells - 1):
+        later = tiles[:, cell + 1:]
+        inversions += ((tiles[:, cell:cell + 1] > later) & (later != 0)).sum(axis=1)
+    blank = np.argmin(tiles, axis=1)
+    if size % 2 == 0:
+        # Largura par: a linha do vazio, contada a partir da última, entra na paridade
+        inversions += size - 1 - blank // size
+    unsolvable = np.flatnonzero(inversions % 2 == 1)
+
+    # Troca as peças das duas primeiras células ocupadas (o vazio pode estar na célula 0 ou 1)
+    first = np.where(blank[unsolvable] == 0, 1, 0)
+    second = np.where(blank[unsolvable] <= 1, 2, 1)
+    swapped = tiles[unsolvable, first]
+    tiles[unsolvable, first] = tiles[unsolvable, second]
+    tiles[unsolvable, second] = swapped
+    return tiles
+
+
+def tiles_at_depth(depth: int, count: int, seed: Seed = None, replace: bool = True) -> np.ndarray:
+    """Sorteia tabuleiros 3x3 a uma distância ótima exata do objetivo (ver ranks_at_depth).
+
+    Returns:
+        np.ndarray: Matriz (count, 9) int8 com as peças de cada tabuleiro em ordem de leitura
+    """
+    return unrank_boards(ranks_at_depth(depth, count, seed, replace))
+
+
+def random_state(size: int = DEFAULT_SIZE, depth: Optional[int] = None, seed: Seed = None) -> State:
+    """Sorteia um único estado solucionável (ex: o botão de embaralhar da interface).
+
+    Args:
+        size: Dimensão N do tabuleiro NxN
+        depth: Distância ótima exata até o objetivo (apenas 3x3; padrão: qualquer)
+        seed: Semente ou gerador do sorteio
+
+    Returns:
+        State: Estado sorteado
+
+    Raises:
+        ValueError: Se uma profundidade for pedida fora do 3x3 ou não existir
+    """
+    if depth is None:
+        tiles = random_tiles(1, size, seed)[0]
+    elif size != SIZE:
+        raise ValueError(f"Profundidade exata só é suportada no tabuleiro {SIZE}x{SIZE}")
+    else:
+        tiles = tiles_at_depth(depth, 1, seed)[0]
+    return State(tiles.reshape(size, size))
@@ -0,0 +1,216 @@
+"""
+Bancos de padrões (pattern databases) aditivos e disjuntos.
+
+As peças do tabuleiro são divididas em grupos disjuntos (ex: 6-6-3 no 4x4). Para
+cada grupo, uma busca em largura reversa sobre o estado abstrato — apenas as
+posições das peças do grupo — calcula o número mínimo de movimentos dessas peças
+até suas posições finais. No estado abstrato o espaço vazio é ignorado: uma peça
+do grupo pode se mover para qualquer célula vizinha não ocupada por outra peça do
+grupo. Como cada movimento real desloca uma única peça, a soma dos valores dos
+grupos é uma heurística admissível.
+
+Cada banco é um vetor uint8 indexado pelo rank da permutação parcial das posições
+do grupo, salvo em tables/ e mapeado em memória na carga.
+
+Uso para gerar os bancos do tabuleiro padrão:
+    python -m utils.pattern_database [tamanho]
+"""
+import os
+import sys
+from functools import lru_cache
+from math import factorial
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.tables import atomic_write, table_path
+
+# Partições padrão das peças por dimensão do tabuleiro
+DEFAULT_PARTITIONS: Dict[int, Tuple[Tuple[int, ...], ...]] = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+}
+
+# Valor usado durante a construção para estados abstratos ainda não alcançados
+_UNSEEN = 0xFF
+
+
+def _rank_weights(cells: int, pattern_size: int) -> Tuple[int, ...]:
+    """Pesos de cada posição no rank de uma permutação parcial de tamanho pattern_size."""
+    return tuple(
+        factorial(cells - 1 - i) // factorial(cells - pattern_size)
+        for i in range(pattern_size)
+    )
+
+
+def database_size(cells: int, pattern_size: int) -> int:
+    """Número de colocações distintas de pattern_size peças em cells células."""
+    return factorial(cells) // factorial(cells - pattern_size)
+
+
+def rank_positions(positions: Sequence[int], weights: Sequence[int]) -> int:
+    """Calcula o rank de uma permutação parcial (posições distintas das peças do grupo).
+
+    Args:
+        positions: Célula ocupada por cada peça do grupo
+        weights: Pesos obtidos de _rank_weights
+
+    Returns:
+        int: Índice no banco de padrões
+    """
+    rank = 0
+    for i, position in enumerate(positions):
+        smaller = 0
+        for j in range(i):
+            if positions[j] < position:
+                smaller += 1
+        rank += (position - smaller) * weights[i]
+    return rank
+
+
+def rank_positions_array(positions: np.ndarray, weights: Sequence[int]) -> np.ndarray:
+    """Versão vetorizada de rank_positions para uma matriz (m, tamanho do grupo)."""
+    rank = np.zeros(positions.shape[0], dtype=np.int64)
+    for i in range(positions.shape[1]):
+        smaller = (positions[:, :i] < positions[:, i:i + 1]).sum(axis=1)
+        rank += (positions[:, i] - smaller) * weights[i]
+    return rank
+
+
+def build_pattern_database(pattern: Sequence[int], size: int) -> np.ndarray:
+    """Constrói o banco de padrões de um grupo por busca em largura reversa.
+
+    Args:
+        pattern: Peças do grupo
+        size: Dimensão do tabuleiro
+
+    Returns:
+        np.ndarray: Vetor uint8 com a distância abstrata de cada colocação do grupo
+    """
+    cells = size * size
+    pattern_size = len(pattern)
+    weights = _rank_weights(cells, pattern_size)
+    distances = np.full(database_size(cells, pattern_size), _UNSEEN, dtype=np.uint8)
+
+    # Posições finais das peças do grupo (objetivo: 1..n-1 em ordem de leitura, vazio no fim)
+    frontier = np.array([[tile - 1 for tile in pattern]], dtype=np.int16)
+    distances[rank_positions_array(frontier, weights)] = 0
+    depth = 0
+
+    while frontier.size:
+        depth += 1
+        candidates = []
+        rows = frontier // size
+        cols = frontier % size
+        for i in range(pattern_size):
+            for delta, valid in (
+                (-size, rows[:, i] > 0),
+                (size, rows[:, i] < size - 1),
+                (-1, cols[:, i] > 0),
+                (1, cols[:, i] < size - 1),
+            ):
+                moved = frontier[valid].copy()
+                moved[:, i] += delta
+                # A célula de destino não pode estar ocupada por outra peça do grupo
+                free = (moved == moved[:, i:i + 1]).sum(axis=1) == 1
+                candidates.append(moved[free])
+
+        moved = np.concatenate(candidates)
+        ranks = rank_positions_array(moved, weights)
+        new = distances[ranks] == _UNSEEN
+        ranks, first = np.unique(ranks[new], return_index=True)
+        distances[ranks] = depth
+        frontier = moved[new][first]
+
+    return distances
+
+
+def database_filename(pattern: Sequence[int], size: int) -> str:
+    """Nome do arquivo em que o banco de um grupo é armazenado."""
+    return f"pdb_{size}x{size}_{'-'.join(str(tile) for tile in pattern)}.bin"
+
+
+@lru_cache(maxsize=None)
+def load_pattern_database(pattern: Tuple[int, ...], size: int) -> np.ndarray:
+    """Carrega o banco de um grupo mapeado em memória, construindo-o se necessário.
+
+    Args:
+        pattern: Peças do grupo
+        size: Dimensão do tabuleiro
+
+    Returns:
+        np.ndarray: Vetor uint8 com as distâncias abstratas
+    """
+    path = table_path(database_filename(pattern, size))
+    if not os.path.exists(path):
+        atomic_write(path, build_pattern_database(pattern, size).tofile)
+    return np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+
+
+class AdditivePatternDatabase:
+    """Conjunto de bancos de padrões disjuntos cuja soma é uma heurística admissível."""
+
+    def __init__(self, size: int, partition: Optional[Sequence[Sequence[int]]] = None):
+        """Carrega (ou constrói) os bancos de todos os grupos da partição.
+
+        Args:
+            size: Dimensão do tabuleiro
+            partition: Grupos disjuntos de peças (padrão: DEFAULT_PARTITIONS[size])
+
+        Raises:
+            ValueError: Se não houver partição informada nem padrão para a dimensão
+        """
+        if partition is None and size not in DEFAULT_PARTITIONS:
+            raise ValueError(f"Não há partição padrão de bancos de padrões para o tabuleiro {size}x{size}")
+        self.size = size
+        self.partition = tuple(tuple(group) for group in (partition or DEFAULT_PARTITIONS[size]))
+        cells = size * size
+        self.groups: List[Tuple[Tuple[int, ...], Tuple[int, ...], np.ndarray]] = [
+            (group, _rank_weights(cells, len(group)), load_pattern_database(group, size))
+            for group in self.partition
+        ]
+
+    def value(self, tiles: Sequence[int]) -> int:
+        """Calcula a soma dos bancos para um tabuleiro.
+
+        Args:
+            tiles: Peças do tabuleiro em ordem de leitura
+
+        Returns:
+            int: Valor heurístico
+        """
+        positions = [0] * len(tiles)
+        for cell, tile in enumerate(tiles):
+            positions[tile] = cell
+        total = 0
+        for group, weights, database in self.groups:
+            total += int(database[rank_positions([positions[tile] for tile in group], weights)])
+        return total
+
+    def values(self, tiles: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de value para uma matriz (m, células) de tabuleiros.
+
+        Args:
+            tiles: Peças de cada tabuleiro em ordem de leitura
+
+        Returns:
+            np.ndarray: Vetor int64 com o valor heurístico de cada tabuleiro
+        """
+        # Cada linha é uma permutação: argsort devolve a célula ocupada por cada peça
+        positions = np.argsort(tiles, axis=1)
+        total = np.zeros(tiles.shape[0], dtype=np.int64)
+        for group, weights, database in self.groups:
+            total += database[rank_positions_array(positions[:, list(group)], weights)]
+        return total
+
+
+@lru_cache(maxsize=None)
+def get_pattern_database(size: int) -> AdditivePatternDatabase:
+    """Retorna o conjunto de bancos padrão para a dimensão informada (carregado uma vez)."""
+    return AdditivePatternDatabase(size)
+
+
+if __name__ == "__main__":
+    board_size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for group, _, database in get_pattern_database(board_size).groups:
+        print(f"Grupo {group}: {database.nbytes} bytes, distância máxima {int(database.max())}")
@@ -1,5 +1,5 @@
 import heapq
-from typing import Deque, Dict, Optional, Set, Tuple
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
 class PriorityQueue:
     """Implementação de fila de prioridade com suporte a atualização de prioridade."""
@@ -8,9 +8,14 @@ class PriorityQueue:
         self.elements = []
         self.entry_finder = {}  # Mapeamento de item -> entrada
         self.counter = 0  # Contador único para desempate
+        self.stale_pops = 0  # Entradas removidas descartadas por pop
     
-    def push(self, item, priority):
-        """Adiciona um novo item ou atualiza a prioridade de um item existente."""
+    def push(self, item, priority, depth=0):
+        """Adiciona um novo item ou atualiza a prioridade de um item existente.
+
+        O parâmetro depth existe apenas por compatibilidade com BucketPriorityQueue
+        e é ignorado (o desempate é pela ordem de inserção).
+        """
         if item in self.entry_finder:
             self.remove(item)  # Remove a entrada anterior se existir
         
@@ -32,8 +37,126 @@ class PriorityQueue:
             if item is not None:  # Ignora itens removidos
                 del self.entry_finder[item]
                 return priority, item
+            self.stale_pops += 1
         raise KeyError('pop de uma fila vazia')
     
     def empty(self):
         """Retorna True se a fila estiver vazia."""
-        return not self.entry_finder
\ No newline at end of file
+        return not self.entry_finder
+
+    def __len__(self):
+        """Número de itens na fila (sem as entradas removidas)."""
+        return len(self.entry_finder)
+
+    def __iter__(self):
+        """Itera sobre os itens na fila, sem ordem definida."""
+        return iter(self.entry_finder)
+
+class BucketPriorityQueue:
+    """Fila de prioridade por baldes para prioridades inteiras pequenas e não negativas.
+
+    Cada prioridade tem um balde, subdividido por profundidade (custo g). A remoção
+    devolve um item de menor prioridade e, entre eles, o de maior profundidade —
+    no A* isso favorece os nós mais próximos do objetivo entre os de mesmo f.
+    Inserção e remoção custam O(1) amortizado. Como em PriorityQueue, atualizações
+    de prioridade deixam entradas obsoletas, descartadas na remoção.
+    """
+
+    def __init__(self):
+        self.buckets: List[List[list]] = []  # buckets[prioridade][profundidade] -> entradas
+        self.top_depth: List[int] = []  # Maior profundidade possivelmente não vazia de cada balde
+        self.entry_finder = {}  # Mapeamento de item -> entrada
+        self.min_priority = 0  # Nenhum balde abaixo deste índice contém entradas válidas
+        self.stale_pops = 0  # Entradas removidas descartadas por pop
+
+    def push(self, item, priority, depth=0):
+        """Adiciona um novo item ou atualiza a prioridade de um item existente.
+
+        Args:
+            item: Item a inserir
+            priority: Prioridade inteira não negativa
+            depth: Profundidade inteira não negativa usada no desempate (maior primeiro)
+        """
+        if item in self.entry_finder:
+            self.remove(item)  # Remove a entrada anterior se existir
+
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+            self.top_depth.append(-1)
+        levels = buckets[priority]
+        while len(levels) <= depth:
+            levels.append([])
+
+        entry = [priority, item]
+        self.entry_finder[item] = entry
+        levels[depth].append(entry)
+        if depth > self.top_depth[priority]:
+            self.top_depth[priority] = depth
+        if priority < self.min_priority:
+            self.min_priority = priority
+
+    def remove(self, item):
+        """Remove um item da fila (marca como removido)."""
+        entry = self.entry_finder.pop(item)
+        entry[1] = None  # Marca como removido
+
+    def pop(self):
+        """Remove e retorna o item com menor prioridade (e maior profundidade). Levanta KeyError se vazio."""
+        buckets = self.buckets
+        top_depth = self.top_depth
+        while self.entry_finder:
+            priority = self.min_priority
+            levels = buckets[priority]
+            depth = top_depth[priority]
+            while depth >= 0 and not levels[depth]:
+                depth -= 1
+            top_depth[priority] = depth
+            if depth < 0:
+                # Balde esgotado: avança para a próxima prioridade
+                self.min_priority += 1
+                continue
+            _, item = levels[depth].pop()
+            if item is not None:  # Ignora itens removidos
+                del self.entry_finder[item]
+                return priority, item
+            self.stale_pops += 1
+        raise KeyError('pop de uma fila vazia')
+
+    def empty(self):
+        """Retorna True se a fila estiver vazia."""
+        return not self.entry_finder
+
+    def __len__(self):
+        """Número de itens na fila (sem as entradas removidas)."""
+        return len(self.entry_finder)
+
+    def __iter__(self):
+        """Itera sobre os itens na fila, sem ordem definida."""
+        return iter(self.entry_finder)
+
+
+# Implementações de fila selecionáveis pelas buscas informadas
+PRIORITY_QUEUES = {
+    "heap": PriorityQueue,
+    "bucket": BucketPriorityQueue,
+}
+
+
+def make_priority_queue(name: str):
+    """Cria uma fila de prioridade vazia da implementação informada.
+
+    Args:
+        name: Nome da implementação ('heap' ou 'bucket')
+
+    Returns:
+        PriorityQueue | BucketPriorityQueue: Fila vazia
+
+    Raises:
+        ValueError: Se nenhuma implementação estiver registrada com esse nome
+    """
+    try:
+        return PRIORITY_QUEUES[name]()
+    except KeyError:
+        available = ", ".join(sorted(PRIORITY_QUEUES))
+        raise ValueError(f"Fila de prioridade desconhecida: {name!r} (disponíveis: {available})") from None
@@ -0,0 +1,160 @@
+"""
+Eventos de progresso das buscas em fluxo.
+
+As buscas em fluxo (funções *_stream) são geradores: a cada intervalo de nós
+expandidos produzem um SearchProgress com o estado da busca, e o último evento
+(done=True) traz o caminho da solução. As funções bloqueantes de cada algoritmo
+consomem o mesmo gerador sem eventos intermediários (interval=None).
+
+Se a busca receber um orçamento (ver utils.budget) e exceder algum limite, o
+evento final não tem caminho e traz o BudgetExceeded em exceeded.
+"""
+import sys
+import time
+from typing import Iterator, Optional
+
+from utils.budget import BudgetExceeded, SearchBudget, first_check
+from utils.search_stats import SearchResult, SearchStats
+from utils.solution import Solution
+
+# Nós expandidos entre dois eventos de progresso (padrão das buscas em fluxo)
+DEFAULT_PROGRESS_INTERVAL = 10_000
+
+# Limite de nós que nunca é alcançado (nenhum evento intermediário)
+_NEVER = sys.maxsize
+
+
+class SearchProgress:
+    """Evento de progresso (ou, com done=True, resultado final) de uma busca em fluxo."""
+
+    __slots__ = ("expanded_nodes", "frontier_size", "bound", "elapsed", "path", "done", "exceeded",
+                 "suboptimality", "stats")
+
+    def __init__(self, expanded_nodes: int, frontier_size: int, bound: Optional[int], elapsed: float,
+                 path: Optional[Solution] = None, done: bool = False,
+                 exceeded: Optional[BudgetExceeded] = None, suboptimality: Optional[float] = None,
+                 stats: Optional[SearchStats] = None):
+        """Cria um evento.
+
+        Args:
+            expanded_nodes: Estados expandidos até o momento
+            frontier_size: Número de estados na fronteira (fila ou lista aberta)
+            bound: Limite atual da busca: f mínimo (A*), limiar (IDA*),
+                profundidade (busca em largura) ou heurística (busca gulosa)
+            elapsed: Tempo decorrido desde o início da busca, em segundos
+            path: Caminho da solução no evento final (vazio se não houver solução); nas
+                buscas anytime, também nos eventos intermediários de cada solução encontrada
+            done: Se este é o evento final
+            exceeded: No evento final, o resultado parcial se a busca excedeu o orçamento
+            suboptimality: Com um caminho, o limite provado para a razão entre o custo
+                do caminho e o custo ótimo (1.0 para soluções ótimas), se a busca o calcular
+                (None sem limite provado, como com uma heurística não admissível)
+            stats: No evento final, as estatísticas detalhadas da busca
+        """
+        self.expanded_nodes = expanded_nodes
+        self.frontier_size = frontier_size
+        self.bound = bound
+        self.elapsed = elapsed
+        self.path = path
+        self.done = done
+        self.exceeded = exceeded
+        self.suboptimality = suboptimality
+        self.stats = stats
+
+    @property
+    def nodes_per_sec(self) -> float:
+        """Vazão média da busca até este evento."""
+        return self.expanded_nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def set_stats(self, stats: SearchStats) -> "SearchProgress":
+        """Anexa as estatísticas ao evento (e ao BudgetExceeded, se houver) e devolve o evento."""
+        self.stats = stats
+        if self.exceeded is not None:
+            self.exceeded.stats = stats
+        return self
+
+    def result(self) -> SearchResult:
+        """Resultado no formato das funções bloqueantes (caminho, tempo, nós expandidos).
+
+        Se a busca excedeu o orçamento, devolve o BudgetExceeded (também um SearchResult).
+        """
+        if self.exceeded is not None:
+            return self.exceeded
+        return SearchResult(self.path if self.path is not None else Solution(), self.elapsed,
+                            self.expanded_nodes, self.stats)
+
+    def __repr__(self) -> str:
+        return (f"SearchProgress(expanded_nodes={self.expanded_nodes}, frontier_size={self.frontier_size}, "
+                f"bound={self.bound}, elapsed={self.elapsed:.4f}, done={self.done}, "
+                f"exceeded={self.exceeded and self.exceeded.reason!r})")
+
+
+class SearchMonitor:
+    """Eventos de progresso e verificações de orçamento de uma busca em fluxo.
+
+    A busca compara seus nós expandidos com next_event (uma comparação de
+    inteiros por nó) e só chama checkpoint quando o valor é alcançado.
+    """
+
+    __slots__ = ("start_time", "interval", "budget", "next_report", "next_check", "next_event")
+
+    def __init__(self, start_time: float, interval: Optional[int], budget: Optional[SearchBudget] = None):
+        """Cria o monitor.
+
+        Args:
+            start_time: Instante de início da busca (time.perf_counter)
+            interval: Nós expandidos entre eventos (None ou 0 para nenhum evento intermediário)
+            budget: Orçamento da busca (None para nenhum limite)
+        """
+        self.start_time = start_time
+        self.interval = interval
+        self.budget = budget
+        self.next_report = interval if interval else _NEVER
+        self.next_check = first_check(budget)
+        self.next_event = min(self.next_report, self.next_check)
+
+    def checkpoint(self, expanded_nodes: int, frontier_size: int, bound: Optional[int],
+                   stored_states: int) -> Optional[SearchProgress]:
+        """Verifica o orçamento e o intervalo de progresso.
+
+        Args:
+            expanded_nodes: Nós expandidos até o momento
+            frontier_size: Estados na fronteira
+            bound: Limite atual da busca
+            stored_states: Estados guardados pela busca (para a estimativa de memória)
+
+        Returns:
+            Optional[SearchProgress]: Evento a produzir: final (com exceeded) se o
+            orçamento foi excedido, de progresso se o intervalo foi atingido, ou None
+        """
+        budget = self.budget
+        if budget is not None and expanded_nodes >= self.next_check:
+            reason = budget.exceeded(self.start_time, expanded_nodes, stored_states)
+            if reason is not None:
+                elapsed = time.perf_counter() - self.start_time
+                exceeded = BudgetExceeded(reason, elapsed, expanded_nodes, frontier_size, stored_states, bound)
+                return SearchProgress(expanded_nodes, frontier_size, bound, elapsed, Solution(), done=True,
+                                      exceeded=exceeded)
+            self.next_check = budget.next_check(expanded_nodes)
+
+        event = None
+        if expanded_nodes >= self.next_report:
+            self.next_report = expanded_nodes + self.interval
+            event = SearchProgress(expanded_nodes, frontier_size, bound, time.perf_counter() - self.start_time)
+        self.next_event = min(self.next_report, self.next_check)
+        return event
+
+
+def run_to_completion(events: Iterator[SearchProgress]) -> SearchResult:
+    """Consome uma busca em fluxo e devolve o resultado do evento final.
+
+    Args:
+        events: Gerador de eventos de uma busca em fluxo
+
+    Returns:
+        SearchResult: Caminho da solução, tempo de execução, estados expandidos e estatísticas
+    """
+    event = None
+    for event in events:
+        pass
+    return event.result()
@@ -0,0 +1,177 @@
+"""
+Ranqueamento de permutações (código de Lehmer) para indexar estados do puzzle.
+
+Além do rank/unrank de permutações genéricas, o módulo define um índice compacto
+para os estados solucionáveis do tabuleiro:
+
+    rank = célula_do_vazio * (8! / 2) + rank_lehmer(peças sem o vazio) // 2
+
+Para uma posição fixa do espaço vazio, apenas metade das permutações das peças é
+solucionável (a paridade é fixa). Os dois últimos dígitos do código de Lehmer
+diferem apenas na paridade, então descartar o bit menos significativo gera uma
+bijeção entre os 181.440 estados alcançáveis e o intervalo [0, 181440).
+"""
+from math import factorial
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from utils.state import BITS, CELLS, TILE_MASK, pack_tiles
+
+# Número de peças (sem o espaço vazio) e tamanho de cada bloco de posições do vazio
+TILES = CELLS - 1
+HALF_PERMUTATIONS = factorial(TILES) // 2
+
+# Número total de estados solucionáveis (alcançáveis a partir do objetivo)
+NUM_STATES = CELLS * HALF_PERMUTATIONS
+
+# Pesos fatoriais de cada dígito do código de Lehmer das peças
+_WEIGHTS = tuple(factorial(TILES - 1 - i) for i in range(TILES))
+
+
+def rank_permutation(perm: Sequence[int]) -> int:
+    """Calcula o rank lexicográfico (código de Lehmer) de uma permutação de 0..n-1.
+
+    Args:
+        perm: Permutação dos inteiros 0..n-1
+
+    Returns:
+        int: Rank no intervalo [0, n!)
+    """
+    n = len(perm)
+    rank = 0
+    for i in range(n):
+        smaller = 0
+        value = perm[i]
+        for j in range(i + 1, n):
+            if perm[j] < value:
+                smaller += 1
+        rank += smaller * factorial(n - 1 - i)
+    return rank
+
+
+def unrank_permutation(rank: int, n: int) -> List[int]:
+    """Reconstrói a permutação de 0..n-1 com o rank lexicográfico informado.
+
+    Args:
+        rank: Rank no intervalo [0, n!)
+        n: Tamanho da permutação
+
+    Returns:
+        List[int]: Permutação correspondente
+    """
+    available = list(range(n))
+    perm = []
+    for i in range(n):
+        digit, rank = divmod(rank, factorial(n - 1 - i))
+        perm.append(available.pop(digit))
+    return perm
+
+
+def rank_board(board: int, blank: int) -> int:
+    """Calcula o índice compacto de um tabuleiro empacotado solucionável.
+
+    Args:
+        board: Tabuleiro empacotado (4 bits por peça)
+        blank: Célula ocupada pelo espaço vazio
+
+    Returns:
+        int: Índice no intervalo [0, NUM_STATES)
+    """
+    tiles = [
+        ((board >> (BITS * cell)) & TILE_MASK) - 1
+        for cell in range(CELLS) if cell != blank
+    ]
+    rank = 0
+    for i in range(TILES - 2):
+        value = tiles[i]
+        smaller = 0
+        for j in range(i + 1, TILES):
+            if tiles[j] < value:
+                smaller += 1
+        rank += smaller * _WEIGHTS[i]
+    # O penúltimo dígito (peso 1) é determinado pela paridade e é descartado
+    return blank * HALF_PERMUTATIONS + rank // 2
+
+
+def unrank_board(rank: int) -> Tuple[int, int]:
+    """Reconstrói o tabuleiro empacotado a partir do índice compacto.
+
+    Args:
+        rank: Índice no intervalo [0, NUM_STATES)
+
+    Returns:
+        Tuple[int, int]: Tabuleiro empacotado e célula do espaço vazio
+    """
+    blank, rank = divmod(rank, HALF_PERMUTATIONS)
+    rank *= 2
+    available = list(range(1, CELLS))
+    tiles = []
+    parity = 0
+    for i in range(TILES - 2):
+        digit, rank = divmod(rank, _WEIGHTS[i])
+        parity ^= digit & 1
+        tiles.append(available.pop(digit))
+    # Escolhe a ordem das duas últimas peças que mantém a paridade par (solucionável)
+    if parity:
+        available.reverse()
+    tiles.extend(available)
+    tiles.insert(blank, 0)
+    return pack_tiles(tiles), blank
+
+
+def rank_boards(tiles: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de rank_board para uma matriz de tabuleiros.
+
+    Args:
+        tiles: Matriz (m, CELLS) com as peças de cada tabuleiro em ordem de leitura
+
+    Returns:
+        np.ndarray: Vetor int64 com os índices compactos
+    """
+    tiles = np.asarray(tiles)
+    count = tiles.shape[0]
+    blank = np.argmin(tiles, axis=1)
+    without_blank = tiles[tiles != 0].reshape(count, TILES)
+    rank = np.zeros(count, dtype=np.int64)
+    for i in range(TILES - 2):
+        smaller = (without_blank[:, i + 1:] < without_blank[:, i:i + 1]).sum(axis=1)
+        rank += smaller * _WEIGHTS[i]
+    return blank * HALF_PERMUTATIONS + rank // 2
+
+
+def unrank_boards(ranks: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de unrank_board.
+
+    Args:
+        ranks: Vetor de índices compactos
+
+    Returns:
+        np.ndarray: Matriz (m, CELLS) int8 com as peças de cada tabuleiro
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    count = ranks.shape[0]
+    blank, rank = np.divmod(ranks, HALF_PERMUTATIONS)
+    rank = rank * 2
+    available = np.ones((count, TILES), dtype=bool)
+    without_blank = np.empty((count, TILES), dtype=np.int8)
+    parity = np.zeros(count, dtype=np.int64)
+    rows = np.arange(count)
+    for i in range(TILES):
+        if i < TILES - 2:
+            digit, rank = np.divmod(rank, _WEIGHTS[i])
+            parity ^= digit & 1
+        elif i == TILES - 2:
+            digit = parity
+        else:
+            digit = np.zeros(count, dtype=np.int64)
+        # Seleciona o digit-ésimo valor ainda disponível em cada linha
+        chosen = np.argmax(np.cumsum(available, axis=1) > digit[:, None], axis=1)
+        available[rows, chosen] = False
+        without_blank[:, i] = chosen + 1
+
+    cells = np.arange(CELLS)
+    source = cells[None, :] - (cells[None, :] > blank[:, None])
+    tiles = np.take_along_axis(without_blank, np.clip(source, 0, TILES - 1), axis=1)
+    tiles[cells[None, :] == blank[:, None]] = 0
+    return tiles
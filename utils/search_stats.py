@@ -0,0 +1,243 @@
+"""
+Resultado estruturado das buscas: caminho, tempo e estatísticas detalhadas.
+
+Todas as buscas devolvem um SearchResult, que continua sendo a tupla
+(caminho, tempo, nós) usada desde sempre — o terceiro elemento mantém a
+contagem histórica de estados novos ou melhorados —, com um SearchStats no
+atributo stats. Os contadores são variáveis locais do laço de cada busca,
+copiadas para o SearchStats apenas no fim; a divisão do tempo entre as fases
+(heurística, geração de sucessores e fila) exige medições a cada nó e só é
+feita quando pedida (parâmetro phase_timing das buscas que a suportam).
+"""
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.solution import Solution
+
+# Campos de contagem e de tempo por fase, na ordem de exibição
+COUNTER_FIELDS = ("expanded", "generated", "duplicates", "reopened", "stale_pops", "peak_open", "peak_closed")
+PHASE_FIELDS = ("heuristic_time", "successor_time", "queue_time")
+
+
+class SearchStats:
+    """Contadores de uma busca e, opcionalmente, o tempo gasto em cada fase."""
+
+    __slots__ = COUNTER_FIELDS + PHASE_FIELDS + ("extra",)
+
+    def __init__(self, expanded: int = 0, generated: int = 0, duplicates: int = 0, reopened: int = 0,
+                 stale_pops: int = 0, peak_open: int = 0, peak_closed: int = 0,
+                 heuristic_time: Optional[float] = None, successor_time: Optional[float] = None,
+                 queue_time: Optional[float] = None, extra: Optional[Dict[str, Any]] = None):
+        """Cria as estatísticas.
+
+        Args:
+            expanded: Estados retirados da fronteira e expandidos
+            generated: Sucessores gerados
+            duplicates: Sucessores descartados por já terem sido alcançados sem melhora de custo
+            reopened: Sucessores já alcançados cujo custo melhorou (reinseridos na fronteira)
+            stale_pops: Entradas obsoletas descartadas ao retirar da fronteira
+            peak_open: Maior tamanho da fronteira
+            peak_closed: Estados alcançados fora da fronteira, no fim da busca (só
+                diminuem com reaberturas, então é também o maior valor na prática)
+            heuristic_time: Segundos avaliando a heurística (None se não medido)
+            successor_time: Segundos gerando sucessores, incluindo as atualizações
+                incrementais da heurística (None se não medido)
+            queue_time: Segundos em operações da fronteira (None se não medido)
+            extra: Estatísticas específicas de cada busca (ex: iterações do IDA*)
+        """
+        self.expanded = expanded
+        self.generated = generated
+        self.duplicates = duplicates
+        self.reopened = reopened
+        self.stale_pops = stale_pops
+        self.peak_open = peak_open
+        self.peak_closed = peak_closed
+        self.heuristic_time = heuristic_time
+        self.successor_time = successor_time
+        self.queue_time = queue_time
+        self.extra = extra if extra is not None else {}
+
+    @property
+    def phase_timing(self) -> bool:
+        """Se o tempo por fase foi medido."""
+        return self.queue_time is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Estatísticas em um dicionário (para JSON); as fases só aparecem se medidas."""
+        data = {name: getattr(self, name) for name in COUNTER_FIELDS}
+        if self.phase_timing:
+            data.update((name, getattr(self, name)) for name in PHASE_FIELDS)
+        data.update(self.extra)
+        return data
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.to_dict().items())
+        return f"SearchStats({fields})"
+
+
+class SearchResult(tuple):
+    """Resultado de uma busca: a tupla (caminho, tempo, nós) com as estatísticas em stats.
+
+    O terceiro elemento é a contagem histórica das buscas (estados novos ou com
+    custo melhorado, isto é, generated - duplicates); stats.expanded conta as
+    expansões propriamente ditas.
+    """
+
+    def __new__(cls, path: Solution, exec_time: float, expanded_nodes: int,
+                stats: Optional[SearchStats] = None):
+        """Cria o resultado.
+
+        Args:
+            path: Solução (ver utils.solution; vazia se não houver)
+            exec_time: Tempo de execução em segundos
+            expanded_nodes: Contagem histórica de nós (ver a descrição da classe)
+            stats: Estatísticas detalhadas (padrão: todas zeradas)
+        """
+        result = super().__new__(cls, (path, exec_time, expanded_nodes))
+        result.stats = stats if stats is not None else SearchStats()
+        return result
+
+    @property
+    def path(self) -> Solution:
+        return self[0]
+
+    @property
+    def exec_time(self) -> float:
+        return self[1]
+
+    @property
+    def expanded_nodes(self) -> int:
+        return self[2]
+
+    def __getnewargs__(self):
+        # Permite enviar o resultado entre processos (pickle)
+        return (self[0], self[1], self[2], self.stats)
+
+    def __repr__(self) -> str:
+        return (f"SearchResult(path_length={max(len(self[0]) - 1, 0)}, exec_time={self[1]:.4f}, "
+                f"expanded_nodes={self[2]}, stats={self.stats!r})")
+
+
+def counted_stats(expanded: int, generated: int, kept: int, reopened: int = 0, stale_pops: int = 0,
+                  peak_open: int = 0, stored: int = 0, open_size: int = 0,
+                  timer: Optional["PhaseTimer"] = None, **extra) -> SearchStats:
+    """Monta as estatísticas a partir dos contadores locais de uma busca.
+
+    Args:
+        expanded: Estados expandidos
+        generated: Sucessores gerados
+        kept: Sucessores novos ou com custo melhorado (a contagem histórica das buscas);
+            os demais gerados são duplicatas
+        reopened: Sucessores já alcançados cujo custo melhorou
+        stale_pops: Entradas obsoletas descartadas pela fronteira
+        peak_open: Maior tamanho da fronteira
+        stored: Estados guardados pela busca no fim (fronteira e fechados)
+        open_size: Tamanho da fronteira no fim
+        timer: Tempos por fase, se medidos
+        **extra: Estatísticas específicas da busca
+
+    Returns:
+        SearchStats: Estatísticas da busca
+    """
+    stats = SearchStats(expanded, generated, generated - kept, reopened, stale_pops, peak_open,
+                        max(stored - open_size, 0), extra=extra)
+    if timer is not None:
+        timer.fill(stats)
+    return stats
+
+
+def empty_result(exec_time: float, expanded_nodes: int = 0, stats: Optional[SearchStats] = None) -> SearchResult:
+    """Resultado sem solução (caminho vazio)."""
+    return SearchResult(Solution(), exec_time, expanded_nodes, stats)
+
+
+class PhaseTimer:
+    """Mede o tempo de cada fase de uma busca (usado apenas com phase_timing=True).
+
+    A heurística e a fila são substituídas por versões que acumulam o próprio
+    tempo, de modo que o laço da busca só precisa medir a geração de sucessores.
+    """
+
+    __slots__ = PHASE_FIELDS
+
+    def __init__(self):
+        self.heuristic_time = 0.0
+        self.successor_time = 0.0
+        self.queue_time = 0.0
+
+    def wrap_heuristic(self, heuristic_fn: Callable) -> Callable:
+        """Heurística que acumula o tempo das avaliações completas em heuristic_time.
+
+        A atualização incremental (atributo delta) é mantida e contada como
+        geração de sucessores, pois acontece dentro de State.get_neighbors.
+        """
+        clock = time.perf_counter
+
+        def timed_heuristic(state):
+            start = clock()
+            value = heuristic_fn(state)
+            self.heuristic_time += clock() - start
+            return value
+
+        if getattr(heuristic_fn, 'delta', None) is not None:
+            timed_heuristic.delta = heuristic_fn.delta
+        return timed_heuristic
+
+    def wrap_queue(self, queue) -> "_TimedQueue":
+        """Fila de prioridade que acumula o tempo de push e pop em queue_time."""
+        return _TimedQueue(queue, self)
+
+    def successors(self, state, heuristic_fn: Optional[Callable] = None) -> List:
+        """Gera os vizinhos de um estado acumulando o tempo em successor_time."""
+        start = time.perf_counter()
+        neighbors = state.get_neighbors(heuristic_fn)
+        self.successor_time += time.perf_counter() - start
+        return neighbors
+
+    def fill(self, stats: SearchStats) -> SearchStats:
+        """Copia os tempos medidos para as estatísticas."""
+        stats.heuristic_time = self.heuristic_time
+        stats.successor_time = self.successor_time
+        stats.queue_time = self.queue_time
+        return stats
+
+
+class _TimedQueue:
+    """Fila de prioridade com o tempo de push e pop acumulado em um PhaseTimer."""
+
+    __slots__ = ("queue", "timer")
+
+    def __init__(self, queue, timer: PhaseTimer):
+        self.queue = queue
+        self.timer = timer
+
+    def push(self, item, priority, depth=0):
+        start = time.perf_counter()
+        self.queue.push(item, priority, depth)
+        self.timer.queue_time += time.perf_counter() - start
+
+    def pop(self):
+        start = time.perf_counter()
+        entry = self.queue.pop()
+        self.timer.queue_time += time.perf_counter() - start
+        return entry
+
+    def empty(self):
+        return self.queue.empty()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __iter__(self):
+        return iter(self.queue)
+
+    @property
+    def stale_pops(self) -> int:
+        return self.queue.stale_pops
@@ -0,0 +1,224 @@
+"""
+Soluções compactas: o estado inicial e a sequência de movimentos do espaço vazio.
+
+Uma solução guarda apenas o estado inicial e os movimentos em ordem direta, um
+byte por movimento (b'U', b'D', b'L' ou b'R', na ordem de DIRECTIONS). Os
+tabuleiros do caminho são produzidos sob demanda, aplicando os movimentos a
+partir do estado inicial, só para quem precisa deles (interface, cache).
+
+As buscas guardam, para cada estado alcançado, apenas o código (0-3) do
+movimento que levou a ele; o predecessor é obtido desfazendo esse movimento.
+reconstruct_path percorre esses códigos do estado final até o inicial.
+"""
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.state import (DEFAULT_GEOMETRY, DIRECTIONS, OPPOSITE_MOVES, BoardGeometry, State, board_to_string,
+                         get_geometry)
+
+# Letra de cada direção de movimento do espaço vazio, na ordem de DIRECTIONS (cima, baixo, esquerda, direita)
+MOVE_LETTERS = b"UDLR"
+
+# Código (índice em DIRECTIONS) de cada letra
+MOVE_CODES: Dict[int, int] = {letter: code for code, letter in enumerate(MOVE_LETTERS)}
+
+# Tabelas de bytes.translate entre códigos (0-3) e letras
+_CODES_TO_LETTERS = bytes.maketrans(bytes(range(len(DIRECTIONS))), MOVE_LETTERS)
+_LETTERS_TO_CODES = bytes.maketrans(MOVE_LETTERS, bytes(range(len(DIRECTIONS))))
+
+# Tabela de bytes.translate de cada letra para a letra do movimento oposto
+_OPPOSITE_LETTERS = bytes.maketrans(MOVE_LETTERS, bytes(MOVE_LETTERS[code] for code in OPPOSITE_MOVES))
+
+
+def _swap(board: int, blank: int, cell: int, geometry: BoardGeometry) -> int:
+    """Move o espaço vazio de blank para cell, levando a peça de cell para blank."""
+    bits = geometry.bits
+    tile = (board >> (bits * cell)) & geometry.tile_mask
+    return board ^ (tile << (bits * cell)) ^ (tile << (bits * blank))
+
+
+class Solution:
+    """Solução de uma busca: estado inicial e movimentos do espaço vazio em ordem direta.
+
+    Como sequência, se comporta como a lista dos tabuleiros (strings) do estado
+    inicial ao final: len(solution) - 1 é o número de movimentos e uma solução
+    sem estado inicial (busca sem solução) é vazia e falsa. Os tabuleiros são
+    gerados sob demanda a cada iteração.
+    """
+
+    __slots__ = ('initial', 'moves')
+
+    def __init__(self, initial: Optional[State] = None, moves: Union[bytes, bytearray, str] = b""):
+        """Cria a solução sem validar os movimentos (ver from_moves).
+
+        Args:
+            initial: Estado inicial (None para "sem solução")
+            moves: Movimentos do espaço vazio em ordem direta (letras de MOVE_LETTERS)
+        """
+        self.initial = initial
+        self.moves = moves.encode("ascii") if isinstance(moves, str) else bytes(moves)
+
+    @classmethod
+    def from_moves(cls, initial: State, moves: Union[bytes, str]) -> 'Solution':
+        """Cria uma solução a partir de movimentos recebidos de fora (ex: arquivo ou outro processo).
+
+        Args:
+            initial: Estado inicial
+            moves: Movimentos do espaço vazio (ex: 'ULDR' ou b'ULDR')
+
+        Returns:
+            Solution: Solução validada
+
+        Raises:
+            ValueError: Se houver uma letra desconhecida ou um movimento para fora do tabuleiro
+        """
+        solution = cls(initial, moves.upper())
+        blank = initial.blank
+        targets = initial.geometry.move_targets
+        for step, letter in enumerate(solution.moves):
+            code = MOVE_CODES.get(letter)
+            if code is None:
+                raise ValueError(f"Movimento desconhecido {chr(letter)!r} na posição {step} "
+                                 f"(use {MOVE_LETTERS.decode()})")
+            blank = targets[blank][code]
+            if blank < 0:
+                raise ValueError(f"Movimento {chr(letter)!r} na posição {step} sai do tabuleiro")
+        return solution
+
+    @property
+    def cost(self) -> int:
+        """Número de movimentos da solução (0 sem solução)."""
+        return len(self.moves)
+
+    @property
+    def codes(self) -> bytes:
+        """Movimentos como códigos 0-3 (índices em DIRECTIONS)."""
+        return self.moves.translate(_LETTERS_TO_CODES)
+
+    def steps(self) -> Iterator[Tuple[int, int]]:
+        """Percorre o caminho produzindo (tabuleiro empacotado, célula do vazio) do inicial ao final."""
+        if self.initial is None:
+            return
+        geometry = self.initial.geometry
+        targets = geometry.move_targets
+        board, blank = self.initial.board, self.initial.blank
+        yield board, blank
+        for code in self.codes:
+            cell = targets[blank][code]
+            board = _swap(board, blank, cell, geometry)
+            blank = cell
+            yield board, blank
+
+    def final_state(self) -> Optional[State]:
+        """Último estado do caminho (None sem solução)."""
+        step = None
+        for step in self.steps():
+            pass
+        return State.from_packed(step[0], step[1], self.initial.geometry) if step is not None else None
+
+    def reversed(self) -> 'Solution':
+        """Solução do estado final até o inicial (movimentos opostos, em ordem inversa)."""
+        if self.initial is None:
+            return Solution()
+        return Solution(self.final_state(), self.moves[::-1].translate(_OPPOSITE_LETTERS))
+
+    def boards(self) -> Iterator[int]:
+        """Tabuleiros empacotados do caminho, do inicial ao final."""
+        return (board for board, _ in self.steps())
+
+    def states(self) -> Iterator[State]:
+        """Estados do caminho, do inicial ao final."""
+        geometry = self.initial.geometry if self.initial is not None else DEFAULT_GEOMETRY
+        return (State.from_packed(board, blank, geometry) for board, blank in self.steps())
+
+    def matrices(self) -> List[np.ndarray]:
+        """Matrizes NxN do caminho, do inicial ao final (para a interface)."""
+        return [state.current_state for state in self.states()]
+
+    def __len__(self) -> int:
+        return 0 if self.initial is None else len(self.moves) + 1
+
+    def __iter__(self) -> Iterator[str]:
+        geometry = self.initial.geometry if self.initial is not None else DEFAULT_GEOMETRY
+        return (board_to_string(board, geometry) for board in self.boards())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Solution):
+            return NotImplemented
+        return self.initial == other.initial and self.moves == other.moves
+
+    def __hash__(self) -> int:
+        return hash((self.initial, self.moves))
+
+    def __reduce__(self):
+        # Envia entre processos apenas o tabuleiro inicial e os movimentos
+        if self.initial is None:
+            return Solution, ()
+        initial = self.initial
+        return _restore, (initial.board, initial.blank, initial.geometry.size, self.moves)
+
+    def __repr__(self) -> str:
+        if self.initial is None:
+            return "Solution()"
+        return f"Solution({self.initial.from_matrix_string()!r}, {self.moves.decode()!r})"
+
+
+def _restore(board: int, blank: int, size: int, moves: bytes) -> Solution:
+    """Recria uma solução enviada entre processos (ver Solution.__reduce__)."""
+    return Solution(State.from_packed(board, blank, get_geometry(size)), moves)
+
+
+def reconstruct_path(board: int, blank: int, parent_moves: Dict[int, Optional[int]],
+                     geometry: BoardGeometry = DEFAULT_GEOMETRY) -> Solution:
+    """Reconstrói a solução a partir dos movimentos guardados pela busca.
+
+    Cada estado alcançado guarda o código do movimento que levou a ele (None no
+    estado inicial); o predecessor é obtido desfazendo esse movimento.
+
+    Args:
+        board: Tabuleiro empacotado do estado final
+        blank: Célula do espaço vazio no estado final
+        parent_moves: Dicionário mapeando tabuleiros empacotados para o código do
+            movimento que os alcançou
+        geometry: Geometria do tabuleiro
+
+    Returns:
+        Solution: Solução do estado inicial até o estado final
+    """
+    targets = geometry.move_targets
+    codes = bytearray()
+    code = parent_moves[board]
+
+    while code is not None:
+        codes.append(code)
+        # O vazio volta para a célula de onde veio
+        cell = targets[blank][OPPOSITE_MOVES[code]]
+        board = _swap(board, blank, cell, geometry)
+        blank = cell
+        code = parent_moves[board]
+
+    codes.reverse()
+    return Solution(State.from_packed(board, blank, geometry), codes.translate(_CODES_TO_LETTERS))
+
+
+def moves_to_letters(codes: Sequence[int]) -> bytes:
+    """Converte códigos de movimento (0-3, em ordem direta) nas letras de MOVE_LETTERS."""
+    return bytes(codes).translate(_CODES_TO_LETTERS)
+
+
+def solution_from_boards(boards: Sequence[int], geometry: BoardGeometry = DEFAULT_GEOMETRY) -> Solution:
+    """Cria a solução a partir dos tabuleiros consecutivos do caminho (inicial primeiro).
+
+    Args:
+        boards: Tabuleiros empacotados, do estado inicial ao final
+        geometry: Geometria do tabuleiro
+
+    Returns:
+        Solution: Solução equivalente (vazia se não houver tabuleiros)
+    """
+    if not boards:
+        return Solution()
+    blanks = [geometry.unpack(board).index(0) for board in boards]
+    codes = [geometry.move_direction[previous][blank] for previous, blank in zip(blanks, blanks[1:])]
+    return Solution(State.from_packed(boards[0], blanks[0], geometry), moves_to_letters(codes))
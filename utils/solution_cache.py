@@ -0,0 +1,397 @@
+"""
+Cache persistente de soluções ótimas (SQLite).
+
+Toda solução ótima também é ótima a partir de cada estado do caminho. Assim,
+ao guardar um caminho, cada estado recebe sua distância até o objetivo e o
+movimento seguinte (e o tabuleiro resultante), e qualquer estado já visto
+passa a ter um sufixo ótimo conhecido.
+
+As entradas são indexadas pela dimensão e pelo tabuleiro empacotado. O número
+de entradas é limitado: ao exceder o limite, as menos usadas recentemente são
+removidas, junto com as que dependiam delas para chegar ao objetivo.
+
+As buscas aceitam o cache pelo parâmetro cache (ver cached_solver): consultam
+o estado inicial antes de buscar, guardam as soluções ótimas encontradas e,
+nas buscas que o suportam, terminam assim que alcançam um estado em cache.
+Essas sondagens durante a busca não acessam o disco: as distâncias de cada
+dimensão são lidas uma vez para um dicionário em memória, mantido em dia pelas
+gravações deste cache e relido quando outra conexão altera o banco, e as
+marcações de uso dos estados encontrados são gravadas de uma vez ao fim da busca.
+"""
+import functools
+import inspect
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from utils.progress import SearchProgress
+from utils.search_stats import SearchResult, SearchStats
+from utils.solution import Solution, moves_to_letters
+from utils.state import BoardGeometry, State
+from utils.tables import table_path
+
+# Arquivo padrão do cache e limite padrão de entradas
+CACHE_FILE = "solutions.sqlite"
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# Fração do limite mantida após uma remoção (evita remover a cada inserção)
+_EVICTION_TARGET = 0.9
+
+# Versão do conteúdo do cache (PRAGMA user_version). A versão 1 descarta entradas
+# antigas, que podiam vir de buscas com heurísticas não admissíveis (não ótimas)
+CACHE_VERSION = 1
+
+_SIGN_BIT = 1 << 63
+
+
+def _to_key(board: int) -> int:
+    """Converte um tabuleiro de até 64 bits no inteiro com sinal aceito pelo SQLite."""
+    return board - (1 << 64) if board >= _SIGN_BIT else board
+
+
+def _from_key(key: int) -> int:
+    """Inverso de _to_key."""
+    return key + (1 << 64) if key < 0 else key
+
+
+class SolutionCache:
+    """Cache de distâncias e próximos movimentos ótimos, persistido em SQLite."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Abre (ou cria) o cache.
+
+        Args:
+            path: Arquivo do banco (padrão: tables/solutions.sqlite; ':memory:' para um cache volátil)
+            max_entries: Número máximo de estados guardados
+        """
+        self.path = path or table_path(CACHE_FILE)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.max_entries = max_entries
+
+        # Consultas do estado inicial (solution) e sondagens durante as buscas (distance)
+        self.hits = 0
+        self.misses = 0
+        self.probe_hits = 0
+        self.probe_misses = 0
+
+        # Distâncias em memória por dimensão (tabuleiro -> distância), versão do banco
+        # em que foram lidas e estados encontrados nas sondagens à espera da marcação de uso
+        self._snapshots: Dict[int, Dict[int, int]] = {}
+        self._data_version: Optional[int] = None
+        self._touched: List[Tuple[int, int]] = []
+
+        # A interface gráfica resolve em uma thread separada; o uso é sempre sequencial
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            " size INTEGER NOT NULL,"
+            " board INTEGER NOT NULL,"
+            " distance INTEGER NOT NULL,"
+            " next_move INTEGER NOT NULL,"
+            " next_board INTEGER,"
+            " last_used INTEGER NOT NULL,"
+            " PRIMARY KEY (size, board))"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] < CACHE_VERSION:
+            self.connection.execute("DELETE FROM solutions")
+            self.connection.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self.connection.commit()
+        self._clock = self.connection.execute("SELECT COALESCE(MAX(last_used), 0) FROM solutions").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def _lookup(self, board: int, geometry: BoardGeometry) -> Optional[tuple]:
+        """Consulta a entrada de um tabuleiro, sem contar acertos; o uso é marcado em flush."""
+        row = self.connection.execute(
+            "SELECT distance, next_move, next_board FROM solutions WHERE size = ? AND board = ?",
+            (geometry.size, _to_key(board)),
+        ).fetchone()
+        if row is not None:
+            self._touched.append((geometry.size, board))
+        return row
+
+    def sync(self) -> None:
+        """Descarta as distâncias em memória se outra conexão alterou o banco.
+
+        Chamado uma vez antes de cada busca (ver cached_solver); as gravações desta
+        conexão já atualizam as distâncias em memória.
+        """
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._snapshots.clear()
+            self._data_version = version
+
+    def _snapshot(self, size: int) -> Dict[int, int]:
+        """Distâncias em memória dos tabuleiros de uma dimensão, lidas do banco no primeiro uso."""
+        snapshot = self._snapshots.get(size)
+        if snapshot is None:
+            rows = self.connection.execute("SELECT board, distance FROM solutions WHERE size = ?", (size,))
+            snapshot = self._snapshots[size] = {_from_key(board): distance for board, distance in rows}
+        return snapshot
+
+    def distance(self, board: int, geometry: BoardGeometry) -> Optional[int]:
+        """Distância ótima de um tabuleiro até o objetivo, se estiver em cache.
+
+        A consulta é feita nas distâncias em memória; o uso do estado é marcado
+        no banco apenas em flush.
+
+        Args:
+            board: Tabuleiro empacotado
+            geometry: Geometria do tabuleiro
+
+        Returns:
+            Optional[int]: Número de movimentos até o objetivo, ou None se não estiver em cache
+        """
+        distance = self._snapshot(geometry.size).get(board)
+        if distance is None:
+            self.probe_misses += 1
+            return None
+        self.probe_hits += 1
+        self._touched.append((geometry.size, board))
+        return distance
+
+    def flush(self) -> None:
+        """Grava de uma vez as marcações de uso dos estados encontrados nas sondagens."""
+        if not self._touched:
+            return
+        rows = []
+        for size, board in self._touched:
+            self._clock += 1
+            rows.append((self._clock, size, _to_key(board)))
+        self._touched.clear()
+        self.connection.executemany("UPDATE solutions SET last_used = ? WHERE size = ? AND board = ?", rows)
+        self.connection.commit()
+
+    def moves_to_goal(self, board: int, geometry: BoardGeometry) -> Optional[bytes]:
+        """Movimentos ótimos de um tabuleiro até o objetivo.
+
+        Returns:
+            Optional[bytes]: Movimentos do espaço vazio em ordem direta (letras de
+            utils.solution.MOVE_LETTERS), ou None se o tabuleiro não estiver em cache
+        """
+        codes = bytearray()
+        row = self._lookup(board, geometry)
+        while row is not None and row[2] is not None:
+            codes.append(row[1])
+            row = self._lookup(_from_key(row[2]), geometry)
+        self.flush()
+        if row is None:
+            return None
+        return moves_to_letters(codes)
+
+    def complete_path(self, prefix: Solution) -> Optional[Solution]:
+        """Completa um caminho parcial com o sufixo em cache.
+
+        Args:
+            prefix: Solução do estado inicial até um tabuleiro em cache
+
+        Returns:
+            Optional[Solution]: Solução completa do estado inicial até o objetivo,
+            ou None se o sufixo não estiver em cache
+        """
+        final = prefix.final_state()
+        suffix = self.moves_to_goal(final.board, final.geometry)
+        if suffix is None:
+            return None
+        return Solution(prefix.initial, prefix.moves + suffix)
+
+    def solution(self, initial_state: State) -> Optional[Solution]:
+        """Solução completa de um estado em cache.
+
+        Conta um acerto ou uma falha.
+        """
+        moves = self.moves_to_goal(initial_state.board, initial_state.geometry)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Solution(initial_state, moves)
+
+    def store_path(self, path: Solution) -> None:
+        """Guarda todos os estados de uma solução ótima.
+
+        Os tabuleiros do caminho são gerados a partir dos movimentos; cada um
+        recebe sua distância até o objetivo e o movimento seguinte.
+
+        Args:
+            path: Solução ótima (não vazia)
+        """
+        size = path.initial.geometry.size
+        boards = list(path.boards())
+        codes = path.codes
+        cost = len(codes)
+        rows = []
+        for step, board in enumerate(boards):
+            if step == cost:
+                next_move, next_board = -1, None
+            else:
+                # Direção em que o espaço vazio se move para chegar ao próximo estado (um passo mais perto)
+                next_move = codes[step]
+                next_board = _to_key(boards[step + 1])
+            self._clock += 1
+            rows.append((size, _to_key(board), cost - step, next_move, next_board, self._clock))
+        self.connection.executemany(
+            "INSERT INTO solutions (size, board, distance, next_move, next_board, last_used)"
+            " VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (size, board) DO UPDATE SET"
+            " distance = excluded.distance, next_move = excluded.next_move,"
+            " next_board = excluded.next_board, last_used = excluded.last_used"
+            " WHERE excluded.distance <= solutions.distance",
+            rows,
+        )
+        snapshot = self._snapshots.get(size)
+        if snapshot is not None:
+            for step, board in enumerate(boards):
+                distance = cost - step
+                if snapshot.get(board, distance) >= distance:
+                    snapshot[board] = distance
+        if len(self) > self.max_entries:
+            self._evict()
+        self.connection.commit()
+
+    def _evict(self) -> None:
+        """Remove as entradas menos usadas e, em cascata, as que ficaram sem sufixo."""
+        self._snapshots.clear()
+        target = int(self.max_entries * _EVICTION_TARGET)
+        self.connection.execute(
+            "DELETE FROM solutions WHERE rowid IN"
+            " (SELECT rowid FROM solutions ORDER BY last_used LIMIT ?)",
+            (len(self) - target,),
+        )
+        while self.connection.execute(
+            "DELETE FROM solutions WHERE next_board IS NOT NULL AND NOT EXISTS"
+            " (SELECT 1 FROM solutions AS next"
+            "  WHERE next.size = solutions.size AND next.board = solutions.next_board)"
+        ).rowcount:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """Acertos e taxas de acerto desde a criação (ou reset_stats).
+
+        Returns:
+            Dict[str, float]: Acertos e falhas das consultas de estados iniciais
+            (hits, misses, hit_rate), das sondagens durante as buscas (probe_*)
+            e o número de entradas guardadas
+        """
+        lookups = self.hits + self.misses
+        probes = self.probe_hits + self.probe_misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "probe_hits": self.probe_hits,
+            "probe_misses": self.probe_misses,
+            "probe_hit_rate": self.probe_hits / probes if probes else 0.0,
+            "entries": len(self),
+        }
+
+    def reset_stats(self) -> None:
+        """Zera os contadores de acertos e falhas."""
+        self.hits = 0
+        self.misses = 0
+        self.probe_hits = 0
+        self.probe_misses = 0
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        self._snapshots.clear()
+        self._touched.clear()
+        self.connection.execute("DELETE FROM solutions")
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Grava as marcações de uso pendentes e fecha o banco."""
+        self.flush()
+        self.connection.commit()
+        self.connection.close()
+
+
+def cached_solver(optimal: Union[bool, Callable[[Dict[str, Any]], bool]]) -> Callable:
+    """Decorador que adiciona o parâmetro cache a uma função de busca.
+
+    Com um cache informado, o estado inicial é consultado antes da busca (um
+    acerto devolve a solução sem expandir nós). Se a busca for ótima, a solução
+    encontrada é guardada. Buscas ótimas apenas com alguns parâmetros (ex: A*
+    ponderado) informam um predicado sobre os argumentos da chamada. Se a função decorada também declarar o parâmetro
+    cache, ele é repassado para que a busca termine ao alcançar um estado em cache.
+    Buscas em fluxo (geradores de SearchProgress) também são aceitas: um acerto
+    produz diretamente o evento final, e o caminho guardado é o do evento final.
+
+    Args:
+        optimal: Se as soluções da busca são ótimas (apenas essas são guardadas), ou
+            um predicado que recebe os argumentos informados na chamada (nome -> valor,
+            sem os valores padrão omitidos) e diz se a solução daquela chamada é ótima
+
+    Returns:
+        Callable: Decorador
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+        forwards_cache = "cache" in signature.parameters
+
+        def stores(initial_state: State, args: tuple, kwargs: dict) -> bool:
+            if not callable(optimal):
+                return optimal
+            return optimal(signature.bind(initial_state, *args, **kwargs).arguments)
+
+        if inspect.isgeneratorfunction(fn):
+            # Busca em fluxo: um acerto vira o evento final; o caminho vem do evento final
+            @functools.wraps(fn)
+            def stream_wrapper(initial_state: State, *args, cache: Optional[SolutionCache] = None, **kwargs):
+                if cache is None:
+                    yield from fn(initial_state, *args, **kwargs)
+                    return
+
+                start_time = time.perf_counter()
+                path = cache.solution(initial_state)
+                if path is not None:
+                    yield SearchProgress(0, 0, len(path) - 1, time.perf_counter() - start_time, path, done=True,
+                                         suboptimality=1.0, stats=SearchStats(extra={"cache_hit": True}))
+                    return
+
+                store = stores(initial_state, args, kwargs)
+                if forwards_cache:
+                    cache.sync()
+                    kwargs["cache"] = cache
+                try:
+                    for event in fn(initial_state, *args, **kwargs):
+                        if event.done:
+                            cache.flush()
+                            if store and event.path:
+                                cache.store_path(event.path)
+                        yield event
+                finally:
+                    # Busca interrompida por quem consome o fluxo
+                    cache.flush()
+            return stream_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(initial_state: State, *args, cache: Optional[SolutionCache] = None, **kwargs):
+            if cache is None:
+                return fn(initial_state, *args, **kwargs)
+
+            start_time = time.perf_counter()
+            path = cache.solution(initial_state)
+            if path is not None:
+                return SearchResult(path, time.perf_counter() - start_time, 0, SearchStats(extra={"cache_hit": True}))
+
+            store = stores(initial_state, args, kwargs)
+            if forwards_cache:
+                cache.sync()
+                kwargs["cache"] = cache
+            # O resultado é devolvido como veio (pode ser um BudgetExceeded, sem caminho)
+            try:
+                result = fn(initial_state, *args, **kwargs)
+            finally:
+                cache.flush()
+            if store and result[0]:
+                cache.store_path(result[0])
+            return result
+        return wrapper
+    return decorator
@@ -1,222 +1,346 @@
 import numpy as np
-from collections import deque
-from typing import List, Dict, Optional, Tuple, Deque
 from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+# Dimensão padrão do tabuleiro (puzzle de 8 peças)
+DEFAULT_SIZE = 3
+
+# Dígitos usados na representação em string (um caractere por peça, até o 5x5)
+DIGITS = '0123456789ABCDEFGHIJKLMNO'
+
+# Direções de movimento do espaço vazio: cima, baixo, esquerda, direita
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Direção oposta de cada movimento (cima <-> baixo, esquerda <-> direita)
+OPPOSITE_MOVES = (1, 0, 3, 2)
+
+
+def pack_tiles(tiles, bits: int = 4) -> int:
+    """Empacota uma sequência de peças em um único inteiro (bits por peça).
+
+    Args:
+        tiles: Sequência de peças em ordem de leitura (célula 0 nos bits menos significativos)
+        bits: Número de bits por peça
+
+    Returns:
+        int: Inteiro empacotado representando o tabuleiro
+    """
+    board = 0
+    for cell, value in enumerate(tiles):
+        board |= int(value) << (bits * cell)
+    return board
+
+
+def unpack_tiles(board: int, cells: int = DEFAULT_SIZE * DEFAULT_SIZE, bits: int = 4) -> List[int]:
+    """Desempacota um inteiro empacotado na lista de peças em ordem de leitura."""
+    mask = (1 << bits) - 1
+    return [(board >> (bits * cell)) & mask for cell in range(cells)]
+
+
+class BoardGeometry:
+    """Constantes de um tabuleiro NxN, compartilhadas por todos os estados dessa dimensão.
+
+    Obtenha instâncias com get_geometry(size) para que cada dimensão tenha um único objeto.
+    """
+
+    def __init__(self, size: int):
+        """Pré-calcula objetivo, codificação e tabela de movimentos para a dimensão.
+
+        Args:
+            size: Número de linhas (e colunas) do tabuleiro
+        """
+        if not 2 <= size <= 5:
+            raise ValueError(f"Dimensão de tabuleiro não suportada: {size} (use de 2 a 5)")
+        self.size = size
+        self.cells = size * size
+
+        # Bits por peça: 4 até o 4x4 (peças 0-15) e 5 no 5x5 (peças 0-24)
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.tile_mask = (1 << self.bits) - 1
+
+        # Estado objetivo como sequência de peças em ordem de leitura (linha a linha)
+        self.goal_tiles = tuple(list(range(1, self.cells)) + [0])
+        self.goal_board = pack_tiles(self.goal_tiles, self.bits)
+        self.goal_blank = self.goal_tiles.index(0)
+
+        # Posições (linha, coluna) de cada peça no estado objetivo
+        self.goal_positions = {value: divmod(cell, size) for cell, value in enumerate(self.goal_tiles)}
+
+        # Célula de destino do espaço vazio para cada [célula][direção] (-1 se o movimento sair do tabuleiro)
+        self.move_targets: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(
+                (row + d_row) * size + (col + d_col)
+                if 0 <= row + d_row < size and 0 <= col + d_col < size else -1
+                for d_row, d_col in DIRECTIONS
+            )
+            for row, col in (divmod(cell, size) for cell in range(self.cells))
+        )
+
+        # Células alcançáveis pelo espaço vazio a partir de cada célula, na ordem de DIRECTIONS
+        self.neighbor_cells: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(target for target in targets if target >= 0) for targets in self.move_targets
+        )
+
+        # Direção do movimento do espaço vazio de cada [célula][célula de destino] (-1 se não forem vizinhas)
+        self.move_direction: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(targets.index(target) if target in targets else -1 for target in range(self.cells))
+            for targets in self.move_targets
+        )
+
+    def pack(self, tiles: Sequence[int]) -> int:
+        """Empacota peças em ordem de leitura no inteiro desta dimensão."""
+        return pack_tiles(tiles, self.bits)
+
+    def unpack(self, board: int) -> List[int]:
+        """Desempacota um inteiro desta dimensão na lista de peças."""
+        return unpack_tiles(board, self.cells, self.bits)
+
+
+@lru_cache(maxsize=None)
+def get_geometry(size: int) -> BoardGeometry:
+    """Retorna a geometria compartilhada de um tabuleiro size x size."""
+    return BoardGeometry(size)
+
+
+# Constantes do tabuleiro padrão 3x3, usadas pelas tabelas que indexam todo o espaço de estados
+DEFAULT_GEOMETRY = get_geometry(DEFAULT_SIZE)
+SIZE = DEFAULT_GEOMETRY.size
+CELLS = DEFAULT_GEOMETRY.cells
+BITS = DEFAULT_GEOMETRY.bits
+TILE_MASK = DEFAULT_GEOMETRY.tile_mask
+GOAL_TILES = DEFAULT_GEOMETRY.goal_tiles
+GOAL_BOARD = DEFAULT_GEOMETRY.goal_board
+GOAL_BOARD_BLANK = DEFAULT_GEOMETRY.goal_blank
+GOAL_POSITIONS = DEFAULT_GEOMETRY.goal_positions
+MOVE_TARGETS = DEFAULT_GEOMETRY.move_targets
+NEIGHBOR_CELLS = DEFAULT_GEOMETRY.neighbor_cells
 
 
 class State:
-    """Representa um estado do puzzle de 8 peças."""
-    
-    # Matriz objetivo para cálculo da heurística (constante da classe)
-    GOAL_MATRIX = np.array([
-        [1, 2, 3],
-        [4, 5, 6],
-        [7, 8, 0]
-    ])
-    
-    # Dicionário para armazenar as posições dos elementos na matriz objetivo
-    GOAL_POSITIONS = {}
-    for (r, c), val in np.ndenumerate(GOAL_MATRIX):
-        GOAL_POSITIONS[val] = (r, c)
-    
+    """Representa um estado do puzzle de N²-1 peças (8, 15 ou 24 peças).
+
+    O tabuleiro é armazenado como um único inteiro com 4 bits por peça (5 bits no
+    5x5), em ordem de leitura, mais uma referência à geometria compartilhada da
+    dimensão. Matrizes NumPy só são criadas nas bordas (interface e E/S).
+    """
+
+    __slots__ = ('board', 'blank', 'geometry', '_h_fn', '_h_value')
+
+    # Matriz objetivo do tabuleiro padrão (constante da classe)
+    GOAL_MATRIX = np.array(GOAL_TILES).reshape(SIZE, SIZE)
+
+    # Dicionário para armazenar as posições dos elementos na matriz objetivo padrão
+    GOAL_POSITIONS = GOAL_POSITIONS
+
     def __init__(self, current_state: np.ndarray):
-        """Inicializa um estado com uma matriz 3x3.
-        
+        """Inicializa um estado com uma matriz NxN.
+
         Args:
-            current_state: Matriz numpy 3x3 representando o estado atual do puzzle
+            current_state: Matriz numpy NxN representando o estado atual do puzzle
         """
-        self.current_state = current_state
-        # Pré-calcula e armazena valores frequentemente usados
-        self._string_repr = self._calculate_string_repr()
-        self.heuristic = self._calculate_heuristic_manhattan()
-        self.heuristic2 = self._calculate_heuristic_manhattanPenality()
-        self.heuristic_euclidean = self._calculate_heuristic_euclidean()
-        self._hash = hash(self._string_repr)
-        
-    def _calculate_heuristic_manhattan(self) -> int:
-        """Calcula a heurística de distância Manhattan para o estado atual.
-        
+        matrix = np.asarray(current_state)
+        size = int(round(matrix.size ** 0.5))
+        if size * size != matrix.size:
+            raise ValueError(f"O tabuleiro deve ser quadrado, recebido formato {matrix.shape}")
+        geometry = get_geometry(size)
+        tiles = [int(value) for value in matrix.ravel()]
+        if sorted(tiles) != list(range(geometry.cells)):
+            raise ValueError(f"O tabuleiro deve conter as peças de 0 a {geometry.cells - 1}")
+        self._init_packed(geometry.pack(tiles), tiles.index(0), geometry)
+
+    @classmethod
+    def from_packed(cls, board: int, blank: int, geometry: BoardGeometry = DEFAULT_GEOMETRY) -> 'State':
+        """Cria um estado diretamente a partir do inteiro empacotado.
+
+        Args:
+            board: Tabuleiro empacotado
+            blank: Célula ocupada pelo espaço vazio
+            geometry: Geometria da dimensão do tabuleiro (padrão: 3x3)
+
         Returns:
-            int: Soma das distâncias Manhattan de cada peça até sua posição final
-        """
-        manhattan_dist_sum = 0
-        
-        for (row, col), value in np.ndenumerate(self.current_state):
-            if value != 0:  # Ignoramos o espaço vazio (0) no cálculo
-                # Usa o dicionário pré-calculado para obter a posição objetivo
-                goal_row, goal_col = self.GOAL_POSITIONS[value]
-                manhattan_dist_sum += abs(goal_row - row) + abs(goal_col - col)
-        
-        return manhattan_dist_sum
-    
-    def _calculate_heuristic_manhattanPenality(self) -> int:
+            State: Novo estado
         """
-        Calcula a heurística de Manhattan com penalidade por conflitos lineares.
-        
+        state = cls.__new__(cls)
+        state._init_packed(board, blank, geometry)
+        return state
+
+    @classmethod
+    def from_string(cls, text: str) -> 'State':
+        """Cria um estado a partir da representação em string (ex: '867254301').
+
+        A dimensão é deduzida do comprimento da string (9, 16 ou 25 caracteres).
+
+        Args:
+            text: Um caractere por peça, em ordem de leitura (dígitos de DIGITS)
+
         Returns:
-            int: Valor heurístico (distância de Manhattan + penalidades)
+            State: Novo estado
         """
-        manhattan_dist_sum = 0
-        linear_conflict_penalty = 0
-        board = self.current_state  # Supondo que seja uma matriz NumPy 3x3
-
-        # Calcula a distância Manhattan normal
-        for (row, col), value in np.ndenumerate(board):
-            if value != 0:  # Ignora espaço vazio
-                goal_row, goal_col = self.GOAL_POSITIONS[value]
-                manhattan_dist_sum += abs(goal_row - row) + abs(goal_col - col)
-
-        # Verifica conflitos lineares em linhas
-        for row in range(3):
-            current_row = board[row]
-            for i in range(3):
-                for j in range(i + 1, 3):
-                    val_i = current_row[i]
-                    val_j = current_row[j]
-                    if val_i != 0 and val_j != 0:
-                        # Ambas as peças devem estar nesta mesma linha na meta
-                        goal_row_i, goal_col_i = self.GOAL_POSITIONS[val_i]
-                        goal_row_j, goal_col_j = self.GOAL_POSITIONS[val_j]
-                        if goal_row_i == row and goal_row_j == row:
-                            # Se estão invertidas em relação à posição final, há conflito
-                            if goal_col_i > goal_col_j:
-                                linear_conflict_penalty += 2
-
-        # Verifica conflitos lineares em colunas
-        for col in range(3):
-            current_col = board[:, col]
-            for i in range(3):
-                for j in range(i + 1, 3):
-                    val_i = current_col[i]
-                    val_j = current_col[j]
-                    if val_i != 0 and val_j != 0:
-                        goal_row_i, goal_col_i = self.GOAL_POSITIONS[val_i]
-                        goal_row_j, goal_col_j = self.GOAL_POSITIONS[val_j]
-                        if goal_col_i == col and goal_col_j == col:
-                            if goal_row_i > goal_row_j:
-                                linear_conflict_penalty += 2
-
-        return manhattan_dist_sum + linear_conflict_penalty
-    
-    def _calculate_heuristic_euclidean(self) -> int:
-        """Calcula a heurística de distância Euclidiana para o estado atual.
+        return cls(np.array([DIGITS.index(char) for char in text.upper()]))
+
+    def _init_packed(self, board: int, blank: int, geometry: BoardGeometry) -> None:
+        """Armazena o tabuleiro empacotado; heurísticas são calculadas sob demanda."""
+        self.board = board
+        self.blank = blank
+        self.geometry = geometry
+        self._h_fn = None
+        self._h_value = 0
+
+    @property
+    def size(self) -> int:
+        """Dimensão N do tabuleiro NxN."""
+        return self.geometry.size
+
+    @property
+    def current_state(self) -> np.ndarray:
+        """Matriz numpy NxN do estado, criada sob demanda."""
+        return np.array(self.tiles()).reshape(self.geometry.size, self.geometry.size)
+
+    def tiles(self) -> List[int]:
+        """Retorna as peças do tabuleiro em ordem de leitura."""
+        return self.geometry.unpack(self.board)
+
+    def is_goal(self) -> bool:
+        """Retorna True se o estado for o objetivo da sua dimensão."""
+        return self.board == self.geometry.goal_board
+
+    def heuristic_value(self, heuristic: Callable[['State'], int]) -> int:
+        """Retorna o valor de uma heurística para este estado, calculando-o sob demanda.
+
+        O último valor calculado fica guardado no próprio nó, de modo que cada
+        estado avalia no máximo uma vez a heurística usada pela busca.
+
+        Args:
+            heuristic: Função heurística obtida em utils.heuristics.get_heuristic
 
         Returns:
-            int: Soma das distâncias Euclidianas de cada peça até sua posição final
+            int: Valor heurístico do estado
         """
-        euclidean_dist_sum = 0
+        if self._h_fn is not heuristic:
+            self._h_value = heuristic(self)
+            self._h_fn = heuristic
+        return self._h_value
 
-        for (row, col), value in np.ndenumerate(self.current_state):
-            if value != 0:  # Ignora espaço vazio
-                goal_row, goal_col = self.GOAL_POSITIONS[value]
-                euclidean_dist_sum += np.sqrt((goal_row - row)**2 + (goal_col - col)**2)
+    def is_solvable(self) -> bool:
+        """Verifica se o estado pode alcançar o objetivo.
 
-        return int(euclidean_dist_sum)  # Convertemos para inteiro
+        Em um tabuleiro de largura ímpar, o estado é solucionável se e somente se
+        o número de inversões entre as peças (ignorando o vazio) for par. Em largura
+        par, cada movimento vertical muda a paridade das inversões e a linha do
+        vazio ao mesmo tempo, então a soma das inversões com a distância (em linhas)
+        do vazio até a última linha deve ser par.
 
-    def _calculate_string_repr(self) -> str:
-        """Calcula a representação em string do estado atual.
-        
         Returns:
-            str: Representação do estado como string (ex: '123456780')
+            bool: True se o estado for solucionável
         """
-        return ''.join(str(self.current_state[i, j]) for i in range(3) for j in range(3))
- 
+        size = self.geometry.size
+        tiles = [value for value in self.tiles() if value != 0]
+        inversions = sum(
+            1
+            for i in range(len(tiles))
+            for j in range(i + 1, len(tiles))
+            if tiles[i] > tiles[j]
+        )
+        if size % 2 == 1:
+            return inversions % 2 == 0
+        blank_rows_from_bottom = size - 1 - self.blank // size
+        return (inversions + blank_rows_from_bottom) % 2 == 0
+
     def print_state(self) -> None:
-        """Imprime o estado atual do puzzle em formato de matriz 3x3."""
-        n = 3
-        for i in range(n):
-            for j in range(n):
-                print(f"{self.current_state[i][j]} ", end="")
+        """Imprime o estado atual do puzzle em formato de matriz NxN."""
+        size = self.geometry.size
+        width = len(str(self.geometry.cells - 1))
+        tiles = self.tiles()
+        for i in range(size):
+            for j in range(size):
+                print(f"{tiles[i * size + j]:>{width}} ", end="")
             print()
         print()
 
     def from_matrix_string(self) -> str:
-        """Retorna a representação em string pré-calculada do estado.
-        
+        """Retorna a representação em string do estado.
+
         Returns:
             str: Representação do estado como string (ex: '123456780')
         """
-        return self._string_repr
-    
-    def get_neighbors(self) -> List['State']:
+        return board_to_string(self.board, self.geometry)
+
+    def get_neighbors(self, heuristic: Optional[Callable[['State'], int]] = None) -> List['State']:
         """Gera todos os estados vizinhos possíveis movendo o espaço vazio.
-        
+
+        Cada vizinho é obtido com operações de bits: a peça da célula de destino
+        é apagada de sua posição e gravada na célula do espaço vazio.
+
+        Se a heurística informada já estiver calculada neste estado e tiver uma
+        atualização incremental (atributo delta, ver utils.heuristics.register_delta),
+        o valor de cada vizinho é derivado do valor deste estado mais a variação
+        causada pela peça movida, sem recalcular o tabuleiro inteiro.
+
+        Args:
+            heuristic: Heurística usada pela busca (opcional)
+
         Returns:
             List[State]: Lista de estados vizinhos válidos
         """
+        geometry = self.geometry
+        bits = geometry.bits
+        mask = geometry.tile_mask
+        board = self.board
+        blank = self.blank
+        blank_shift = bits * blank
         neighbours = []
 
-        # Encontra a posição do espaço vazio (0)
-        positions = np.where(self.current_state == 0)
-        if len(positions[0]) == 0:
-            return neighbours  # Retorna lista vazia se não encontrar o espaço vazio
-            
-        row, col = positions[0][0], positions[1][0]
-
-        # Direções possíveis: cima, baixo, esquerda, direita
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-        for d_row, d_col in directions:
-            new_row = d_row + row
-            new_col = d_col + col
-            
-            # Verifica se a nova posição está dentro dos limites do puzzle
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_state = self.current_state.copy()
-                # Troca o espaço vazio com a peça na nova posição
-                new_state[row, col], new_state[new_row, new_col] = new_state[new_row, new_col], new_state[row, col]
-                neighbours.append(State(new_state))
+        delta = None
+        if heuristic is not None and self._h_fn is heuristic:
+            delta = getattr(heuristic, 'delta', None)
+
+        for cell in geometry.neighbor_cells[blank]:
+            shift = bits * cell
+            tile = (board >> shift) & mask
+            child_board = board ^ (tile << shift) ^ (tile << blank_shift)
+            neighbour = State.from_packed(child_board, cell, geometry)
+            if delta is not None:
+                neighbour._h_fn = heuristic
+                neighbour._h_value = self._h_value + delta(board, child_board, geometry, tile, cell, blank)
+            neighbours.append(neighbour)
 
         return neighbours
-    
+
     def __hash__(self) -> int:
         """Permite usar o estado como chave em dicionários.
-        
+
         Returns:
             int: Hash único para este estado
         """
-        return self._hash
-    
+        return hash(self.board)
+
     def __eq__(self, other: object) -> bool:
         """Compara se dois estados são iguais.
-        
+
         Args:
             other: Outro objeto para comparação
-            
+
         Returns:
             bool: True se os estados forem iguais
         """
         if not isinstance(other, State):
             return False
-        return self._string_repr == other._string_repr
-    
+        return self.board == other.board and self.geometry is other.geometry
+
     def __lt__(self, other: 'State') -> bool:
         """Comparação para uso em estruturas como heapq.
-        
+
         Args:
             other: Outro estado para comparação
-            
+
         Returns:
             bool: True se este estado for "menor" que o outro
         """
-        return self._string_repr < other._string_repr
-
+        return self.board < other.board
 
-def reconstruct_path(initial_key: str, visited_list: Dict[str, Optional[str]]) -> Deque[str]:
-    """Reconstrói o caminho da solução a partir do dicionário de estados visitados.
-    
-    Args:
-        initial_key: Chave do estado final ('123456780')
-        visited_list: Dicionário mapeando estados para seus predecessores
-        
-    Returns:
-        Deque[str]: Pilha contendo o caminho da solução
-    """
-    stack = deque()
-    current_key = initial_key
 
-    while current_key is not None:
-        stack.append(current_key)
-        current_key = visited_list[current_key]
+def board_to_string(board: int, geometry: BoardGeometry = DEFAULT_GEOMETRY) -> str:
+    """Converte um tabuleiro empacotado em sua representação em string (ex: '123456780')."""
+    return ''.join(DIGITS[value] for value in geometry.unpack(board))
 
-    return stack
@@ -0,0 +1,62 @@
+"""
+Localização dos arquivos de tabelas pré-calculadas (tabela de transições,
+banco de distâncias, ...).
+
+As tabelas ficam no diretório 'tables/' na raiz do projeto. No executável gerado
+pelo PyInstaller, o diretório é procurado dentro da pasta temporária de extração.
+
+As tabelas são gravadas com atomic_write: outros processos podem estar mapeando
+o mesmo arquivo em memória, então ele nunca é sobrescrito no lugar.
+"""
+import os
+import sys
+import tempfile
+from typing import BinaryIO, Callable
+
+# Diretório padrão das tabelas (pode ser sobrescrito pela variável PUZZLE_TABLES_DIR)
+TABLES_DIR = os.environ.get(
+    "PUZZLE_TABLES_DIR",
+    os.path.join(
+        getattr(sys, "_MEIPASS", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "tables",
+    ),
+)
+
+
+def table_path(filename: str) -> str:
+    """Retorna o caminho completo de um arquivo de tabela.
+
+    Args:
+        filename: Nome do arquivo dentro do diretório de tabelas
+
+    Returns:
+        str: Caminho absoluto do arquivo
+    """
+    return os.path.join(TABLES_DIR, filename)
+
+
+def atomic_write(path: str, write: Callable[[BinaryIO], None]) -> str:
+    """Grava um arquivo de tabela de forma atômica.
+
+    O conteúdo é escrito em um arquivo temporário no mesmo diretório, que então
+    substitui o destino com os.replace. Quem já mapeou o arquivo antigo continua
+    lendo o conteúdo antigo, e quem abre o caminho vê sempre um arquivo completo.
+
+    Args:
+        path: Caminho de destino
+        write: Função que escreve o conteúdo no arquivo binário aberto
+
+    Returns:
+        str: Caminho do arquivo gravado
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return path
@@ -0,0 +1,102 @@
+"""
+Tabela de transições pré-calculada para o grafo de estados do puzzle de 8 peças.
+
+A tabela é uma matriz int32 de formato [NUM_STATES, 4], indexada pelo índice
+compacto do estado (utils.ranking). A coluna d contém o índice do estado obtido
+movendo o espaço vazio na direção DIRECTIONS[d], ou -1 se o movimento for inválido.
+Ela é construída uma única vez, salva em disco e mapeada em memória na carga.
+"""
+import os
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+
+from utils.ranking import NUM_STATES, rank_boards, unrank_board, unrank_boards
+from utils.solution import Solution, moves_to_letters
+from utils.state import CELLS, DIRECTIONS, MOVE_TARGETS, OPPOSITE_MOVES, State
+from utils.tables import atomic_write, table_path
+
+TRANSITION_TABLE_FILE = "transition_table.npy"
+
+
+def build_transition_table() -> np.ndarray:
+    """Constrói a tabela de transições completa com operações vetorizadas.
+
+    Returns:
+        np.ndarray: Matriz int32 [NUM_STATES, 4] com os sucessores de cada estado
+    """
+    ranks = np.arange(NUM_STATES, dtype=np.int64)
+    tiles = unrank_boards(ranks)
+    blank = np.argmin(tiles, axis=1)
+    table = np.full((NUM_STATES, len(DIRECTIONS)), -1, dtype=np.int32)
+
+    for blank_cell in range(CELLS):
+        rows = np.nonzero(blank == blank_cell)[0]
+        for direction, target in enumerate(MOVE_TARGETS[blank_cell]):
+            if target < 0:
+                continue
+            # Troca o espaço vazio com a peça da célula de destino
+            moved = tiles[rows].copy()
+            moved[:, blank_cell] = moved[:, target]
+            moved[:, target] = 0
+            table[rows, direction] = rank_boards(moved)
+
+    return table
+
+
+def save_transition_table(table: np.ndarray, path: Optional[str] = None) -> str:
+    """Salva a tabela de transições em disco no formato .npy.
+
+    Args:
+        table: Tabela gerada por build_transition_table
+        path: Caminho de destino (padrão: tables/transition_table.npy)
+
+    Returns:
+        str: Caminho do arquivo salvo
+    """
+    path = path or table_path(TRANSITION_TABLE_FILE)
+    return atomic_write(path, lambda f: np.save(f, table))
+
+
+@lru_cache(maxsize=None)
+def load_transition_table() -> np.ndarray:
+    """Carrega a tabela de transições, construindo-a na primeira utilização.
+
+    A tabela é mapeada em memória (somente leitura), de modo que processos
+    diferentes compartilham as mesmas páginas do arquivo. O resultado é uma
+    visão ndarray simples do mapeamento, evitando o custo de indexação de np.memmap.
+
+    Returns:
+        np.ndarray: Matriz int32 [NUM_STATES, 4] mapeada em memória
+    """
+    path = table_path(TRANSITION_TABLE_FILE)
+    if not os.path.exists(path):
+        save_transition_table(build_transition_table(), path)
+    return np.load(path, mmap_mode="r").view(np.ndarray)
+
+
+def reconstruct_ranked_path(goal_rank: int, initial_rank: int, parent_moves: Sequence[int],
+                            table: np.ndarray) -> Solution:
+    """Reconstrói a solução a partir dos movimentos armazenados por índice.
+
+    Args:
+        goal_rank: Índice compacto do estado objetivo
+        initial_rank: Índice compacto do estado inicial
+        parent_moves: Buffer com a direção usada para alcançar cada estado, indexado pelo rank
+        table: Tabela de transições
+
+    Returns:
+        Solution: Solução do estado inicial até o objetivo
+    """
+    codes = []
+    rank = goal_rank
+
+    while rank != initial_rank:
+        move = int(parent_moves[rank])
+        codes.append(move)
+        # Desfaz o movimento que levou a este estado para chegar ao predecessor
+        rank = int(table[rank, OPPOSITE_MOVES[move]])
+
+    codes.reverse()
+    return Solution(State.from_packed(*unrank_board(initial_rank)), moves_to_letters(codes))